@@ -1,17 +1,47 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 import shutil
-import json
 from datetime import datetime
 import hashlib
-import asyncio
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
 from modules.file_reader import FileReader
 from modules.file_detector import FileDetector
-from modules.categorization_service import CategorizationService
-from difflib import SequenceMatcher
+from modules.categorization_service import CategorizationService, RULE_NONE
+from modules.categories_catalog import CategoriesCatalog, DEFAULT_SUBCATEGORY
+from modules.parse_cache import ParseCache
+from modules.storage import Storage
+from modules.upload_jobs import UploadJob, UploadJobManager
+from modules.parse_worker import ParsePool, detect_and_parse, parse_source
+from modules.logger import get_logger, setup_logging, shutdown_logging
+import json
 import uuid
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import as_completed
+
+# Índices y agregaciones (numpy/pandas) se importan al construirlos por primera vez
+if TYPE_CHECKING:
+    from modules.movement_index import MovementIndex
+    from modules.movement_analytics import MovementAnalytics
+    from modules.similarity_index import SimilarityIndex
+
+logger = get_logger(__name__)
+
+# Duración (s) de cada fase de init_services(), para medir el arranque
+STARTUP_TIMINGS = {}
+
+@contextmanager
+def startup_phase(name: str):
+    """Mide una fase del arranque y la registra en STARTUP_TIMINGS"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[name] = time.perf_counter() - started
 
 # =====================================================================
 # FUNCIÓN DE GENERACIÓN DE IDs CONSISTENTES
@@ -34,18 +64,13 @@ def generate_movement_id(movement: dict, filename: str = "") -> str:
 
 def enrich_movements_with_ids(movements: list, filename: str = "") -> list:
     """Añade IDs únicos a los movimientos"""
-    global movements_db
     seen = set()
     
     for idx, mov in enumerate(movements):
-        # ✅ PRIMERO: Buscar si ya existe en BD
-        existing_id = None
-        for stored_id, stored_mov in movements_db.items():
-            if (stored_mov.get('descripcion') == mov.get('descripcion') and
-                stored_mov.get('fecha') == mov.get('fecha') and
-                stored_mov.get('monto') == mov.get('monto')):
-                existing_id = stored_id
-                break
+        # ✅ PRIMERO: Buscar si ya existe en BD (consulta indexada por contenido)
+        existing_id = storage.find_categorization_id(
+            mov.get('descripcion'), mov.get('fecha'), mov.get('monto')
+        )
         
         if existing_id:
             mov['id'] = existing_id  # ← Reutiliza el ID existente
@@ -63,52 +88,15 @@ def enrich_movements_with_ids(movements: list, filename: str = "") -> list:
     return movements
 
 # =====================================================================
-# INICIALIZACIÓN DE BD DE MOVIMIENTOS
+# ALMACENAMIENTO (SQLite)
 # =====================================================================
+# Archivos cargados, archivos activos, categorizaciones de movimientos y
+# mapeos aprendidos viven en una BD SQLite local. Los JSON anteriores se
+# importan una sola vez al iniciar (init_services).
 
+DB_PATH = Path("processed_files/financial_bot.db")
 MOVEMENTS_DB = Path("backend/data/movements_db.json")
 
-def load_movements_db():
-    """Carga la BD de movimientos"""
-    if MOVEMENTS_DB.exists():
-        with open(MOVEMENTS_DB, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
-
-def save_movements_db(db):
-    """Guarda la BD de movimientos"""
-    MOVEMENTS_DB.parent.mkdir(parents=True, exist_ok=True)
-    with open(MOVEMENTS_DB, 'w', encoding='utf-8') as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
-
-# BD global
-movements_db = load_movements_db()
-
-# =====================================================================
-# ESTADO DE PROGRESO GLOBAL
-# =====================================================================
-
-file_processing_progress = {
-    "is_processing": False,
-    "progress": 0,
-    "current_file": "",
-    "total_files": 0,
-    "processed_files": 0,
-    "message": ""
-}
-
-def reset_progress():
-    """Reinicia el estado de progreso"""
-    global file_processing_progress
-    file_processing_progress = {
-        "is_processing": False,
-        "progress": 0,
-        "current_file": "",
-        "total_files": 0,
-        "processed_files": 0,
-        "message": ""
-    }
-
 # =====================================================================
 # CONFIGURACIÓN
 # =====================================================================
@@ -119,6 +107,20 @@ app = FastAPI(
     version="1.0.0"
 )
 
+@app.on_event("startup")
+def startup_services():
+    """Crea los servicios; lo que no necesita bloquear el arranque corre en un hilo aparte"""
+    init_services()
+    threading.Thread(target=initialize_categories_json, name="init-categories", daemon=True).start()
+
+@app.on_event("shutdown")
+def shutdown_services():
+    """Detiene los pools de carga y deja la BD con el WAL aplicado"""
+    upload_jobs.shutdown()
+    parse_pool.shutdown()
+    storage.close()
+    shutdown_logging()
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -130,53 +132,93 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE"],
-    allow_headers=["Content-Type"],
+    allow_headers=["Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
     max_age=3600,
 )
 
 UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 PROCESSED_DIR = Path("processed_files")
-PROCESSED_DIR.mkdir(exist_ok=True)
 
 MAX_FILES_PER_BATCH = 10
 MAX_FILE_SIZE_MB = 50
+MAX_PAGE_SIZE = 1000
+# Movimientos por tanda en las respuestas NDJSON de /movements
+STREAM_CHUNK_SIZE = 500
+MAX_UPLOAD_WORKERS = 2
+MAX_PARSE_PROCESSES = min(MAX_FILES_PER_BATCH, os.cpu_count() or 1)
+
+# Catálogo de categorías editable (JSON) y su versión inicial (CSV)
+CATEGORIES_JSON = Path("backend/data/categories.json")
+CATEGORIES_CSV = "categories.csv"
+
+# Servicios de la aplicación. Se crean en init_services() al arrancar el
+# servidor y no al importar este módulo: los procesos de parseo (spawn)
+# reimportan el módulo principal cuando se lanza con `python main.py`, y
+# cada uno abriría la BD, los pools, etc.
+storage: Storage = None
+file_reader: FileReader = None
+file_detector: FileDetector = None
+categories_catalog: CategoriesCatalog = None
+categorization_service: CategorizationService = None
+parse_cache: ParseCache = None
+upload_jobs: UploadJobManager = None
+parse_pool: ParsePool = None
+
+def init_services() -> None:
+    """Configura el logging, abre la BD y crea los servicios (una sola vez)"""
+    global storage, file_reader, file_detector, categories_catalog
+    global categorization_service, parse_cache, upload_jobs, parse_pool
+    if storage is not None:
+        return
+
+    setup_logging()
+    UPLOAD_DIR.mkdir(exist_ok=True)
+    PROCESSED_DIR.mkdir(exist_ok=True)
+
+    with startup_phase("storage"):
+        storage = Storage(str(DB_PATH))
+        storage.import_legacy_json(
+            registry_path=Path("processed_files/uploaded_files.json"),
+            active_path=Path("processed_files/active_files.json"),
+            movements_db_path=MOVEMENTS_DB,
+            mappings_path=Path("processed_files/movimento_categorizations.json")
+        )
 
-uploaded_files_registry = {}
-active_files = set()
-file_reader = FileReader()
-file_detector = FileDetector()
-categorization_service = CategorizationService()
+    with startup_phase("servicios"):
+        file_reader = FileReader()
+        file_detector = FileDetector()
+        categories_catalog = CategoriesCatalog(CATEGORIES_JSON, seed_csv=CATEGORIES_CSV,
+                                               on_change=storage.bump_data_version)
+        categorization_service = CategorizationService(csv_path=CATEGORIES_CSV, storage=storage, catalog=categories_catalog)
+        parse_cache = ParseCache(storage)
+        upload_jobs = UploadJobManager(max_workers=MAX_UPLOAD_WORKERS)
+        parse_pool = ParsePool(max_workers=MAX_PARSE_PROCESSES)
+
+    logger.info("⏱️  Inicialización: %s",
+                ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in STARTUP_TIMINGS.items()))
+
+# Índice de consulta y agregaciones sobre los movimientos activos (None = hay que reconstruirlos).
+# Las cargas corren en otros hilos: los dos se leen, instalan e invalidan con movement_index_lock
+movement_index = None
+movement_index_version = None
+movement_analytics = None
+movement_index_lock = threading.Lock()
+
+# Índice de similitud de descripciones (se construye al primer uso y luego se actualiza por archivo)
+similarity_index = None
+similarity_index_lock = threading.Lock()
 
 # =====================================================================
 # INICIALIZACIÓN DE CATEGORÍAS
 # =====================================================================
 
 def initialize_categories_json():
-    """Inicializa el archivo JSON de categorías desde el CSV si no existe"""
-    categories_path = Path("backend/data/categories.json")
-    
-    if categories_path.exists():
-        print("✅ Categorías ya existen, preservando cambios del usuario")
-        return
-    
-    print("🔄 Inicializando categorías desde CSV...")
+    """Carga el catálogo de categorías (crea el JSON desde el CSV si no existe)"""
     try:
-        all_categories_list = categorization_service.get_all_categories()
-        categories_data = {}
-        
-        for category in all_categories_list:
-            subcats = categorization_service.get_subcategories(category)
-            categories_data[category] = subcats if subcats else ["Sin Subcategoría"]
-        
-        categories_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(categories_path, 'w', encoding='utf-8') as f:
-            json.dump(categories_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Categorías inicializadas en JSON: {len(categories_data)} categorías")
+        logger.info("✅ Catálogo de categorías: %s categorías", len(categories_catalog.categories()))
     except Exception as e:
-        print(f"⚠️  Error inicializando categorías: {e}")
+        logger.warning("⚠️  Error inicializando categorías: %s", e)
 
 # =====================================================================
 # FUNCIONES AUXILIARES
@@ -190,17 +232,36 @@ def calculate_file_hash(file_path: Path) -> str:
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest()
 
+def parse_file(source) -> list:
+    """Parsea un archivo (ruta, PdfDocument abierto o ExcelDocument leído) con el lector compartido"""
+    return parse_source(source, file_reader)
+
+def read_file_movements(file_hash: str, file_path: Path) -> list:
+    """
+    Retorna los movimientos parseados de un archivo cargado.
+    Usa la caché de parseo y solo parsea si no hay entrada vigente.
+    """
+    movements = parse_cache.get(file_hash)
+    if movements is not None:
+        return movements
+    
+    movements = parse_file(file_path)
+    # También se guarda un resultado vacío, para no volver a parsear el archivo en cada request
+    parse_cache.put(file_hash, movements)
+    return movements
+
 def is_file_already_uploaded(file_hash: str) -> dict:
     """Verifica si un archivo ya fue cargado"""
-    if file_hash in uploaded_files_registry:
+    file_info = storage.get_file(file_hash)
+    if file_info is not None:
         return {
             "is_duplicate": True,
-            "file_info": uploaded_files_registry[file_hash]
+            "file_info": file_info
         }
     return {"is_duplicate": False}
 
-def register_uploaded_file(file_hash: str, filename: str, movements_count: int, movements: list = None, detection: dict = None):
-    """Registra un archivo como cargado"""
+def register_uploaded_file(file_hash: str, filename: str, movements_count: int, movements: list = None, detection: dict = None, active: bool = True):
+    """Registra un archivo como cargado (y activo, por defecto)"""
     file_info = {
         "nombre": filename,
         "fecha_carga": datetime.now().isoformat(),
@@ -223,45 +284,221 @@ def register_uploaded_file(file_hash: str, filename: str, movements_count: int,
     else:
         file_info["ultimo_mes"] = "N/A"
     
-    uploaded_files_registry[file_hash] = file_info
-    save_registry()
-
-def save_registry():
-    """Guarda el registro de archivos"""
-    registry_file = PROCESSED_DIR / "uploaded_files.json"
-    with open(registry_file, "w", encoding="utf-8") as f:
-        json.dump(uploaded_files_registry, f, ensure_ascii=False, indent=2)
-
-def load_registry():
-    """Carga el registro de archivos"""
-    global uploaded_files_registry
-    registry_file = PROCESSED_DIR / "uploaded_files.json"
-    if registry_file.exists():
-        with open(registry_file, "r", encoding="utf-8") as f:
-            uploaded_files_registry = json.load(f)
-
-def save_active_files():
-    """Guarda la lista de archivos activos"""
-    active_file = PROCESSED_DIR / "active_files.json"
-    with open(active_file, "w", encoding="utf-8") as f:
-        json.dump({"active": list(active_files)}, f, ensure_ascii=False, indent=2)
-
-def load_active_files():
-    """Carga la lista de archivos activos"""
-    global active_files
-    active_file = PROCESSED_DIR / "active_files.json"
-    if active_file.exists():
-        with open(active_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            active_files = set(data.get("active", []))
-
-load_registry()
-load_active_files()
-initialize_categories_json()
+    storage.upsert_file(file_hash, file_info, active=active)
+    invalidate_movement_index()
+
+def build_active_movements() -> tuple:
+    """
+    Arma los movimientos de archivos activos con IDs únicos y categorías normalizadas
+
+    Returns:
+        tuple: (movimientos, cantidad de archivos activos)
+    """
+    all_movements = []
+    active_files = storage.list_files(active_only=True)
+    
+    logger.debug("📊 Obteniendo movimientos: %s archivos activos de %s",
+                 len(active_files), storage.count_files())
+    
+    for file_info in active_files:
+        file_hash = file_info['hash']
+        filename = file_info['nombre']
+        
+        file_path = PROCESSED_DIR / filename
+        if file_path.exists():
+            try:
+                movements = read_file_movements(file_hash, file_path)
+                
+                # ✅ GENERAR IDs ÚNICOS (con índice)
+                movements = enrich_movements_with_ids(movements, filename)
+                
+                if movements:
+                    stored = storage.get_categorizations(m.get('id') for m in movements)
+                    
+                    for movement in movements:
+                        mov_id = movement.get('id')
+                        
+                       # ✅ NORMALIZADOR DE CATEGORÍAS
+                        if mov_id in stored:
+                            db_mov = stored[mov_id]
+                            cat = db_mov.get('categoria', '').strip().lower()
+                            if cat == 'sin categoría' or cat == 'sin categoria' or not cat:
+                                movement['categoria'] = ''
+                                movement['subcategoria'] = ''
+                            else:
+                                movement['categoria'] = db_mov.get('categoria', '')
+                                movement['subcategoria'] = db_mov.get('subcategoria', '')
+                        else:
+                            cat = movement.get('categoria', '').strip()
+                            subcat = movement.get('subcategoria', '').strip()
+                            
+                            if not cat or cat.lower() == 'sin categoría':
+                                movement['categoria'] = ''
+                                movement['subcategoria'] = ''
+                            else:
+                                movement['categoria'] = cat
+                                movement['subcategoria'] = subcat
+                        
+                        movement['institucion'] = file_info.get('institucion', 'unknown')
+                        movement['tipo_producto'] = file_info.get('tipo_producto', 'unknown')
+                    
+                    logger.debug("✅ %s: %s movimientos", filename, len(movements))
+                    all_movements.extend(movements)
+            except Exception as e:
+                logger.error("❌ %s: Error - %s", filename, e)
+    
+    logger.info("📊 Movimientos activos: %s", len(all_movements))
+    
+    return all_movements, len(active_files)
+
+def get_movement_index() -> "MovementIndex":
+    """
+    Retorna el índice de movimientos activos, construyéndolo si fue invalidado
+    o si la versión de datos ya no es la suya (escrituras de otros procesos).
+    Se arma fuera del lock; si la versión de datos cambió mientras tanto (p.ej.
+    una carga en otro hilo) se descarta y se arma de nuevo, para no instalar
+    datos anteriores al cambio.
+    """
+    global movement_index, movement_index_version, movement_analytics
+    from modules.movement_store import MovementStore
+    from modules.movement_index import MovementIndex
+
+    while True:
+        with movement_index_lock:
+            version = storage.data_version()
+            if movement_index is not None and movement_index_version == version:
+                return movement_index
+
+        movements, active_count = build_active_movements()
+        index = MovementIndex(MovementStore(movements), active_files=active_count)
+
+        with movement_index_lock:
+            if storage.data_version() == version:
+                movement_index, movement_index_version = index, version
+                movement_analytics = None
+                return index
+        logger.info("🔄 Los datos cambiaron mientras se armaba el índice; se arma de nuevo")
+
+def get_movement_analytics() -> "MovementAnalytics":
+    """Retorna las agregaciones de movimientos activos, construyéndolas si fueron invalidadas"""
+    global movement_analytics
+    from modules.movement_analytics import MovementAnalytics
+
+    while True:
+        index = get_movement_index()
+        with movement_index_lock:
+            # Las agregaciones instaladas siempre corresponden al índice instalado
+            if movement_analytics is not None and movement_index is index:
+                return movement_analytics
+
+        analytics = MovementAnalytics(index.store)
+
+        with movement_index_lock:
+            if movement_index is index:
+                movement_analytics = analytics
+                return analytics
+
+def invalidate_movement_index():
+    """
+    Descarta el índice y las agregaciones y sube la versión de datos;
+    se llama en cada cambio de archivos o categorías
+    """
+    global movement_index, movement_analytics
+    with movement_index_lock:
+        # La versión sube con el lock tomado: un índice en construcción ve el cambio y se descarta
+        movement_index = None
+        movement_analytics = None
+        storage.bump_data_version()
+
+# =====================================================================
+# ETAGS (versión de datos)
+# =====================================================================
+# Las lecturas llevan un ETag fuerte con la versión de datos (persistida en
+# la BD), la del parser y un id del proceso; si el If-None-Match del cliente
+# coincide se responde 304 sin armar la respuesta. La versión se lee antes
+# de armarla: un cambio a mitad de camino deja un ETag viejo, nunca datos
+# viejos. El id del proceso invalida los ETags en cada reinicio, por si
+# cambió el código que arma las respuestas.
+
+BOOT_ID = uuid.uuid4().hex[:8]
+
+def current_etag() -> str:
+    """ETag de los datos actuales"""
+    return f'"{storage.data_version()}-{parse_cache.parser_version}-{BOOT_ID}"'
+
+def etag_headers(etag: str) -> dict:
+    """ETag + no-cache: el navegador guarda la respuesta pero la revalida siempre"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Si el cliente ya tiene la versión `etag` (If-None-Match, comparación débil)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+def load_file_for_similarity(file_info: dict) -> Optional[list]:
+    """Movimientos de un archivo con sus IDs, tal como los recorre find-similar"""
+    file_path = PROCESSED_DIR / file_info['nombre']
+    if not file_path.exists():
+        return None
+    movements = read_file_movements(file_info['hash'], file_path)
+    return enrich_movements_with_ids(movements, file_info['nombre'])
+
+def get_similarity_index() -> "SimilarityIndex":
+    """Retorna el índice de similitud, construyéndolo con los archivos activos si no existe"""
+    global similarity_index
+    with similarity_index_lock:
+        if similarity_index is None:
+            from modules.similarity_index import SimilarityIndex
+            index = SimilarityIndex()
+            for file_info in storage.list_files(active_only=True):
+                try:
+                    movements = load_file_for_similarity(file_info)
+                    if movements:
+                        index.add_file(file_info['hash'], movements)
+                except Exception as e:
+                    logger.warning("⚠️  Error indexando %s: %s", file_info['nombre'], e)
+            similarity_index = index
+        return similarity_index
+
+def update_similarity_index(file_hash: str):
+    """Agrega un archivo activado o recién cargado al índice de similitud (si ya fue construido)"""
+    with similarity_index_lock:
+        if similarity_index is None:
+            return
+        file_info = storage.get_file(file_hash)
+        try:
+            movements = load_file_for_similarity(file_info) if file_info else None
+        except Exception as e:
+            logger.warning("⚠️  Error indexando %s: %s", file_info['nombre'], e)
+            movements = None
+        if movements:
+            similarity_index.add_file(file_hash, movements)
+        else:
+            similarity_index.remove_file(file_hash)
+
+def remove_from_similarity_index(file_hash: str = None):
+    """Quita un archivo del índice de similitud (o todos, sin file_hash)"""
+    with similarity_index_lock:
+        if similarity_index is None:
+            return
+        if file_hash is None:
+            similarity_index.clear()
+        else:
+            similarity_index.remove_file(file_hash)
 
 # =====================================================================
 # RUTAS API - CARGA Y GESTIÓN DE ARCHIVOS
 # =====================================================================
+# Las rutas que pueden reconstruir índices o parsear archivos son `def`:
+# FastAPI las corre en su threadpool y el event loop sigue atendiendo
+# /health y el sondeo de trabajos mientras tanto.
 
 @app.get("/")
 async def root():
@@ -270,8 +507,8 @@ async def root():
         "status": "API conectada",
         "servicio": "Financial Statement Bot",
         "version": "1.0.0",
-        "archivos_cargados": len(uploaded_files_registry),
-        "archivos_activos": len(active_files),
+        "archivos_cargados": storage.count_files(),
+        "archivos_activos": storage.count_files(active_only=True),
         "limites": {
             "max_archivos_por_carga": MAX_FILES_PER_BATCH,
             "max_tamaño_archivo_mb": MAX_FILE_SIZE_MB
@@ -280,32 +517,192 @@ async def root():
 
 @app.get("/processing-status")
 async def get_processing_status():
-    """Retorna el estado del procesamiento"""
-    return file_processing_progress
+    """Retorna el estado del trabajo de carga más reciente"""
+    job = upload_jobs.latest()
+    if job is None:
+        return {
+            "is_processing": False,
+            "progress": 0,
+            "current_file": "",
+            "total_files": 0,
+            "processed_files": 0,
+            "message": ""
+        }
+    return upload_jobs.snapshot(job)
+
+@app.get("/upload-jobs/{job_id}")
+async def get_upload_job(job_id: str):
+    """Estado, progreso y resultado de un trabajo de carga"""
+    job = upload_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"Trabajo no encontrado: {job_id}"}
+        )
+    return upload_jobs.snapshot(job)
+
+def new_upload_dir(job: UploadJob) -> Path:
+    """Directorio temporal propio del trabajo (evita choques entre cargas con el mismo nombre)"""
+    job_dir = UPLOAD_DIR / job.id
+    job_dir.mkdir(parents=True, exist_ok=True)
+    return job_dir
+
+def register_parsed_file(temp_path: Path, filename: str, file_hash: str, detection: dict,
+                         movements: list, on_progress=None) -> dict:
+    """
+    Guarda en caché, asigna IDs y registra un archivo ya parseado; lo mueve a processed_files
+
+    Returns:
+        dict: {'status': 'empty' | 'success', ...}
+    """
+    # Un archivo sin movimientos no se registra, así que tampoco queda en la caché
+    if movements:
+        parse_cache.put(file_hash, movements)
+
+    # ✅ GENERAR IDs CONSISTENTES
+    movements = enrich_movements_with_ids(movements, filename)
+
+    if on_progress:
+        on_progress(75, "Inicializando categorías...")
+
+    if not movements:
+        logger.error("❌ Sin movimientos extraídos: %s", filename)
+        temp_path.unlink()
+        return {"status": "empty"}
+
+    for movement in movements:
+        if 'categoria' not in movement:
+            movement['categoria'] = ''
+        if 'subcategoria' not in movement:
+            movement['subcategoria'] = ''
+        movement['institucion'] = detection['institution']
+        movement['tipo_producto'] = detection['product_type']
+        movement['deteccion_confianza'] = detection['confidence']
+
+    if on_progress:
+        on_progress(95, f"Guardando {filename}...")
+
+    register_uploaded_file(file_hash, filename, len(movements), movements, detection)
+
+    processed_path = PROCESSED_DIR / filename
+    shutil.move(str(temp_path), str(processed_path))
+    update_similarity_index(file_hash)
+
+    logger.info("✅ ÉXITO: %s - %s movimientos", filename, len(movements))
+
+    return {
+        "status": "success",
+        "file_hash": file_hash,
+        "detection": detection,
+        "movements": movements
+    }
+
+def ingest_file(temp_path: Path, filename: str, on_progress=None) -> dict:
+    """
+    Hash, verificación de duplicado, detección, parseo y registro de un archivo.
+    Corre en el pool de trabajos de carga.
+
+    Returns:
+        dict: {'status': 'duplicate' | 'empty' | 'success', ...}
+    """
+    def progress(value, message):
+        if on_progress:
+            on_progress(value, message)
+
+    progress(25, f"Calculando hash de {filename}...")
+    file_hash = calculate_file_hash(temp_path)
+    logger.info("🔐 Hash: %s...", file_hash[:16])
+
+    progress(35, "Verificando duplicados...")
+    duplicate_check = is_file_already_uploaded(file_hash)
+    if duplicate_check["is_duplicate"]:
+        logger.warning("⚠️  ARCHIVO DUPLICADO: %s", filename)
+        temp_path.unlink()
+        return {"status": "duplicate", "file_info": duplicate_check["file_info"]}
+
+    progress(45, "Detectando institución y extrayendo movimientos...")
+
+    # El archivo se abre una sola vez para detección y extracción
+    detection, movements = detect_and_parse(temp_path, file_reader, file_detector)
+    logger.info("🏦 Institución detectada: %s (confianza: %s)", detection['institution'], detection['confidence'])
+    logger.info("💳 Tipo de producto: %s", detection['product_type'])
+
+    return register_parsed_file(temp_path, filename, file_hash, detection, movements, on_progress)
+
+def process_single_upload(job: UploadJob, temp_path: Path, filename: str) -> tuple:
+    """Procesa una carga individual; retorna (status_code, contenido)"""
+    try:
+        outcome = ingest_file(
+            temp_path, filename,
+            on_progress=lambda value, message: upload_jobs.update(job, value, message)
+        )
+
+        if outcome["status"] == "duplicate":
+            file_info = outcome["file_info"]
+            return 409, {
+                "status": "warning",
+                "message": "Este archivo ya fue cargado anteriormente",
+                "is_duplicate": True,
+                "original_file": {
+                    "nombre": file_info['nombre'],
+                    "fecha_carga": file_info['fecha_carga'],
+                    "movimientos": file_info['movimientos'],
+                    "institucion": file_info.get('institucion', 'unknown'),
+                    "tipo_producto": file_info.get('tipo_producto', 'unknown')
+                }
+            }
+
+        if outcome["status"] == "empty":
+            upload_jobs.update(job, message=f"❌ {filename}: sin movimientos")
+            return 400, {
+                "status": "error",
+                "message": "No se pudieron extraer movimientos del archivo",
+                "file": filename
+            }
+
+        movements = outcome["movements"]
+        detection = outcome["detection"]
+        upload_jobs.update(job, message=f"✅ {filename} cargado", processed_files=1)
+        logger.info("🔌 Estado: ACTIVO")
+
+        return 200, {
+            "status": "success",
+            "message": f"{len(movements)} movimientos extraídos",
+            "file": filename,
+            "movements_count": len(movements),
+            "institucion": detection['institution'],
+            "tipo_producto": detection['product_type'],
+            "deteccion_confianza": detection['confidence'],
+            "movements": [movement.to_dict() for movement in movements],
+            "file_info": {
+                "hash": outcome["file_hash"],
+                "activo": True
+            }
+        }
+
+    except Exception as e:
+        logger.error("❌ ERROR: %s", e)
+        upload_jobs.update(job, message=f"❌ Error procesando {filename}")
+        return 500, {
+            "status": "error",
+            "message": f"Error procesando archivo: {str(e)}",
+            "file": filename
+        }
+    finally:
+        shutil.rmtree(temp_path.parent, ignore_errors=True)
 
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
-    """Carga un archivo individual"""
-    global file_processing_progress
-    
-    temp_path = None
+    """Acepta un archivo y encola su procesamiento; retorna 202 con el id del trabajo"""
+    job_dir = None
     try:
-        print(f"\n{'='*70}")
-        print(f"📁 SOLICITUD DE CARGA INDIVIDUAL")
-        print(f"{'='*70}")
-        print(f"📄 Archivo: {file.filename}")
-        
-        file_processing_progress["is_processing"] = True
-        file_processing_progress["current_file"] = file.filename
-        file_processing_progress["progress"] = 5
-        file_processing_progress["message"] = f"Validando {file.filename}..."
+        logger.info("📁 SOLICITUD DE CARGA INDIVIDUAL: %s", file.filename)
         
         allowed_extensions = ['.xlsx', '.xls', '.pdf']
         file_ext = Path(file.filename).suffix.lower()
         
         if file_ext not in allowed_extensions:
-            print(f"❌ RECHAZO: Extensión no permitida ({file_ext})")
-            file_processing_progress["is_processing"] = False
+            logger.error("❌ RECHAZO: Extensión no permitida (%s)", file_ext)
             return JSONResponse(
                 status_code=400,
                 content={
@@ -315,19 +712,17 @@ async def upload_file(file: UploadFile = File(...)):
                 }
             )
         
-        temp_path = UPLOAD_DIR / file.filename
+        job = UploadJob("individual", total_files=1, current_file=file.filename)
+        job_dir = new_upload_dir(job)
+        temp_path = job_dir / file.filename
         with open(temp_path, "wb") as f:
             content = await file.read()
             f.write(content)
         
-        file_processing_progress["progress"] = 15
-        file_processing_progress["message"] = f"Verificando tamaño de {file.filename}..."
-        
         file_size_mb = temp_path.stat().st_size / (1024 * 1024)
         if file_size_mb > MAX_FILE_SIZE_MB:
-            temp_path.unlink()
-            print(f"❌ Archivo muy grande: {file_size_mb:.2f}MB (máx: {MAX_FILE_SIZE_MB}MB)")
-            file_processing_progress["is_processing"] = False
+            shutil.rmtree(job_dir, ignore_errors=True)
+            logger.error("❌ Archivo muy grande: %.2fMB (máx: %sMB)", file_size_mb, MAX_FILE_SIZE_MB)
             return JSONResponse(
                 status_code=413,
                 content={
@@ -337,135 +732,26 @@ async def upload_file(file: UploadFile = File(...)):
                 }
             )
         
-        print(f"✅ Archivo guardado: {file_size_mb:.2f}MB")
-        
-        file_processing_progress["progress"] = 25
-        file_processing_progress["message"] = f"Calculando hash de {file.filename}..."
-        
-        file_hash = calculate_file_hash(temp_path)
-        print(f"🔐 Hash: {file_hash[:16]}...")
-        
-        file_processing_progress["progress"] = 35
-        file_processing_progress["message"] = f"Verificando duplicados..."
-        
-        duplicate_check = is_file_already_uploaded(file_hash)
-        
-        if duplicate_check["is_duplicate"]:
-            print(f"⚠️  ARCHIVO DUPLICADO")
-            temp_path.unlink()
-            file_processing_progress["is_processing"] = False
-            
-            file_info = duplicate_check["file_info"]
-            return JSONResponse(
-                status_code=409,
-                content={
-                    "status": "warning",
-                    "message": "Este archivo ya fue cargado anteriormente",
-                    "is_duplicate": True,
-                    "original_file": {
-                        "nombre": file_info['nombre'],
-                        "fecha_carga": file_info['fecha_carga'],
-                        "movimientos": file_info['movimientos'],
-                        "institucion": file_info.get('institucion', 'unknown'),
-                        "tipo_producto": file_info.get('tipo_producto', 'unknown')
-                    }
-                }
-            )
-        
-        print(f"✅ Archivo NUEVO")
-        
-        file_processing_progress["progress"] = 45
-        file_processing_progress["message"] = f"Detectando institución..."
-        
-        print(f"🔍 Detectando institución y tipo de producto...")
-        detection = file_detector.detect_from_file(str(temp_path))
-        print(f"🏦 Institución detectada: {detection['institution']} (confianza: {detection['confidence']})")
-        print(f"💳 Tipo de producto: {detection['product_type']}")
-        
-        file_processing_progress["progress"] = 60
-        file_processing_progress["message"] = f"Extrayendo movimientos..."
-        
-        print(f"🔄 Extrayendo movimientos...")
-        movements = []
-        
-        if file_ext == '.pdf':
-            movements = file_reader.read_pdf(str(temp_path))
-        else:
-            movements = file_reader.read_xlsx(str(temp_path))
-        
-        # ✅ GENERAR IDs CONSISTENTES
-        movements = enrich_movements_with_ids(movements, file.filename)
-        
-        file_processing_progress["progress"] = 75
-        file_processing_progress["message"] = f"Inicializando categorías..."
-        
-        for movement in movements:
-            if 'categoria' not in movement:
-                movement['categoria'] = ''
-            if 'subcategoria' not in movement:
-                movement['subcategoria'] = ''
-
-        if not movements:
-            print(f"❌ Sin movimientos extraídos")
-            temp_path.unlink()
-            file_processing_progress["is_processing"] = False
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "status": "error",
-                    "message": "No se pudieron extraer movimientos del archivo",
-                    "file": file.filename
-                }
-            )
-        
-        for movement in movements:
-            movement['institucion'] = detection['institution']
-            movement['tipo_producto'] = detection['product_type']
-            movement['deteccion_confianza'] = detection['confidence']
+        logger.info("✅ Archivo guardado: %.2fMB", file_size_mb)
         
-        file_processing_progress["progress"] = 95
-        file_processing_progress["message"] = f"Guardando {file.filename}..."
-        
-        register_uploaded_file(file_hash, file.filename, len(movements), movements, detection)
-        active_files.add(file_hash)
-        save_active_files()
-        
-        processed_path = PROCESSED_DIR / file.filename
-        shutil.move(str(temp_path), str(processed_path))
-        
-        file_processing_progress["progress"] = 100
-        file_processing_progress["message"] = f"✅ {file.filename} cargado"
-        
-        print(f"✅ ÉXITO: {len(movements)} movimientos")
-        print(f"🔌 Estado: ACTIVO")
-        
-        await asyncio.sleep(2)
-        file_processing_progress["is_processing"] = False
+        upload_jobs.submit(job, process_single_upload, temp_path, file.filename)
+        logger.info("📥 Trabajo en cola: %s", job.id)
         
         return JSONResponse(
-            status_code=200,
+            status_code=202,
             content={
-                "status": "success",
-                "message": f"{len(movements)} movimientos extraídos",
+                "status": "accepted",
+                "message": f"{file.filename} en cola de procesamiento",
                 "file": file.filename,
-                "movements_count": len(movements),
-                "institucion": detection['institution'],
-                "tipo_producto": detection['product_type'],
-                "deteccion_confianza": detection['confidence'],
-                "movements": movements,
-                "file_info": {
-                    "hash": file_hash,
-                    "activo": True
-                }
+                "job_id": job.id
             }
         )
         
     except Exception as e:
-        print(f"❌ ERROR: {str(e)}")
-        file_processing_progress["is_processing"] = False
+        logger.error("❌ ERROR: %s", e)
         
-        if temp_path and temp_path.exists():
-            temp_path.unlink()
+        if job_dir is not None:
+            shutil.rmtree(job_dir, ignore_errors=True)
         
         return JSONResponse(
             status_code=500,
@@ -476,212 +762,253 @@ async def upload_file(file: UploadFile = File(...)):
             }
         )
 
-@app.post("/upload-batch")
-async def upload_batch(files: list[UploadFile] = File(...)):
-    """Carga múltiples archivos"""
-    global file_processing_progress
-    
-    print(f"\n{'='*70}")
-    print(f"📁 SOLICITUD DE CARGA MASIVA")
-    print(f"{'='*70}")
-    print(f"📦 Total archivos: {len(files)}")
-    
-    file_processing_progress["is_processing"] = True
-    file_processing_progress["total_files"] = len(files)
-    file_processing_progress["processed_files"] = 0
+def batch_result(filename: str, outcome: dict) -> dict:
+    """Resultado por archivo de una carga masiva"""
+    if outcome["status"] == "duplicate":
+        return {
+            "file": filename,
+            "status": "duplicate",
+            "message": "Archivo ya fue cargado",
+            "movements": outcome["file_info"]["movimientos"]
+        }
     
-    if len(files) > MAX_FILES_PER_BATCH:
-        print(f"❌ RECHAZO: Demasiados archivos ({len(files)} > {MAX_FILES_PER_BATCH})")
-        file_processing_progress["is_processing"] = False
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": "error",
-                "message": f"Máximo {MAX_FILES_PER_BATCH} archivos por carga (enviaste {len(files)})",
-                "limite": MAX_FILES_PER_BATCH,
-                "enviados": len(files)
-            }
-        )
+    if outcome["status"] == "empty":
+        return {
+            "file": filename,
+            "status": "error",
+            "message": "No se extrajeron movimientos",
+            "movements": 0
+        }
     
+    movements = outcome["movements"]
+    detection = outcome["detection"]
+    return {
+        "file": filename,
+        "status": "success",
+        "message": f"{len(movements)} movimientos extraídos",
+        "movements": len(movements),
+        "institucion": detection['institution'],
+        "tipo_producto": detection['product_type'],
+        "deteccion_confianza": detection['confidence'],
+        "activo": True
+    }
+
+def process_batch_upload(job: UploadJob, entries: list) -> tuple:
+    """
+    Procesa una carga masiva; retorna (status_code, contenido).
+    `entries` trae por archivo su ruta temporal o el resultado de error ya decidido.
+
+    1. Hash y descarte de duplicados (ya cargados o repetidos dentro del lote)
+    2. Detección y parseo en paralelo en el pool de procesos
+    3. Registro y resultados en el orden en que llegaron los archivos
+    """
     results = []
     total_movements = 0
     successful = 0
     duplicates = 0
     errors = 0
     
-    for idx, file in enumerate(files, 1):
-        print(f"\n[{idx}/{len(files)}] Procesando: {file.filename}")
-        
-        file_processing_progress["current_file"] = file.filename
-        file_processing_progress["processed_files"] = idx - 1
-        file_processing_progress["progress"] = int((idx / len(files)) * 100)
-        file_processing_progress["message"] = f"Procesando {file.filename} ({idx}/{len(files)})"
-        
-        temp_path = None
-        try:
-            file_ext = Path(file.filename).suffix.lower()
-            if file_ext not in ['.xlsx', '.xls', '.pdf']:
-                print(f"   ❌ Extensión no permitida")
-                results.append({
-                    "file": file.filename,
-                    "status": "error",
-                    "message": "Extensión no permitida",
-                    "movements": 0
-                })
-                errors += 1
+    try:
+        # 1. Hash y duplicados
+        upload_jobs.update(job, progress=5, message="Verificando duplicados...")
+        first_by_hash = {}
+        to_parse = []
+        for entry in entries:
+            if entry.get("error"):
                 continue
-            
-            temp_path = UPLOAD_DIR / file.filename
-            content = await file.read()
-            
-            with open(temp_path, "wb") as f:
-                f.write(content)
-            
-            file_size_mb = temp_path.stat().st_size / (1024 * 1024)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                temp_path.unlink()
-                print(f"   ❌ Archivo muy grande ({file_size_mb:.2f}MB)")
-                results.append({
-                    "file": file.filename,
-                    "status": "error",
-                    "message": f"Archivo muy grande ({file_size_mb:.2f}MB > {MAX_FILE_SIZE_MB}MB)",
-                    "movements": 0
-                })
-                errors += 1
+            try:
+                entry["file_hash"] = calculate_file_hash(entry["temp_path"])
+            except Exception as e:
+                entry["error"] = {"file": entry["file"], "status": "error", "message": str(e), "movements": 0}
                 continue
             
-            print(f"   ✅ Guardado ({file_size_mb:.2f}MB)")
-            
-            file_hash = calculate_file_hash(temp_path)
+            if entry["file_hash"] in first_by_hash:
+                entry["same_as"] = first_by_hash[entry["file_hash"]]
+            elif not is_file_already_uploaded(entry["file_hash"])["is_duplicate"]:
+                first_by_hash[entry["file_hash"]] = entry
+                to_parse.append(entry)
+        
+        # 2. Detección y parseo en paralelo
+        logger.info("⚙️  Parseando %s archivo(s) en paralelo...", len(to_parse))
+        futures = {parse_pool.submit(entry["temp_path"]): entry for entry in to_parse}
+        for done_count, future in enumerate(as_completed(futures), 1):
+            entry = futures[future]
+            try:
+                entry["parsed"] = future.result()
+            except Exception as e:
+                entry["parse_error"] = e
+            upload_jobs.update(
+                job,
+                progress=10 + int(80 * done_count / len(futures)),
+                message=f"Extraídos {done_count}/{len(futures)} archivo(s)",
+                current_file=entry["file"],
+                processed_files=done_count
+            )
+        
+        # 3. Registro en orden de llegada
+        upload_jobs.update(job, progress=90, message="Registrando archivos...")
+        for idx, entry in enumerate(entries, 1):
+            filename = entry["file"]
+            logger.info("[%s/%s] Registrando: %s", idx, len(entries), filename)
             
-            duplicate_check = is_file_already_uploaded(file_hash)
-            if duplicate_check["is_duplicate"]:
-                temp_path.unlink()
-                print(f"   ⚠️  DUPLICADO")
-                results.append({
-                    "file": file.filename,
-                    "status": "duplicate",
-                    "message": "Archivo ya fue cargado",
-                    "movements": duplicate_check["file_info"]["movimientos"]
-                })
-                duplicates += 1
+            if entry.get("error"):
+                results.append(entry["error"])
+                errors += 1
                 continue
             
-            print(f"   🔍 Detectando institución y tipo...")
-            detection = file_detector.detect_from_file(str(temp_path))
-            print(f"   🏦 {detection['institution']} - {detection['product_type']} (confianza: {detection['confidence']})")
-            
-            movements = []
-            if file_ext == '.pdf':
-                movements = file_reader.read_pdf(str(temp_path))
-            else:
-                movements = file_reader.read_xlsx(str(temp_path))
-            
-            # ✅ GENERAR IDs CONSISTENTES
-            movements = enrich_movements_with_ids(movements, file.filename)
+            temp_path = entry["temp_path"]
+            try:
+                duplicate_check = is_file_already_uploaded(entry["file_hash"])
+                if duplicate_check["is_duplicate"]:
+                    logger.warning("⚠️  DUPLICADO: %s", filename)
+                    temp_path.unlink()
+                    outcome = {"status": "duplicate", "file_info": duplicate_check["file_info"]}
+                else:
+                    # Un archivo repetido en el lote cuyo original falló reutiliza ese parseo
+                    parsed_entry = entry.get("same_as", entry)
+                    if "parse_error" in parsed_entry:
+                        raise parsed_entry["parse_error"]
+                    detection, movements = parsed_entry["parsed"]
+                    logger.info("🏦 %s - %s (confianza: %s)",
+                                detection['institution'], detection['product_type'], detection['confidence'])
+                    outcome = register_parsed_file(
+                        temp_path, filename, entry["file_hash"], detection, [m.copy() for m in movements]
+                    )
+                
+                result = batch_result(filename, outcome)
+                results.append(result)
+                if result["status"] == "success":
+                    successful += 1
+                    total_movements += result["movements"]
+                elif result["status"] == "duplicate":
+                    duplicates += 1
+                else:
+                    errors += 1
+                
+            except Exception as e:
+                logger.error("❌ ERROR en %s: %s", filename, e)
+                if temp_path.exists():
+                    temp_path.unlink()
                 
-            if not movements:
-                temp_path.unlink()
-                print(f"   ❌ Sin movimientos")
                 results.append({
-                    "file": file.filename,
+                    "file": filename,
                     "status": "error",
-                    "message": "No se extrajeron movimientos",
+                    "message": str(e),
                     "movements": 0
                 })
                 errors += 1
-                continue
-            
-            for movement in movements:
-                if 'categoria' not in movement:
-                    movement['categoria'] = ''
-                if 'subcategoria' not in movement:
-                    movement['subcategoria'] = ''
-
-            for movement in movements:
-                movement['institucion'] = detection['institution']
-                movement['tipo_producto'] = detection['product_type']
-                movement['deteccion_confianza'] = detection['confidence']
-            
-            register_uploaded_file(file_hash, file.filename, len(movements), movements, detection)
-            active_files.add(file_hash)
-            save_active_files()
-            
-            processed_path = PROCESSED_DIR / file.filename
-            shutil.move(str(temp_path), str(processed_path))
-            
-            print(f"   ✅ ÉXITO: {len(movements)} movimientos")
-            results.append({
+    finally:
+        shutil.rmtree(UPLOAD_DIR / job.id, ignore_errors=True)
+    
+    logger.info("📊 RESUMEN DE CARGA MASIVA: %s exitosos, %s duplicados, %s errores, %s movimientos",
+                successful, duplicates, errors, total_movements)
+    
+    upload_jobs.update(job, message="✅ Carga completada", processed_files=len(entries))
+    
+    return 200, {
+        "status": "completed",
+        "message": f"Carga masiva completada: {successful} exitosos, {duplicates} duplicados, {errors} errores",
+        "resumen": {
+            "total_archivos": len(entries),
+            "exitosos": successful,
+            "duplicados": duplicates,
+            "errores": errors,
+            "total_movimientos": total_movements
+        },
+        "resultados": results,
+        "limites": {
+            "max_archivos_por_carga": MAX_FILES_PER_BATCH,
+            "max_tamaño_archivo_mb": MAX_FILE_SIZE_MB
+        }
+    }
+
+@app.post("/upload-batch")
+async def upload_batch(files: list[UploadFile] = File(...)):
+    """Acepta múltiples archivos y encola su procesamiento; retorna 202 con el id del trabajo"""
+    logger.info("📁 SOLICITUD DE CARGA MASIVA: %s archivos", len(files))
+    
+    if len(files) > MAX_FILES_PER_BATCH:
+        logger.error("❌ RECHAZO: Demasiados archivos (%s > %s)", len(files), MAX_FILES_PER_BATCH)
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "message": f"Máximo {MAX_FILES_PER_BATCH} archivos por carga (enviaste {len(files)})",
+                "limite": MAX_FILES_PER_BATCH,
+                "enviados": len(files)
+            }
+        )
+    
+    job = UploadJob("masiva", total_files=len(files))
+    entries = []
+    
+    for idx, file in enumerate(files):
+        entry = {"file": file.filename}
+        entries.append(entry)
+        
+        file_ext = Path(file.filename).suffix.lower()
+        if file_ext not in ['.xlsx', '.xls', '.pdf']:
+            logger.error("❌ %s: Extensión no permitida", file.filename)
+            entry["error"] = {
                 "file": file.filename,
-                "status": "success",
-                "message": f"{len(movements)} movimientos extraídos",
-                "movements": len(movements),
-                "institucion": detection['institution'],
-                "tipo_producto": detection['product_type'],
-                "deteccion_confianza": detection['confidence'],
-                "activo": True
-            })
-            
-            successful += 1
-            total_movements += len(movements)
-            
-        except Exception as e:
-            print(f"   ❌ ERROR: {str(e)}")
-            if temp_path and temp_path.exists():
-                temp_path.unlink()
-            
-            results.append({
+                "status": "error",
+                "message": "Extensión no permitida",
+                "movements": 0
+            }
+            continue
+        
+        # Un subdirectorio por archivo: el lote puede traer nombres repetidos
+        file_dir = new_upload_dir(job) / str(idx)
+        file_dir.mkdir(exist_ok=True)
+        temp_path = file_dir / file.filename
+        content = await file.read()
+        
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        
+        file_size_mb = temp_path.stat().st_size / (1024 * 1024)
+        if file_size_mb > MAX_FILE_SIZE_MB:
+            shutil.rmtree(file_dir, ignore_errors=True)
+            logger.error("❌ %s: Archivo muy grande (%.2fMB)", file.filename, file_size_mb)
+            entry["error"] = {
                 "file": file.filename,
                 "status": "error",
-                "message": str(e),
+                "message": f"Archivo muy grande ({file_size_mb:.2f}MB > {MAX_FILE_SIZE_MB}MB)",
                 "movements": 0
-            })
-            errors += 1
-    
-    print(f"\n{'='*70}")
-    print(f"📊 RESUMEN DE CARGA MASIVA")
-    print(f"{'='*70}")
-    print(f"✅ Exitosos: {successful}")
-    print(f"⚠️  Duplicados: {duplicates}")
-    print(f"❌ Errores: {errors}")
-    print(f"📈 Total movimientos: {total_movements}")
-    print(f"{'='*70}\n")
-    
-    file_processing_progress["progress"] = 100
-    file_processing_progress["message"] = "✅ Carga completada"
+            }
+            continue
+        
+        logger.info("✅ %s: guardado (%.2fMB)", file.filename, file_size_mb)
+        entry["temp_path"] = temp_path
     
-    await asyncio.sleep(2)
-    file_processing_progress["is_processing"] = False
+    upload_jobs.submit(job, process_batch_upload, entries)
+    logger.info("📥 Trabajo en cola: %s", job.id)
     
     return JSONResponse(
-        status_code=200,
+        status_code=202,
         content={
-            "status": "completed",
-            "message": f"Carga masiva completada: {successful} exitosos, {duplicates} duplicados, {errors} errores",
-            "resumen": {
-                "total_archivos": len(files),
-                "exitosos": successful,
-                "duplicados": duplicates,
-                "errores": errors,
-                "total_movimientos": total_movements
-            },
-            "resultados": results,
-            "limites": {
-                "max_archivos_por_carga": MAX_FILES_PER_BATCH,
-                "max_tamaño_archivo_mb": MAX_FILE_SIZE_MB
-            }
+            "status": "accepted",
+            "message": f"{len(files)} archivo(s) en cola de procesamiento",
+            "total_archivos": len(files),
+            "job_id": job.id
         }
     )
 
 @app.get("/uploaded-files")
-async def get_uploaded_files():
-    """Obtiene lista de archivos cargados"""
+def get_uploaded_files(request: Request, response: Response):
+    """Obtiene lista de archivos cargados (304 si el ETag del cliente sigue vigente)"""
+    etag = current_etag()
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
     try:
         archivos = []
         
-        for file_hash, file_info in uploaded_files_registry.items():
+        for file_info in storage.list_files():
+            file_hash = file_info["hash"]
+            stored_mes = file_info.get("ultimo_mes")
             
-            if "ultimo_mes" not in file_info or file_info.get("ultimo_mes") == "N/A":
+            if stored_mes is None or stored_mes == "N/A":
                 try:
                     file_path = None
                     nombre_archivo = file_info.get("nombre", "")
@@ -693,10 +1020,7 @@ async def get_uploaded_files():
                                 break
                     
                     if file_path:
-                        if nombre_archivo.lower().endswith('.pdf'):
-                            movements = file_reader.read_pdf(str(file_path))
-                        else:
-                            movements = file_reader.read_xlsx(str(file_path))
+                        movements = read_file_movements(file_hash, file_path)
                         
                         if movements:
                             fechas = [m.get('fecha') for m in movements if m.get('fecha')]
@@ -710,7 +1034,11 @@ async def get_uploaded_files():
                         else:
                             file_info["ultimo_mes"] = "N/A"
                         
-                        save_registry()
+                        # Sólo se guarda un mes real y nuevo; no sube la versión de datos
+                        # (esta misma respuesta ya lo muestra) para no invalidar su ETag
+                        if file_info["ultimo_mes"] not in (stored_mes, "N/A"):
+                            storage.update_file(file_hash, bump_version=False,
+                                                ultimo_mes=file_info["ultimo_mes"])
                     else:
                         file_info["ultimo_mes"] = "N/A"
                 except Exception as e:
@@ -721,11 +1049,12 @@ async def get_uploaded_files():
                 "nombre": file_info.get('nombre', 'Desconocido'),
                 "fecha_carga": file_info.get('fecha_carga', ''),
                 "movimientos": file_info.get('movimientos', 0),
-                "activo": file_hash in active_files,
+                "activo": file_info["activo"],
                 "institucion": file_info.get('institucion', 'Desconocida'),
                 "ultimo_mes": file_info.get('ultimo_mes', 'N/A'),
             })
 
+        response.headers.update(etag_headers(etag))
         return {"status": "success", "archivos": archivos}
 
     except Exception as e:
@@ -735,20 +1064,21 @@ async def get_uploaded_files():
         )
 
 @app.post("/uploaded-files/{file_hash}/activate")
-async def activate_file(file_hash: str):
+def activate_file(file_hash: str):
     """Activa un archivo"""
-    if file_hash not in uploaded_files_registry:
+    file_info = storage.get_file(file_hash)
+    if file_info is None:
         return JSONResponse(
             status_code=404,
             content={"status": "error", "message": f"Archivo no encontrado: {file_hash}"}
         )
     
     try:
-        file_info = uploaded_files_registry[file_hash]
-        active_files.add(file_hash)
-        save_active_files()
+        storage.set_file_active(file_hash, True)
+        invalidate_movement_index()
+        update_similarity_index(file_hash)
         
-        print(f"✅ Activado: {file_info['nombre']}")
+        logger.info("✅ Activado: %s", file_info['nombre'])
         
         return {
             "status": "success",
@@ -764,18 +1094,19 @@ async def activate_file(file_hash: str):
 @app.post("/uploaded-files/{file_hash}/deactivate")
 async def deactivate_file(file_hash: str):
     """Desactiva un archivo"""
-    if file_hash not in uploaded_files_registry:
+    file_info = storage.get_file(file_hash)
+    if file_info is None:
         return JSONResponse(
             status_code=404,
             content={"status": "error", "message": f"Archivo no encontrado: {file_hash}"}
         )
     
     try:
-        file_info = uploaded_files_registry[file_hash]
-        active_files.discard(file_hash)
-        save_active_files()
+        storage.set_file_active(file_hash, False)
+        invalidate_movement_index()
+        remove_from_similarity_index(file_hash)
         
-        print(f"⏸️  Desactivado: {file_info['nombre']}")
+        logger.info("⏸️  Desactivado: %s", file_info['nombre'])
         
         return {
             "status": "success",
@@ -791,27 +1122,26 @@ async def deactivate_file(file_hash: str):
 @app.delete("/uploaded-files/{file_hash}")
 async def delete_uploaded_file(file_hash: str):
     """Elimina un archivo"""
-    if file_hash not in uploaded_files_registry:
+    file_info = storage.get_file(file_hash)
+    if file_info is None:
         return JSONResponse(
             status_code=404,
             content={"status": "error", "message": f"Archivo no encontrado: {file_hash}"}
         )
     
     try:
-        file_info = uploaded_files_registry[file_hash]
         filename = file_info['nombre']
         
         processed_path = PROCESSED_DIR / filename
         if processed_path.exists():
             processed_path.unlink()
         
-        active_files.discard(file_hash)
-        save_active_files()
-        
-        del uploaded_files_registry[file_hash]
-        save_registry()
+        parse_cache.invalidate(file_hash)
+        storage.delete_file(file_hash)
+        invalidate_movement_index()
+        remove_from_similarity_index(file_hash)
         
-        print(f"🗑️  Eliminado: {filename}")
+        logger.info("🗑️  Eliminado: %s", filename)
         
         return {
             "status": "success",
@@ -824,72 +1154,89 @@ async def delete_uploaded_file(file_hash: str):
             content={"status": "error", "message": str(e)}
         )
 
+def ndjson_lines(header: dict, chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    """Cuerpo NDJSON: la cabecera y luego un movimiento por línea, un bloque por tanda"""
+    yield (json.dumps(header, ensure_ascii=False) + "\n").encode("utf-8")
+    for chunk in chunks:
+        yield "".join(json.dumps(movement, ensure_ascii=False) + "\n" for movement in chunk).encode("utf-8")
+
 @app.get("/movements")
-async def get_movements():
-    """Retorna movimientos de archivos activos con IDs únicos"""
-    global movements_db
-    
-    all_movements = []
-    
-    print(f"\n📊 Obteniendo movimientos...")
-    print(f"   Archivos activos: {len(active_files)} de {len(uploaded_files_registry)}")
-    
-    for file_hash in active_files:
-        if file_hash in uploaded_files_registry:
-            file_info = uploaded_files_registry[file_hash]
-            filename = file_info['nombre']
-            
-            file_path = PROCESSED_DIR / filename
-            if file_path.exists():
-                try:
-                    if filename.lower().endswith('.pdf'):
-                        movements = file_reader.read_pdf(str(file_path))
-                    else:
-                        movements = file_reader.read_xlsx(str(file_path))
-                    
-                    # ✅ GENERAR IDs ÚNICOS (con índice)
-                    movements = enrich_movements_with_ids(movements, filename)
-                    
-                    if movements:
-                        for movement in movements:
-                            mov_id = movement.get('id')
-                            
-                           # ✅ NORMALIZADOR DE CATEGORÍAS
-                            if mov_id in movements_db:
-                                db_mov = movements_db[mov_id]
-                                cat = db_mov.get('categoria', '').strip().lower()
-                                if cat == 'sin categoría' or cat == 'sin categoria' or not cat:
-                                    movement['categoria'] = ''
-                                    movement['subcategoria'] = ''
-                                else:
-                                    movement['categoria'] = db_mov.get('categoria', '')
-                                    movement['subcategoria'] = db_mov.get('subcategoria', '')
-                            else:
-                                cat = movement.get('categoria', '').strip()
-                                subcat = movement.get('subcategoria', '').strip()
-                                
-                                if not cat or cat.lower() == 'sin categoría':
-                                    movement['categoria'] = ''
-                                    movement['subcategoria'] = ''
-                                else:
-                                    movement['categoria'] = cat
-                                    movement['subcategoria'] = subcat
-                            
-                            movement['institucion'] = file_info.get('institucion', 'unknown')
-                            movement['tipo_producto'] = file_info.get('tipo_producto', 'unknown')
-                        
-                        print(f"   ✅ {filename}: {len(movements)} movimientos")
-                        all_movements.extend(movements)
-                except Exception as e:
-                    print(f"   ❌ {filename}: Error - {e}")
-    
-    print(f"   Total: {len(all_movements)} movimientos\n")
-    
+def get_movements(
+    request: Request,
+    response: Response,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+    institucion: Optional[str] = None,
+    tipo_producto: Optional[str] = None,
+    tipo: Optional[str] = None,
+    categoria: Optional[str] = None,
+    sin_categoria: bool = False,
+    buscar: Optional[str] = None,
+    orden: Optional[str] = None,
+    limite: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    formato: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Retorna movimientos de archivos activos con IDs únicos.
+
+    Sin parámetros retorna todos los movimientos. Con parámetros filtra por
+    rango de fechas (desde/hasta, inclusivos), institución, tipo de producto,
+    tipo, categoría, sin_categoria y texto en la descripción; ordena con
+    `orden` (fecha, monto, descripcion; prefijo '-' = descendente) y pagina
+    con `limite` + `cursor` (siguiente_cursor de la página anterior).
+
+    Con formato=ndjson la respuesta sale en streaming: una primera línea con
+    status, total_movimientos, archivos_activos y siguiente_cursor, y luego
+    un movimiento por línea, armados y enviados de a STREAM_CHUNK_SIZE.
+
+    Responde 304 sin recalcular si el If-None-Match trae el ETag vigente.
+    """
+    from modules.movement_index import InvalidQueryError
+
+    etag = current_etag()
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    index = get_movement_index()
+
+    params = dict(
+        orden=orden, limite=limite, cursor=cursor,
+        desde=desde, hasta=hasta, institucion=institucion,
+        tipo_producto=tipo_producto, tipo=tipo, categoria=categoria,
+        sin_categoria=sin_categoria, buscar=buscar
+    )
+    try:
+        if formato == "ndjson":
+            result = index.stream(chunk_size=STREAM_CHUNK_SIZE, **params)
+        else:
+            result = index.query(**params)
+    except InvalidQueryError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": str(e)}
+        )
+
+    if formato == "ndjson":
+        header = {
+            "status": "success",
+            "total_movimientos": result['total'],
+            "archivos_activos": index.active_files,
+            "siguiente_cursor": result['siguiente_cursor']
+        }
+        return StreamingResponse(
+            ndjson_lines(header, result['movimientos']),
+            media_type="application/x-ndjson",
+            headers=etag_headers(etag)
+        )
+
+    response.headers.update(etag_headers(etag))
     return {
         "status": "success",
-        "total_movimientos": len(all_movements),
-        "archivos_activos": len(active_files),
-        "movimientos": all_movements
+        "total_movimientos": result['total'],
+        "archivos_activos": index.active_files,
+        "movimientos": result['movimientos'],
+        "siguiente_cursor": result['siguiente_cursor']
     }
 
 @app.get("/health")
@@ -898,8 +1245,8 @@ async def health_check():
     return {
         "status": "Healthy",
         "timestamp": datetime.now().isoformat(),
-        "archivos_cargados": len(uploaded_files_registry),
-        "archivos_activos": len(active_files),
+        "archivos_cargados": storage.count_files(),
+        "archivos_activos": storage.count_files(active_only=True),
         "limites": {
             "max_archivos_por_carga": MAX_FILES_PER_BATCH,
             "max_tamaño_archivo_mb": MAX_FILE_SIZE_MB
@@ -910,23 +1257,18 @@ async def health_check():
 async def delete_all_files():
     """Elimina TODOS los archivos cargados"""
     try:
-        global uploaded_files_registry, active_files
-
         if PROCESSED_DIR.exists():
             for file_path in PROCESSED_DIR.glob("*.pdf"):
                 file_path.unlink()
             for file_path in PROCESSED_DIR.glob("*.xlsx"):
                 file_path.unlink()
+        
+        parse_cache.clear()
+        storage.delete_all_files()
+        invalidate_movement_index()
+        remove_from_similarity_index()
 
-        uploaded_files_registry = {}
-        active_files = set()
-
-        save_registry()
-        save_active_files()
-
-        print("\n" + "="*70)
-        print("🗑️  TODOS LOS ARCHIVOS HAN SIDO ELIMINADOS")
-        print("="*70 + "\n")
+        logger.info("🗑️  TODOS LOS ARCHIVOS HAN SIDO ELIMINADOS")
 
         return {
             "status": "success",
@@ -944,7 +1286,7 @@ async def delete_all_files():
 # =====================================================================
 
 @app.post("/movements/find-similar")
-async def find_similar_movements(request: dict):
+def find_similar_movements(request: dict):
     """Encuentra movimientos similares a uno dado"""
     try:
         movement_id = request.get("movement_id")
@@ -958,75 +1300,13 @@ async def find_similar_movements(request: dict):
                 content={"status": "error", "message": "Faltan parámetros"}
             )
         
-        similar_movements = []
-        threshold = 0.65
-        
-        for file_hash in active_files:
-            if file_hash in uploaded_files_registry:
-                file_info = uploaded_files_registry[file_hash]
-                filename = file_info['nombre']
-                file_path = PROCESSED_DIR / filename
-                
-                if file_path.exists():
-                    try:
-                        if filename.lower().endswith('.pdf'):
-                            movements = file_reader.read_pdf(str(file_path))
-                        else:
-                            movements = file_reader.read_xlsx(str(file_path))
-                        
-                        # ✅ GENERAR IDs ÚNICOS
-                        movements = enrich_movements_with_ids(movements, filename)
-                        
-                        if not movements:
-                            continue
-                        
-                        for mov in movements:
-                            mov_id = mov.get('id')
-                            
-                            if mov_id == movement_id:
-                                continue
-                            
-                            mov_descripcion = mov.get('descripcion', '').lower().strip()
-                            input_descripcion = descripcion.lower().strip()
-                            
-                            if mov_descripcion == input_descripcion:
-                                similar_movements.append({
-                                    "id": mov_id,
-                                    "descripcion": mov.get('descripcion'),
-                                    "fecha": mov.get('fecha'),
-                                    "monto": mov.get('monto'),
-                                    "categoria_actual": mov.get('categoria', 'Sin Categoría'),
-                                    "subcategoria_actual": mov.get('subcategoria', 'Sin Subcategoría'),
-                                    "similitud": 100.0,
-                                    "tipo_similitud": "Exacta"
-                                })
-                            else:
-                                similarity = SequenceMatcher(
-                                    None,
-                                    input_descripcion,
-                                    mov_descripcion
-                                ).ratio()
-                                
-                                if similarity >= threshold:
-                                    similar_movements.append({
-                                        "id": mov_id,
-                                        "descripcion": mov.get('descripcion'),
-                                        "fecha": mov.get('fecha'),
-                                        "monto": mov.get('monto'),
-                                        "categoria_actual": mov.get('categoria', 'Sin Categoría'),
-                                        "subcategoria_actual": mov.get('subcategoria', 'Sin Subcategoría'),
-                                        "similitud": round(similarity * 100, 1),
-                                        "tipo_similitud": "Parcial"
-                                    })
-                    
-                    except Exception as e:
-                        print(f"⚠️  Error procesando {filename}: {e}")
-        
-        similar_movements.sort(
-            key=lambda x: (x['tipo_similitud'] != 'Exacta', -x['similitud'])
+        # Orden de recorrido original: archivos activos en orden de carga
+        active_hashes = [f['hash'] for f in storage.list_files(active_only=True)]
+        similar_movements = get_similarity_index().find_similar(
+            descripcion, exclude_id=movement_id, file_order=active_hashes
         )
         
-        print(f"✅ {len(similar_movements)} similares encontrados para: '{descripcion}'")
+        logger.info("✅ %s similares encontrados para: '%s'", len(similar_movements), descripcion)
         
         return JSONResponse(
             status_code=200,
@@ -1044,9 +1324,7 @@ async def find_similar_movements(request: dict):
         )
     
     except Exception as e:
-        print(f"❌ Error en find_similar: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error en find_similar: %s", e)
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": str(e)}
@@ -1055,8 +1333,6 @@ async def find_similar_movements(request: dict):
 @app.post("/movements/batch-categorize")
 async def batch_categorize_movements(request: dict):
     """Categoriza múltiples movimientos"""
-    global movements_db
-    
     try:
         movements_to_update = request.get("movements", [])
         learn = request.get("learn", True)
@@ -1067,39 +1343,41 @@ async def batch_categorize_movements(request: dict):
                 content={"status": "error", "message": "Lista vacía"}
             )
         
-        print(f"\n🔄 Actualizando {len(movements_to_update)} movimientos")
+        logger.info("🔄 Actualizando %s movimientos", len(movements_to_update))
         
         updated_count = 0
         
-        for update_data in movements_to_update:
-            mov_id = str(update_data.get('movement_id'))
-            categoria = update_data.get('categoria')
-            subcategoria = update_data.get('subcategoria')
-            descripcion = update_data.get('descripcion', '')
-            
-            print(f"   ✅ {descripcion[:50]}... → {categoria} / {subcategoria}")
-            
-            movements_db[mov_id] = {
-                'categoria': categoria,
-                'subcategoria': subcategoria,
-                'descripcion': descripcion,
-                'actualizado': datetime.now().isoformat()
-            }
-            
-            if learn and descripcion and categoria:
-                try:
-                    categorization_service.learn_mapping(
-                        pattern=descripcion,
-                        categoria=categoria,
-                        subcategoria=subcategoria
-                    )
-                except Exception as e:
-                    print(f"⚠️  Error aprendiendo patrón: {e}")
-            
-            updated_count += 1
+        # Una sola transacción (y una sola escritura de mapeos) para todo el lote
+        with storage.transaction(), categorization_service.batch():
+            for update_data in movements_to_update:
+                mov_id = str(update_data.get('movement_id'))
+                categoria = update_data.get('categoria')
+                subcategoria = update_data.get('subcategoria')
+                descripcion = update_data.get('descripcion', '')
+                
+                logger.debug("✅ %s... → %s / %s", descripcion[:50], categoria, subcategoria)
+                
+                storage.upsert_categorization(mov_id, {
+                    'categoria': categoria,
+                    'subcategoria': subcategoria,
+                    'descripcion': descripcion,
+                    'actualizado': datetime.now().isoformat()
+                })
+                
+                if learn and descripcion and categoria:
+                    try:
+                        categorization_service.learn_mapping(
+                            pattern=descripcion,
+                            categoria=categoria,
+                            subcategoria=subcategoria
+                        )
+                    except Exception as e:
+                        logger.warning("⚠️  Error aprendiendo patrón: %s", e)
+                
+                updated_count += 1
         
-        save_movements_db(movements_db)
-        print(f"💾 Guardados {updated_count} movimientos en BD")
+        invalidate_movement_index()
+        logger.info("💾 Guardados %s movimientos en BD", updated_count)
         
         return JSONResponse(
             status_code=200,
@@ -1112,9 +1390,7 @@ async def batch_categorize_movements(request: dict):
         )
         
     except Exception as e:
-        print(f"❌ Error en batch_categorize: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error en batch_categorize: %s", e)
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": str(e)}
@@ -1166,27 +1442,76 @@ async def categorize_movement(request: dict):
             content={"status": "error", "message": str(e)}
         )
 
+@app.post("/movements/auto-categorize")
+def auto_categorize_movements(request: dict = None):
+    """
+    Sugiere categorías para los movimientos activos con las reglas del servicio.
+
+    Por defecto considera sólo los movimientos sin categoría; acepta los mismos
+    filtros que /movements (desde, hasta, institucion, tipo_producto, tipo,
+    categoria, sin_categoria, buscar). No guarda nada: cada sugerencia indica
+    la regla que la decidió para que el usuario la confirme.
+    """
+    request = request or {}
+    try:
+        index = get_movement_index()
+        positions = index.positions(
+            desde=request.get("desde"),
+            hasta=request.get("hasta"),
+            institucion=request.get("institucion"),
+            tipo_producto=request.get("tipo_producto"),
+            tipo=request.get("tipo"),
+            categoria=request.get("categoria"),
+            sin_categoria=request.get("sin_categoria", True),
+            buscar=request.get("buscar")
+        )
+        movements = index.store.to_dicts(positions)
+
+        results = categorization_service.categorize_many(m.get('descripcion') for m in movements)
+
+        suggestions = []
+        por_regla = {}
+        for movement, (categoria, subcategoria, regla) in zip(movements, results):
+            por_regla[regla] = por_regla.get(regla, 0) + 1
+            suggestions.append({
+                "id": movement.get('id'),
+                "descripcion": movement.get('descripcion'),
+                "fecha": movement.get('fecha'),
+                "monto": movement.get('monto'),
+                "categoria_actual": movement.get('categoria', ''),
+                "subcategoria_actual": movement.get('subcategoria', ''),
+                "categoria_sugerida": categoria,
+                "subcategoria_sugerida": subcategoria,
+                "regla": regla
+            })
+
+        logger.info("🤖 Auto-categorización: %s movimientos, %s", len(suggestions), por_regla)
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "total_movimientos": len(suggestions),
+                "con_sugerencia": len(suggestions) - por_regla.get(RULE_NONE, 0),
+                "por_regla": por_regla,
+                "sugerencias": suggestions
+            }
+        )
+
+    except Exception as e:
+        logger.error("❌ Error en auto-categorización: %s", e)
+        return JSONResponse(
+            status_code=500,
+            content={"status": "error", "message": str(e)}
+        )
+
 @app.get("/categorization-stats")
 async def get_categorization_stats():
     """Retorna estadísticas de categorización"""
     try:
-        db_path = Path("backend/data/movements_db.json")
-        if not db_path.exists():
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "status": "success",
-                    "stats": {
-                        "total_movements": 0,
-                        "categorized": 0,
-                        "uncategorized": 0,
-                        "categorization_rate": 0.0
-                    }
-                }
-            )
-        
-        total = len(movements_db)
-        categorized = len([m for m in movements_db.values() if m.get('categoria') and m.get('categoria') != 'Sin Categoría'])
+        stats = storage.categorization_stats()
+        total = stats['total']
+        categorized = stats['categorized']
         uncategorized = total - categorized
         rate = (categorized / total * 100) if total > 0 else 0
         
@@ -1203,7 +1528,7 @@ async def get_categorization_stats():
             }
         )
     except Exception as e:
-        print(f"❌ Error obteniendo estadísticas: {str(e)}")
+        logger.error("❌ Error obteniendo estadísticas: %s", e)
         return JSONResponse(
             status_code=500,
             content={
@@ -1212,32 +1537,72 @@ async def get_categorization_stats():
             }
         )
 
+# =====================================================================
+# ENDPOINTS DE ANÁLISIS (DASHBOARD)
+# =====================================================================
+
+@app.get("/analytics/kpis")
+def get_analytics_kpis(desde: Optional[str] = None, hasta: Optional[str] = None):
+    """Totales de ingresos, gastos y saldo para una ventana de fechas"""
+    try:
+        kpis = get_movement_analytics().kpis(desde, hasta)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": str(e)}
+        )
+    return {"status": "success", **kpis}
+
+@app.get("/analytics/cash-flow")
+def get_analytics_cash_flow(periodo: str = "mes", desde: Optional[str] = None, hasta: Optional[str] = None):
+    """Flujo de caja por mes o por día (periodo = mes | dia)"""
+    try:
+        flujo = get_movement_analytics().cash_flow(periodo, desde, hasta)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": str(e)}
+        )
+    return {"status": "success", "periodo": periodo, "flujo": flujo}
+
+@app.get("/analytics/categories")
+def get_analytics_categories(tipo: str = "gasto", desde: Optional[str] = None, hasta: Optional[str] = None):
+    """Totales por categoría y subcategoría para un tipo (gasto | ingreso)"""
+    try:
+        categorias = get_movement_analytics().category_breakdown(tipo, desde, hasta)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": str(e)}
+        )
+    return {
+        "status": "success",
+        "tipo": tipo,
+        "total": sum(c['total'] for c in categorias),
+        "categorias": categorias
+    }
+
 # =====================================================================
 # ENDPOINTS DE CATEGORÍAS
 # =====================================================================
 
 @app.get("/categories")
-async def get_categories():
-    """Retorna todas las categorías y subcategorías disponibles"""
+async def get_categories(request: Request):
+    """Retorna todas las categorías y subcategorías disponibles (304 si el ETag sigue vigente)"""
     try:
-        categories_path = Path("backend/data/categories.json")
-        
-        if categories_path.exists():
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories_data = json.load(f)
-        else:
-            all_categories_list = categorization_service.get_all_categories()
-            categories_data = {}
-            for category in all_categories_list:
-                subcats = categorization_service.get_subcategories(category)
-                categories_data[category] = subcats
-        
+        # Una edición externa del JSON sube la versión al recargarse
+        categories_catalog.refresh()
+        etag = current_etag()
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
         return JSONResponse(
             status_code=200,
             content={
                 "status": "success",
-                "categories": categories_data
-            }
+                "categories": categories_catalog.as_dict()
+            },
+            headers=etag_headers(etag)
         )
     
     except Exception as e:
@@ -1258,21 +1623,8 @@ async def add_category(request: dict):
                 content={"status": "error", "message": "Falta el nombre de categoría"}
             )
         
-        categories_path = Path("backend/data/categories.json")
-        
-        if categories_path.exists():
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories_data = json.load(f)
-        else:
-            categories_data = {}
-        
-        if categoria not in categories_data:
-            categories_data[categoria] = ["Sin Subcategoría"]
-            
-            with open(categories_path, 'w', encoding='utf-8') as f:
-                json.dump(categories_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"✅ Categoría '{categoria}' agregada")
+        if categories_catalog.add_category(categoria):
+            logger.info("✅ Categoría '%s' agregada", categoria)
             return JSONResponse(
                 status_code=200,
                 content={
@@ -1305,32 +1657,16 @@ async def delete_category(request: dict):
                 content={"status": "error", "message": "Falta el nombre de categoría"}
             )
         
-        categories_path = Path("backend/data/categories.json")
-        
-        if categories_path.exists():
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories_data = json.load(f)
-            
-            if categoria in categories_data:
-                del categories_data[categoria]
-                
-                with open(categories_path, 'w', encoding='utf-8') as f:
-                    json.dump(categories_data, f, ensure_ascii=False, indent=2)
-                
-                print(f"✅ Categoría '{categoria}' eliminada")
-                return JSONResponse(
-                    status_code=200,
-                    content={"status": "success", "message": f"Categoría '{categoria}' eliminada"}
-                )
-            else:
-                return JSONResponse(
-                    status_code=404,
-                    content={"status": "error", "message": "Categoría no encontrada"}
-                )
+        if categories_catalog.delete_category(categoria):
+            logger.info("✅ Categoría '%s' eliminada", categoria)
+            return JSONResponse(
+                status_code=200,
+                content={"status": "success", "message": f"Categoría '{categoria}' eliminada"}
+            )
         else:
             return JSONResponse(
                 status_code=404,
-                content={"status": "error", "message": "Sin categorías guardadas"}
+                content={"status": "error", "message": "Categoría no encontrada"}
             )
     
     except Exception as e:
@@ -1352,27 +1688,16 @@ async def add_subcategory(request: dict):
                 content={"status": "error", "message": "Faltan parámetros (categoria, subcategoria)"}
             )
         
-        categories_path = Path("backend/data/categories.json")
-        
-        if categories_path.exists():
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories_data = json.load(f)
-        else:
-            categories_data = {}
-        
-        if categoria not in categories_data:
+        try:
+            added = categories_catalog.add_subcategory(categoria, subcategoria)
+        except KeyError:
             return JSONResponse(
                 status_code=404,
                 content={"status": "error", "message": f"Categoría '{categoria}' no existe"}
             )
         
-        if subcategoria not in categories_data[categoria]:
-            categories_data[categoria].append(subcategoria)
-            
-            with open(categories_path, 'w', encoding='utf-8') as f:
-                json.dump(categories_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"✅ Subcategoría '{subcategoria}' agregada a '{categoria}'")
+        if added:
+            logger.info("✅ Subcategoría '%s' agregada a '%s'", subcategoria, categoria)
             return JSONResponse(
                 status_code=200,
                 content={
@@ -1407,34 +1732,23 @@ async def delete_subcategory(request: dict):
                 content={"status": "error", "message": "Faltan parámetros"}
             )
         
-        if subcategoria == "Sin Subcategoría":
+        if subcategoria == DEFAULT_SUBCATEGORY:
             return JSONResponse(
                 status_code=400,
-                content={"status": "error", "message": "No se puede eliminar 'Sin Subcategoría'"}
+                content={"status": "error", "message": f"No se puede eliminar '{DEFAULT_SUBCATEGORY}'"}
             )
         
-        categories_path = Path("backend/data/categories.json")
-        
-        if categories_path.exists():
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories_data = json.load(f)
-            
-            if categoria in categories_data and subcategoria in categories_data[categoria]:
-                categories_data[categoria].remove(subcategoria)
-                
-                with open(categories_path, 'w', encoding='utf-8') as f:
-                    json.dump(categories_data, f, ensure_ascii=False, indent=2)
-                
-                print(f"✅ Subcategoría '{subcategoria}' eliminada de '{categoria}'")
-                return JSONResponse(
-                    status_code=200,
-                    content={"status": "success", "message": "Subcategoría eliminada"}
-                )
-            else:
-                return JSONResponse(
-                    status_code=404,
-                    content={"status": "error", "message": "Subcategoría no encontrada"}
-                )
+        if categories_catalog.delete_subcategory(categoria, subcategoria):
+            logger.info("✅ Subcategoría '%s' eliminada de '%s'", subcategoria, categoria)
+            return JSONResponse(
+                status_code=200,
+                content={"status": "success", "message": "Subcategoría eliminada"}
+            )
+        else:
+            return JSONResponse(
+                status_code=404,
+                content={"status": "error", "message": "Subcategoría no encontrada"}
+            )
     
     except Exception as e:
         return JSONResponse(
@@ -1442,7 +1756,9 @@ async def delete_subcategory(request: dict):
             content={"status": "error", "message": str(e)}
         )
 
-
+# Punto de entrada soportado: `uvicorn main:app` desde backend/ (ver README).
+# `python main.py` también sirve: importar main no tiene efectos, así que
+# los procesos de parseo que reimportan este módulo no arrancan nada.
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
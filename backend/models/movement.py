@@ -2,53 +2,183 @@
 Modelo para representar un movimiento bancario
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import math
+from datetime import date
+from typing import Any, Dict, Iterator, Optional, Union
+
+# Campos con slot propio, en el orden en que se serializan (los de detección
+# los agrega el registro de cada archivo, al final)
+FIELDS = (
+    'id', 'fecha', 'descripcion', 'monto', 'tipo', 'archivo_referencia',
+    'categoria', 'subcategoria', 'numero_operacion', 'banco', 'tipo_cuenta',
+    'institucion', 'tipo_producto', 'deteccion_confianza'
+)
+
+
+# Mayor monto (en unidades) cuyos centavos caben en un int64
+_MAX_AMOUNT = (2 ** 63 - 1) // 100
+
+
+def _to_date(value: Any) -> Any:
+    """Fecha YYYY-MM-DD como date; cualquier otro valor se guarda tal cual"""
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_cents(value: Any) -> Any:
+    """
+    Monto como centavos enteros. None, NaN, infinito u otros valores se
+    guardan tal cual y los montos fuera de rango como float (quedan como
+    montos inválidos)
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        if abs(value) <= _MAX_AMOUNT:
+            return value * 100
+        # Un int se leería como centavos: fuera de rango queda como float inválido
+        if abs(value) > 1e308:
+            return math.inf if value > 0 else -math.inf
+        return float(value)
+    if isinstance(value, float) and math.isfinite(value) and abs(value) <= _MAX_AMOUNT:
+        return round(value * 100)
+    return value
+
 
-@dataclass
 class Movement:
     """
     Representa un movimiento bancario (transacción)
-    
+
+    Compacto (__slots__): la fecha se guarda como date y el monto en
+    centavos enteros. Se lee y escribe como un dict (movement['monto'],
+    movement.get('fecha'), 'numero_operacion' in movement) con los mismos
+    valores que antes (fecha 'YYYY-MM-DD', monto float); to_dict() arma el
+    dict para JSON en el borde de la API. Un campo sin asignar no existe
+    (igual que una clave ausente); las claves fuera de FIELDS van a `extra`.
+
     Attributes:
         id: Identificador único del movimiento
-        fecha: Fecha en formato YYYY-MM-DD
+        fecha: Fecha (date)
         descripcion: Descripción del movimiento
-        monto: Cantidad de dinero (positivo=ingreso, negativo=gasto)
+        monto_centavos: Monto en centavos (siempre positivo; el signo lo da tipo)
         tipo: 'ingreso' o 'gasto'
         categoria: Categoría principal del movimiento
         subcategoria: Subcategoría del movimiento
         archivo_referencia: Nombre del archivo de origen
+        numero_operacion: N° de operación (sólo algunos bancos)
         banco: Nombre del banco de origen
         tipo_cuenta: Tipo de cuenta (Cuenta Corriente, Tarjeta Crédito, etc.)
+        institucion: Institución detectada del archivo
+        tipo_producto: Producto detectado del archivo
+        deteccion_confianza: Confianza de la detección
     """
-    
-    id: int
-    fecha: str
-    descripcion: str
-    monto: float
-    tipo: str  # 'ingreso' o 'gasto'
-    categoria: Optional[str] = "Sin Categoría"
-    subcategoria: Optional[str] = "Sin Subcategoría"
-    archivo_referencia: Optional[str] = None
-    banco: Optional[str] = None
-    tipo_cuenta: Optional[str] = None
-    
-    def to_dict(self):
-        """Convierte el movimiento a diccionario"""
-        return {
-            'id': self.id,
-            'fecha': self.fecha,
-            'descripcion': self.descripcion,
-            'monto': self.monto,
-            'tipo': self.tipo,
-            'categoria': self.categoria,
-            'subcategoria': self.subcategoria,
-            'archivo_referencia': self.archivo_referencia,
-            'banco': self.banco,
-            'tipo_cuenta': self.tipo_cuenta
-        }
-    
+
+    __slots__ = (
+        'id', 'fecha', 'descripcion', 'monto_centavos', 'tipo', 'archivo_referencia',
+        'categoria', 'subcategoria', 'numero_operacion', 'banco', 'tipo_cuenta',
+        'institucion', 'tipo_producto', 'deteccion_confianza', 'extra'
+    )
+
+    def __init__(self, id: Union[int, str], fecha: Union[date, str], descripcion: str,
+                 monto: float, tipo: str, **fields):
+        self.id = id
+        self.fecha = _to_date(fecha)
+        self.descripcion = descripcion
+        self.monto_centavos = _to_cents(monto)
+        self.tipo = tipo
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Movement':
+        movement = cls.__new__(cls)
+        for key, value in data.items():
+            movement[key] = value
+        return movement
+
+    @property
+    def monto(self) -> Optional[float]:
+        cents = self.monto_centavos
+        return cents / 100 if isinstance(cents, int) and not isinstance(cents, bool) else cents
+
+    # =================================================================
+    # ACCESO COMO DICT
+    # =================================================================
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            if key == 'fecha':
+                fecha = self.fecha
+                return fecha.isoformat() if isinstance(fecha, date) else fecha
+            if key == 'monto':
+                return self.monto
+            if key in FIELDS:
+                return getattr(self, key)
+            return self.extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'fecha':
+            self.fecha = _to_date(value)
+        elif key == 'monto':
+            self.monto_centavos = _to_cents(value)
+        elif key in FIELDS:
+            setattr(self, key, value)
+        else:
+            try:
+                self.extra[key] = value
+            except AttributeError:
+                self.extra = {key: value}
+
+    def __contains__(self, key: str) -> bool:
+        if key in FIELDS:
+            return hasattr(self, 'monto_centavos' if key == 'monto' else key)
+        return key in getattr(self, 'extra', ())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        for key in FIELDS:
+            if key in self:
+                yield key
+        yield from getattr(self, 'extra', {})
+
+    __iter__ = keys
+
+    def copy(self) -> 'Movement':
+        clone = Movement.__new__(Movement)
+        for slot in Movement.__slots__:
+            try:
+                setattr(clone, slot, getattr(self, slot))
+            except AttributeError:
+                pass
+        if hasattr(clone, 'extra'):
+            clone.extra = dict(clone.extra)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el movimiento a diccionario (tipos JSON)"""
+        return {key: self[key] for key in self.keys()}
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in Movement.__slots__ if hasattr(self, slot)}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __repr__(self):
+        return f"Movement({self.to_dict()!r})"
+
     def __str__(self):
         """Representación en string del movimiento"""
-        return f"{self.fecha} | {self.descripcion} | ${self.monto} | {self.tipo}"
\ No newline at end of file
+        return f"{self['fecha']} | {self.descripcion} | ${self.monto} | {self.tipo}"
@@ -0,0 +1,253 @@
+"""
+Catálogo de categorías y subcategorías
+Única copia en memoria de categories.json: las lecturas no abren el
+archivo (a lo más un stat por segundo para ver si cambió por fuera) y
+cada cambio se escribe completo con un temporal + rename atómico. Si el
+JSON no existe se crea desde categories.csv.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SUBCATEGORY = "Sin Subcategoría"
+
+# Segundos entre revisiones del archivo (mtime y tamaño)
+CHECK_INTERVAL = 1.0
+
+
+def read_categories_csv(csv_path: Union[str, Path]) -> Dict[str, List[str]]:
+    """Categoría -> subcategorías en el orden del CSV (columnas Categoría;Subcategoría)"""
+    categories: Dict[str, List[str]] = {}
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            categoria = row.get('Categoría')
+            subcategoria = row.get('Subcategoría')
+            if not categoria:
+                continue
+            subcategories = categories.setdefault(categoria, [])
+            if subcategoria:
+                subcategories.append(subcategoria)
+    return categories
+
+
+class CategoriesCatalog:
+    """Categorías y subcategorías en memoria, persistidas en un JSON"""
+
+    def __init__(self, path: Optional[Union[str, Path]], seed_csv: Optional[Union[str, Path]] = None,
+                 check_interval: float = CHECK_INTERVAL, on_change: Callable[[], None] = None):
+        """
+        Args:
+            path: JSON del catálogo (None = sólo en memoria, sin persistir)
+            seed_csv: CSV con el catálogo inicial si el JSON no existe
+            check_interval: Segundos entre revisiones de cambios externos al JSON
+            on_change: Se llama tras cada cambio o recarga del catálogo
+        """
+        self.path = Path(path) if path is not None else None
+        self.seed_csv = Path(seed_csv) if seed_csv is not None else None
+        self.check_interval = check_interval
+        self.on_change = on_change
+        self._lock = threading.RLock()
+        self._categories: Dict[str, List[str]] = {}
+        self._subcategory_sets: Dict[str, set] = {}
+        self._snapshot: Optional[Dict[str, List[str]]] = None
+        self._signature = None
+        self._loaded = False
+        self._checked_at = 0.0
+
+    @classmethod
+    def from_csv(cls, csv_path: Union[str, Path]) -> 'CategoriesCatalog':
+        """Catálogo en memoria armado desde el CSV (sin JSON)"""
+        return cls(None, seed_csv=csv_path)
+
+    # =================================================================
+    # CARGA Y PERSISTENCIA
+    # =================================================================
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _seed(self) -> Dict[str, List[str]]:
+        if self.seed_csv is None or not self.seed_csv.exists():
+            return {}
+        categories = read_categories_csv(self.seed_csv)
+        return {
+            categoria: categories[categoria] or [DEFAULT_SUBCATEGORY]
+            for categoria in sorted(categories)
+        }
+
+    def _set(self, categories: Dict[str, List[str]]) -> None:
+        self._categories = {categoria: list(subcategories) for categoria, subcategories in categories.items()}
+        self._subcategory_sets = {categoria: set(subcategories) for categoria, subcategories in self._categories.items()}
+        self._snapshot = None
+
+    def _changed(self) -> None:
+        self._snapshot = None
+        if self.on_change is not None:
+            self.on_change()
+
+    def _write(self) -> None:
+        """Escribe el catálogo completo (temporal + rename atómico)"""
+        if self.path is None:
+            self._changed()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._categories, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._signature = self._file_signature()
+        self._changed()
+
+    def _ensure_current(self, force: bool = False) -> None:
+        """
+        Carga el catálogo la primera vez y lo recarga si el JSON cambió (llamar con el lock).
+        Sin `force` el archivo se revisa a lo más una vez cada check_interval segundos.
+        """
+        if self._loaded and (self.path is None or
+                             (not force and time.monotonic() - self._checked_at < self.check_interval)):
+            return
+        self._checked_at = time.monotonic()
+
+        if self.path is None:
+            self._set(self._seed())
+            self._loaded = True
+            return
+
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+
+        if signature is None:
+            logger.info("🔄 Inicializando categorías desde CSV...")
+            self._set(self._seed())
+            self._write()
+            logger.info("✅ Categorías inicializadas en JSON: %s categorías", len(self._categories))
+        else:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except ValueError as e:
+                if not self._loaded:
+                    raise
+                # Escritura externa a medias: se mantiene la copia en memoria
+                logger.warning("⚠️  %s inválido, se mantiene el catálogo cargado: %s", self.path.name, e)
+                self._signature = signature
+                return
+            self._set(data)
+            self._signature = signature
+            if self._loaded:
+                self._changed()
+        self._loaded = True
+
+    # =================================================================
+    # LECTURA
+    # =================================================================
+
+    def refresh(self) -> None:
+        """Recarga el catálogo si el JSON cambió por fuera (revisión limitada por check_interval)"""
+        with self._lock:
+            self._ensure_current()
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """Catálogo completo {categoría: [subcategorías]} (no modificar)"""
+        with self._lock:
+            self._ensure_current()
+            if self._snapshot is None:
+                self._snapshot = {categoria: list(subcategories) for categoria, subcategories in self._categories.items()}
+            return self._snapshot
+
+    def categories(self) -> List[str]:
+        """Categorías en el orden del catálogo"""
+        with self._lock:
+            self._ensure_current()
+            return list(self._categories)
+
+    def subcategories(self, categoria: str) -> List[str]:
+        """Subcategorías de una categoría ([] si no existe)"""
+        with self._lock:
+            self._ensure_current()
+            return list(self._categories.get(categoria, []))
+
+    def default_subcategory(self, categoria: str) -> str:
+        """Primera subcategoría de una categoría"""
+        with self._lock:
+            self._ensure_current()
+            subcategories = self._categories.get(categoria)
+            return subcategories[0] if subcategories else DEFAULT_SUBCATEGORY
+
+    def has_category(self, categoria: str) -> bool:
+        with self._lock:
+            self._ensure_current()
+            return categoria in self._categories
+
+    def has_subcategory(self, categoria: str, subcategoria: str) -> bool:
+        with self._lock:
+            self._ensure_current()
+            return subcategoria in self._subcategory_sets.get(categoria, ())
+
+    # =================================================================
+    # CAMBIOS (se escriben al JSON de inmediato)
+    # =================================================================
+
+    def add_category(self, categoria: str) -> bool:
+        """Agrega una categoría con DEFAULT_SUBCATEGORY; False si ya existe"""
+        with self._lock:
+            self._ensure_current(force=True)
+            if categoria in self._categories:
+                return False
+            self._categories[categoria] = [DEFAULT_SUBCATEGORY]
+            self._subcategory_sets[categoria] = {DEFAULT_SUBCATEGORY}
+            self._write()
+            return True
+
+    def delete_category(self, categoria: str) -> bool:
+        """Elimina una categoría; False si no existe"""
+        with self._lock:
+            self._ensure_current(force=True)
+            if categoria not in self._categories:
+                return False
+            del self._categories[categoria]
+            del self._subcategory_sets[categoria]
+            self._write()
+            return True
+
+    def add_subcategory(self, categoria: str, subcategoria: str) -> bool:
+        """Agrega una subcategoría al final; False si ya existe, KeyError si la categoría no existe"""
+        with self._lock:
+            self._ensure_current(force=True)
+            if categoria not in self._categories:
+                raise KeyError(categoria)
+            if subcategoria in self._subcategory_sets[categoria]:
+                return False
+            self._categories[categoria].append(subcategoria)
+            self._subcategory_sets[categoria].add(subcategoria)
+            self._write()
+            return True
+
+    def delete_subcategory(self, categoria: str, subcategoria: str) -> bool:
+        """Elimina una subcategoría; False si no existe"""
+        with self._lock:
+            self._ensure_current(force=True)
+            if subcategoria not in self._subcategory_sets.get(categoria, ()):
+                return False
+            subcategories = self._categories[categoria]
+            subcategories.remove(subcategoria)
+            if subcategoria not in subcategories:
+                self._subcategory_sets[categoria].discard(subcategoria)
+            self._write()
+            return True
@@ -1,18 +1,50 @@
-import pandas as pd
-from typing import Tuple, Optional, Dict
-from pathlib import Path
 import json
+from datetime import datetime
+from typing import Tuple, Optional, Dict, Iterable, List
+from pathlib import Path
+from contextlib import contextmanager
+
+from .categories_catalog import CategoriesCatalog
+from .keyword_matcher import KeywordMatcher
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Palabras clave de transferencias internas (máxima prioridad)
+TRANSFER_KEYWORDS = [
+    'pago tarjeta', 'pago tdc', 'pago cmr',
+    'transferencia a tarjeta', 'transferencia a t.',
+    'monto cancelado', 'pago de cuenta',
+    'abono tarjeta', 'nota de credito',
+    'transferencia a cuenta', 'pago cuenta'
+]
+
+# Regla que decidió la categoría (nivel de prioridad)
+RULE_TRANSFER = 'transferencia_interna'
+RULE_LEARNED = 'mapeo_aprendido'
+RULE_KEYWORD = 'palabra_clave'
+RULE_NONE = 'sin_coincidencia'
 
 class CategorizationService:
     """Servicio de categorización de movimientos con aprendizaje"""
     
-    def __init__(self, csv_path: str = "categories.csv", mappings_path: str = "processed_files/movimento_categorizations.json"):
-        """Carga categorías desde CSV y mapeos aprendidos"""
+    def __init__(self, csv_path: str = "categories.csv", mappings_path: str = "processed_files/movimento_categorizations.json", storage=None,
+                 catalog: CategoriesCatalog = None):
+        """
+        Carga categorías y mapeos aprendidos
+        
+        Si se entrega `storage` los mapeos se guardan fila a fila en SQLite;
+        si no, en el JSON de `mappings_path`.
+        Las categorías salen de `catalog` o, si no se entrega, del CSV.
+        """
         self.csv_path = csv_path
         self.mappings_path = Path(mappings_path)
-        self.categories_df = pd.read_csv(csv_path, sep=';')
+        self.storage = storage
+        self._batch_depth = 0
+        self.catalog = catalog if catalog is not None else CategoriesCatalog.from_csv(csv_path)
         self.patterns = self._build_patterns()
         self.learned_mappings = self._load_learned_mappings()
+        self._build_matcher()
     
     def _build_patterns(self) -> Dict[str, list]:
         """Crea patrones de palabras clave para cada categoría"""
@@ -65,25 +97,105 @@ class CategorizationService:
         }
         return patterns
     
+    def _build_matcher(self):
+        """
+        Compila los tres niveles en un solo autómata. Para cada patrón se guarda
+        su prioridad: los mapeos aprendidos por orden de inserción (gana el
+        primero) y las palabras clave por (confianza, orden) como en el recorrido.
+        """
+        self.matcher = KeywordMatcher()
+        self._transfer_keywords = set(TRANSFER_KEYWORDS)
+        for keyword in self._transfer_keywords:
+            self.matcher.add(keyword)
+        
+        # palabra clave -> (confianza, -orden, categoría); la primera aparición gana los empates
+        self._keyword_rules = {}
+        order = 0
+        for categoria, keywords in self.patterns.items():
+            for keyword in keywords:
+                if keyword not in self._keyword_rules:
+                    confianza = min(0.95, 0.5 + (len(keyword) / 50))
+                    self._keyword_rules[keyword] = (confianza, -order, categoria)
+                    self.matcher.add(keyword)
+                order += 1
+        
+        # patrón en minúsculas -> {clave del mapeo: rango de inserción}
+        self._learned_ranks = {}
+        self._next_rank = 0
+        for pattern in self.learned_mappings:
+            self._index_learned(pattern)
+    
+    def _index_learned(self, pattern: str):
+        ranks = self._learned_ranks.setdefault(pattern.lower(), {})
+        if pattern not in ranks:
+            ranks[pattern] = self._next_rank
+            self._next_rank += 1
+        self.matcher.add(pattern.lower())
+    
+    def _unindex_learned(self, pattern: str):
+        pattern_lower = pattern.lower()
+        ranks = self._learned_ranks.get(pattern_lower, {})
+        ranks.pop(pattern, None)
+        if not ranks:
+            self._learned_ranks.pop(pattern_lower, None)
+            if pattern_lower not in self._transfer_keywords and pattern_lower not in self._keyword_rules:
+                self.matcher.remove(pattern_lower)
+    
     def _load_learned_mappings(self) -> Dict[str, Dict]:
-        """Carga mapeos aprendidos del JSON"""
+        """Carga mapeos aprendidos (SQLite o JSON)"""
+        if self.storage is not None:
+            return self.storage.load_learned_mappings()
+        
         if self.mappings_path.exists():
             try:
                 with open(self.mappings_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
-                print(f"⚠️  Error cargando mapeos: {e}")
+                logger.warning("⚠️  Error cargando mapeos: %s", e)
                 return {}
         return {}
     
     def _save_learned_mappings(self):
-        """Guarda mapeos aprendidos al JSON"""
+        """Guarda mapeos aprendidos al JSON (dentro de un lote, al terminarlo)"""
+        if self._batch_depth > 0:
+            return
         try:
             self.mappings_path.parent.mkdir(parents=True, exist_ok=True)
             with open(self.mappings_path, 'w', encoding='utf-8') as f:
                 json.dump(self.learned_mappings, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            print(f"❌ Error guardando mapeos: {e}")
+            logger.error("❌ Error guardando mapeos: %s", e)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa varios learn_mapping / unlearn_mapping en una sola escritura:
+        una transacción en SQLite o una sola reescritura del JSON.
+        En SQLite, si el lote falla se revierte la transacción y también los
+        mapeos en memoria (y el autómata) vuelven a como estaban al empezar.
+        """
+        if self.storage is not None:
+            outermost = self._batch_depth == 0
+            snapshot = {pattern: dict(mapping) for pattern, mapping in self.learned_mappings.items()} if outermost else None
+            self._batch_depth += 1
+            try:
+                with self.storage.transaction():
+                    yield self
+            except BaseException:
+                if outermost:
+                    self.learned_mappings = snapshot
+                    self._build_matcher()
+                raise
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._save_learned_mappings()
     
     def categorize(self, descripcion: str) -> Tuple[str, str]:
         """
@@ -96,55 +208,80 @@ class CategorizationService:
         3. Patrones predefinidos
         4. Sin Categoría
         """
+        categoria, subcategoria, _ = self.categorize_with_rule(descripcion)
+        return categoria, subcategoria
+    
+    def categorize_with_rule(self, descripcion: str) -> Tuple[str, str, str]:
+        """Como categorize, pero retorna además la regla que decidió: (categoria, subcategoria, regla)"""
+        regla, categoria, subcategoria = self._match(descripcion)
+        if regla == RULE_KEYWORD:
+            subcategoria = self._get_default_subcategory(categoria)
+        return categoria, subcategoria, regla
+    
+    def categorize_many(self, descripciones: Iterable[str]) -> List[Tuple[str, str, str]]:
+        """
+        Categoriza muchas descripciones de una vez
+        Cada descripción distinta se evalúa una sola vez (pd.factorize) y el
+        resultado se reparte a todas sus apariciones.
+        
+        Retorna: [(categoria, subcategoria, regla)] en el mismo orden
+        """
+        import pandas as pd
+
+        codes, uniques = pd.factorize(pd.Series(list(descripciones), dtype=object))
+        
+        default_subcategories = {}
+        unique_results = []
+        for descripcion in uniques:
+            regla, categoria, subcategoria = self._match(descripcion)
+            if regla == RULE_KEYWORD:
+                if categoria not in default_subcategories:
+                    default_subcategories[categoria] = self._get_default_subcategory(categoria)
+                subcategoria = default_subcategories[categoria]
+            unique_results.append((categoria, subcategoria, regla))
+        
+        # Descripciones nulas (código -1)
+        empty = self.categorize_with_rule('')
+        return [unique_results[code] if code >= 0 else empty for code in codes]
+    
+    def _match(self, descripcion: str) -> Tuple[str, str, Optional[str]]:
+        """
+        Aplica los niveles de prioridad
+        Retorna: (regla, categoria, subcategoria); con palabra clave la
+        subcategoría es None (se usa la primera de la categoría)
+        """
         if not descripcion:
-            return "Sin Categoría", "Sin Subcategoría"
+            return RULE_NONE, "Sin Categoría", "Sin Subcategoría"
         
         desc_lower = descripcion.lower()
         
-        # 1️⃣ TRANSFERENCIAS INTERNAS - Máxima prioridad
-        transfer_keywords = [
-            'pago tarjeta', 'pago tdc', 'pago cmr',
-            'transferencia a tarjeta', 'transferencia a t.',
-            'monto cancelado', 'pago de cuenta',
-            'abono tarjeta', 'nota de credito',
-            'transferencia a cuenta', 'pago cuenta'
-        ]
+        found = self.matcher.find_all(desc_lower)
         
-        if any(keyword in desc_lower for keyword in transfer_keywords):
-            return "Transferencia Interna", "Interna"
+        # 1️⃣ TRANSFERENCIAS INTERNAS - Máxima prioridad
+        if not found.isdisjoint(self._transfer_keywords):
+            return RULE_TRANSFER, "Transferencia Interna", "Interna"
         
         # 2️⃣ MAPEOS APRENDIDOS - Segunda prioridad (lo que el usuario aprendió)
-        for pattern, mapping in self.learned_mappings.items():
-            if pattern.lower() in desc_lower:
-                return mapping['categoria'], mapping['subcategoria']
-        
-        # 3️⃣ PATRONES PREDEFINIDOS - Tercera prioridad
-        best_match = None
-        best_confianza = 0.0
-        
-        for categoria, keywords in self.patterns.items():
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    confianza = min(0.95, 0.5 + (len(keyword) / 50))
-                    if confianza > best_confianza:
-                        best_confianza = confianza
-                        best_match = categoria
+        learned = [
+            (rank, pattern)
+            for pattern_lower in found if pattern_lower in self._learned_ranks
+            for pattern, rank in self._learned_ranks[pattern_lower].items()
+        ]
+        if learned:
+            mapping = self.learned_mappings[min(learned)[1]]
+            return RULE_LEARNED, mapping['categoria'], mapping['subcategoria']
         
-        if best_match:
-            subcat = self._get_default_subcategory(best_match)
-            return best_match, subcat
+        # 3️⃣ PATRONES PREDEFINIDOS - Tercera prioridad (mayor confianza, luego el primero)
+        rules = [self._keyword_rules[keyword] for keyword in found if keyword in self._keyword_rules]
+        if rules:
+            return RULE_KEYWORD, max(rules)[2], None
         
         # 4️⃣ SIN CATEGORÍA
-        return "Sin Categoría", "Sin Subcategoría"
+        return RULE_NONE, "Sin Categoría", "Sin Subcategoría"
     
     def _get_default_subcategory(self, categoria: str) -> str:
         """Retorna la primera subcategoría de una categoría"""
-        matching = self.categories_df[
-            self.categories_df['Categoría'] == categoria
-        ]
-        if len(matching) > 0:
-            return matching.iloc[0]['Subcategoría']
-        return "Sin Subcategoría"
+        return self.catalog.default_subcategory(categoria)
     
     def learn_mapping(self, pattern: str, categoria: str, subcategoria: str) -> Dict:
         """
@@ -159,15 +296,21 @@ class CategorizationService:
             Dict con el mapeo guardado
         """
         pattern_lower = pattern.lower()
-        
-        self.learned_mappings[pattern_lower] = {
+        mapping = {
             'categoria': categoria,
             'subcategoria': subcategoria,
             'veces_asignada': self.learned_mappings.get(pattern_lower, {}).get('veces_asignada', 0) + 1,
-            'fecha_ultima_actualizacion': pd.Timestamp.now().isoformat()
+            'fecha_ultima_actualizacion': datetime.now().isoformat()
         }
         
-        self._save_learned_mappings()
+        # En SQLite se escribe primero: si falla, la memoria no cambia
+        if self.storage is not None:
+            self.storage.upsert_learned_mapping(pattern_lower, mapping)
+        self._index_learned(pattern_lower)
+        self.learned_mappings[pattern_lower] = mapping
+        
+        if self.storage is None:
+            self._save_learned_mappings()
         
         return self.learned_mappings[pattern_lower]
     
@@ -175,21 +318,22 @@ class CategorizationService:
         """Elimina un mapeo aprendido"""
         pattern_lower = pattern.lower()
         if pattern_lower in self.learned_mappings:
+            if self.storage is not None:
+                self.storage.delete_learned_mapping(pattern_lower)
             del self.learned_mappings[pattern_lower]
-            self._save_learned_mappings()
+            self._unindex_learned(pattern_lower)
+            if self.storage is None:
+                self._save_learned_mappings()
             return True
         return False
     
     def get_all_categories(self) -> list:
         """Retorna lista de todas las categorías"""
-        return sorted(self.categories_df['Categoría'].unique().tolist())
+        return sorted(self.catalog.categories())
     
     def get_subcategories(self, categoria: str) -> list:
         """Retorna subcategorías de una categoría"""
-        matching = self.categories_df[
-            self.categories_df['Categoría'] == categoria
-        ]
-        return matching['Subcategoría'].tolist()
+        return self.catalog.subcategories(categoria)
     
     def get_learned_mappings(self) -> Dict:
         """Retorna todos los mapeos aprendidos"""
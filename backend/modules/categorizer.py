@@ -2,9 +2,12 @@
 Módulo para categorización automática de movimientos
 """
 
-import pandas as pd
 from typing import List, Dict, Any, Tuple
 
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
 class SimpleCategorizer:
     """Categoriza movimientos usando lookup table simple"""
     
@@ -29,12 +32,14 @@ class SimpleCategorizer:
         Returns:
             bool: True si se cargó exitosamente
         """
+        import pandas as pd
+
         try:
             self.categories_df = pd.read_csv(csv_path)
-            print(f"✅ Categorías cargadas desde: {csv_path}")
+            logger.info("✅ Categorías cargadas desde: %s", csv_path)
             return True
         except Exception as e:
-            print(f"⚠️  Error cargando categorías: {e}")
+            logger.warning("⚠️  Error cargando categorías: %s", e)
             self.categories_df = pd.DataFrame()
             return False
     
@@ -65,7 +70,7 @@ class SimpleCategorizer:
                             str(row.get('subcategoria', 'Sin Subcategoría'))
                         )
         except Exception as e:
-            print(f"⚠️  Error categorizando: {e}")
+            logger.warning("⚠️  Error categorizando: %s", e)
         
         return "Sin Categoría", "Sin Subcategoría"
     
@@ -88,7 +93,7 @@ class SimpleCategorizer:
                 movement['subcategoria'] = subcat
                 categorized.append(movement)
             except Exception as e:
-                print(f"⚠️  Error categorizando movimiento: {e}")
+                logger.warning("⚠️  Error categorizando movimiento: %s", e)
                 movement['categoria'] = "Sin Categoría"
                 movement['subcategoria'] = "Sin Subcategoría"
                 categorized.append(movement)
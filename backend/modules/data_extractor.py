@@ -5,6 +5,10 @@ Módulo para extracción y validación de datos
 from datetime import datetime
 from typing import List, Tuple, Dict, Any
 
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
 class DataExtractor:
     """Extrae y valida datos de movimientos"""
     
@@ -76,7 +80,7 @@ class DataExtractor:
                 continue
         
         # Si no se puede parsear, retorna tal cual
-        print(f"⚠️  Advertencia: No se pudo normalizar fecha: {date_str}")
+        logger.warning("⚠️  Advertencia: No se pudo normalizar fecha: %s", date_str)
         return date_str
     
     @staticmethod
@@ -114,7 +118,7 @@ class DataExtractor:
                 duplicates += 1
         
         if duplicates > 0:
-            print(f"ℹ️  Se eliminaron {duplicates} movimientos duplicados")
+            logger.info("ℹ️  Se eliminaron %s movimientos duplicados", duplicates)
         
         return unique
     
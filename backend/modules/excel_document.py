@@ -0,0 +1,75 @@
+"""
+Libro Excel compartido entre detección y parseo
+Lee las celdas de la hoja una sola vez y arma en memoria los DataFrames
+con encabezado en cualquier fila, en vez de volver a leer el archivo con
+skiprows para cada intento. pandas se importa al leer la primera hoja.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ExcelDocument:
+    """Hoja Excel leída una sola vez; los DataFrames se arman desde las celdas en memoria"""
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.path = Path(file_path)
+        self._cells = None
+        self._raw = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def cells(self) -> list:
+        """Valores de las celdas tal como los entrega el lector, sin inferir tipos ni nulos"""
+        if self._cells is None:
+            import pandas as pd
+            self._cells = pd.read_excel(self.path, header=None, dtype=object, na_filter=False).values.tolist()
+        return self._cells
+
+    @property
+    def raw(self) -> 'pd.DataFrame':
+        """Todas las filas de la primera hoja sin encabezado (equivale a read_excel(header=None))"""
+        if self._raw is None:
+            self._raw = self._parse(self.cells, header=None)
+        return self._raw
+
+    @property
+    def row_count(self) -> int:
+        return len(self.raw)
+
+    def head(self, nrows: int) -> 'pd.DataFrame':
+        """Primeras filas sin encabezado (equivale a read_excel(nrows=..., header=None))"""
+        return self._parse(self.cells[:nrows], header=None)
+
+    def frame_with_header(self, header_row: int = 0) -> 'pd.DataFrame':
+        """
+        DataFrame con la fila `header_row` como encabezado y las siguientes como datos.
+        Equivale a pd.read_excel(path, skiprows=header_row): las celdas pasan por el
+        mismo TextParser que usa read_excel, así que los tipos de cada columna se
+        infieren solo con las filas de datos (un "1.000" de texto queda como 1.0)
+        y se mantienen los nombres "Unnamed: i" y "monto.1".
+        """
+        return self._parse(self.cells[header_row:], header=0)
+
+    @staticmethod
+    def _parse(rows: list, header) -> 'pd.DataFrame':
+        import pandas as pd
+        from pandas.io.parsers import TextParser
+
+        if not rows:
+            return pd.DataFrame()
+        # Mismos argumentos que read_excel al convertir las celdas de la hoja
+        return TextParser(rows, header=header, skip_blank_lines=False).read()
+
+
+def as_excel_document(source: Union[str, Path, ExcelDocument]) -> ExcelDocument:
+    """Entrega el ExcelDocument recibido o uno nuevo para la ruta"""
+    if isinstance(source, ExcelDocument):
+        return source
+    return ExcelDocument(source)
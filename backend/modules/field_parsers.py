@@ -0,0 +1,119 @@
+"""
+Parseo de fechas y montos de las cartolas
+Las fechas en los formatos que emiten los bancos (DD/MM/YYYY, DD-MM-YYYY,
+DD.MM.YYYY, YYYY-MM-DD) se reconocen con una expresión regular y se
+convierten sin pasar por strptime ni excepciones; cualquier otro texto
+prueba los formatos de siempre. Fechas y montos se memoizan: en una
+cartola los mismos valores se repiten muchas veces.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+# Formatos probados en orden por el camino general
+DATE_FORMATS = [
+    '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d',
+    '%d %b %Y', '%d %B %Y', '%d %m %Y', '%Y/%m/%d'
+]
+
+CACHE_SIZE = 4096
+
+DAY_MONTH_YEAR_PATTERN = re.compile(r'([0-9]{1,2})([/.-])([0-9]{1,2})\2([0-9]{4})')
+ISO_DATE_PATTERN = re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})')
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _iso_date(year: int, month: int, day: int) -> Optional[str]:
+    """YYYY-MM-DD si la fecha existe (años de 4 dígitos), si no None"""
+    if not (1000 <= year <= 9999 and 1 <= month <= 12 and day >= 1):
+        return None
+    leap = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if day > _DAYS_IN_MONTH[month] + leap:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(date_str: str, date_format: str = None) -> Optional[str]:
+    """
+    Parsea una fecha a YYYY-MM-DD probando `date_format` y luego DATE_FORMATS
+
+    Returns:
+        str: Fecha YYYY-MM-DD, o None si ningún formato aplica
+    """
+    if not date_str or date_str.lower() == 'nan':
+        return None
+
+    date_str = str(date_str).strip()
+
+    # Camino rápido: sólo si el primer formato a probar es el habitual
+    if date_format is None or date_format == DATE_FORMATS[0]:
+        match = DAY_MONTH_YEAR_PATTERN.fullmatch(date_str)
+        if match:
+            day, _, month, year = match.groups()
+            parsed = _iso_date(int(year), int(month), int(day))
+            if parsed:
+                return parsed
+        else:
+            match = ISO_DATE_PATTERN.fullmatch(date_str)
+            if match:
+                year, month, day = match.groups()
+                parsed = _iso_date(int(year), int(month), int(day))
+                if parsed:
+                    return parsed
+
+    formats = DATE_FORMATS if date_format is None else [date_format] + DATE_FORMATS
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_amount(amount_str: str) -> Optional[float]:
+    """
+    Parsea un monto (miles con punto o coma, decimales con coma o punto)
+
+    Returns:
+        float: Monto con signo, o None si no es un número
+    """
+    if not amount_str or amount_str.lower() == 'nan':
+        return None
+
+    amount_str = str(amount_str).strip().replace(' ', '')
+
+    if not amount_str:
+        return None
+
+    is_negative = amount_str.startswith('-')
+    if is_negative:
+        amount_str = amount_str[1:]
+
+    # Manejo de miles con punto y decimales con coma (1.234,56)
+    if amount_str.count('.') >= 2:
+        amount_str = amount_str.replace('.', '').replace(',', '.')
+    elif ',' in amount_str and '.' in amount_str:
+        if amount_str.rfind(',') > amount_str.rfind('.'):
+            amount_str = amount_str.replace('.', '').replace(',', '.')
+        else:
+            amount_str = amount_str.replace(',', '')
+    elif '.' in amount_str:
+        parts = amount_str.split('.')
+        if len(parts[-1]) == 3:
+            amount_str = amount_str.replace('.', '')
+    elif ',' in amount_str:
+        amount_str = amount_str.replace(',', '.')
+
+    try:
+        result = float(amount_str)
+        if is_negative:
+            result = -result
+        return result
+    except ValueError:
+        return None
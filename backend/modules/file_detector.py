@@ -5,10 +5,14 @@ Módulo para detectar automáticamente:
 - Formato del archivo
 """
 
-import pandas as pd
 import re
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Union
 from pathlib import Path
+from .pdf_document import PdfDocument, as_pdf_document
+from .excel_document import ExcelDocument, as_excel_document
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 class FileDetector:
     """Detecta tipo de institución y producto financiero"""
@@ -45,12 +49,12 @@ class FileDetector:
             ]
         }
     
-    def detect_from_file(self, file_path: str) -> Dict[str, Any]:
+    def detect_from_file(self, file_path: Union[str, PdfDocument, ExcelDocument]) -> Dict[str, Any]:
         """
         Analiza un archivo y detecta institución y tipo de producto
         
         Args:
-            file_path: Ruta del archivo
+            file_path: Ruta del archivo, PdfDocument ya abierto o ExcelDocument ya leído
             
         Returns:
             dict: {
@@ -60,6 +64,11 @@ class FileDetector:
                 'details': {...}
             }
         """
+        if isinstance(file_path, PdfDocument):
+            return self._detect_from_pdf(file_path)
+        if isinstance(file_path, ExcelDocument):
+            return self._detect_from_excel(file_path)
+        
         file_ext = Path(file_path).suffix.lower()
         
         if file_ext == '.pdf':
@@ -74,17 +83,19 @@ class FileDetector:
                 'details': {}
             }
     
-    def _detect_from_excel(self, file_path: str) -> Dict[str, Any]:
-        """Detecta desde archivo Excel"""
+    def _detect_from_excel(self, source: Union[str, ExcelDocument]) -> Dict[str, Any]:
+        """Detecta desde archivo Excel (ruta o documento ya leído)"""
         try:
-            # Leer primeras filas del Excel
-            df = pd.read_excel(file_path, nrows=50, header=None)
+            workbook = as_excel_document(source)
+            
+            # Primeras filas del Excel
+            df = workbook.head(50)
             text_content = ' '.join(df.astype(str).values.flatten()).lower()
             
-            return self._analyze_text(text_content, file_path)
+            return self._analyze_text(text_content, str(workbook.path))
             
         except Exception as e:
-            print(f"Error detectando desde Excel: {e}")
+            logger.error("Error detectando desde Excel: %s", e)
             return {
                 'institution': 'unknown',
                 'product_type': 'unknown',
@@ -92,23 +103,17 @@ class FileDetector:
                 'details': {'error': str(e)}
             }
     
-    def _detect_from_pdf(self, file_path: str) -> Dict[str, Any]:
-        """Detecta desde archivo PDF"""
+    def _detect_from_pdf(self, source: Union[str, PdfDocument]) -> Dict[str, Any]:
+        """Detecta desde archivo PDF (ruta o documento ya abierto)"""
         try:
-            import pdfplumber
-            
-            text_content = ""
-            with pdfplumber.open(file_path) as pdf:
+            with as_pdf_document(source) as pdf:
                 # Leer primeras 3 páginas
-                for page in pdf.pages[:3]:
-                    text = page.extract_text()
-                    if text:
-                        text_content += text.lower() + " "
+                text_content = pdf.text(max_pages=3, separator=" ").lower()
             
-            return self._analyze_text(text_content, file_path)
+            return self._analyze_text(text_content, str(pdf.path))
             
         except ImportError:
-            print("pdfplumber no instalado")
+            logger.warning("pdfplumber no instalado")
             return {
                 'institution': 'unknown',
                 'product_type': 'unknown',
@@ -116,7 +121,7 @@ class FileDetector:
                 'details': {'error': 'pdfplumber not installed'}
             }
         except Exception as e:
-            print(f"Error detectando desde PDF: {e}")
+            logger.error("Error detectando desde PDF: %s", e)
             return {
                 'institution': 'unknown',
                 'product_type': 'unknown',
@@ -198,7 +203,7 @@ class FileDetector:
             pantoja_count = text.count('pantoja')
             cc_count = text.count('cuenta corriente')
             matches['santander'] = pantoja_count + cc_count
-            print(f"      DEBUG: Santander detectado por pantoja + cuenta corriente")
+            logger.debug("Santander detectado por pantoja + cuenta corriente")
             return {
                 'name': 'santander',
                 'code': 'SANTANDER',
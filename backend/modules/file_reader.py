@@ -4,13 +4,43 @@ Detecta automáticamente: Banco, Tipo de Producto
 Soporta: BICE CC, CMR TC, Santander CC, Santander TC
 """
 
-import pandas as pd
-import pdfplumber
-import camelot
+import logging
+import os
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import re
-from datetime import datetime
+from .pdf_document import PdfDocument, as_pdf_document
+from .excel_document import ExcelDocument, as_excel_document
+from .field_parsers import parse_amount, parse_date
+from .word_table import find_header, group_rows, row_text
+from .parser_patterns import (
+    MONTH_NAMES, MONTH_NUMBERS, BICE_MONTHS, BICE_CHECKING_TABLE_MONTHS, BICE_TEXT_MONTHS,
+    BICE_ACCOUNT_PATTERN, CMR_CARD_PATTERN, WHITESPACE_PATTERN, DATE_DMY_PATTERN,
+    DATE_DD_MM_YYYY_PATTERN, TRAILING_TYPE_CODE_PATTERN, TRAILING_AMOUNTS_PATTERN,
+    INSTALLMENT_DATE_PATTERN, RUT_SUFFIX_PATTERN, LONG_NUMBER_PATTERN,
+    TRAILING_DAY_MONTH_SLASH_PATTERN, TRAILING_DAY_MONTH_PATTERN,
+    SANTANDER_TDC_STATEMENT_DATE_PATTERN, SANTANDER_TDC_DATE_PATTERN, SANTANDER_TDC_AMOUNT_PATTERN,
+    SANTANDER_TDC_PAT_PATTERN, SANTANDER_TDC_SECTION_END, SANTANDER_TDC_EXCLUDE,
+    CMR_PAYMENT_AMOUNT_PATTERN, CMR_AMOUNT_PATTERN, CMR_EXCLUDE, SANTANDER_CC_DATE_PATTERN, SANTANDER_CC_COLUMN_TITLES,
+    BICE_DATE_PATTERN, BICE_LINE_DATE_PATTERN, BICE_LINE_START_PATTERN,
+    BICE_LOWER_LINE_START_PATTERN, BICE_AMOUNT_PATTERN, BICE_TRAILING_AMOUNT_PATTERN,
+    BICE_OPERATION_NUMBER_PATTERN, BICE_INCOME_WORDS, BICE_CHECKING_INCOME_WORDS,
+    BICE_TABLE_HEADER_WORDS, BICE_BALANCE_WORDS, BICE_TEXT_EXCLUDE, BICE_TEXT_V6_EXCLUDE,
+    BICE_TRANSFER_TO_PATTERN, BICE_TRANSFER_NAME_PATTERN, BICE_INCOMING_TRANSFER_PATTERN,
+    BICE_OUTGOING_TRANSFER_PATTERN, BICE_RECIPIENT_SUFFIX_PATTERN, BICE_RUT_RUN_SUFFIX_PATTERN,
+    BICE_ORIGIN_SUFFIX_PATTERN, BICE_ACCOUNT_SUFFIX_PATTERN, ATTACHED_RUT_PATTERN, EMAIL_PATTERN,
+    WEB_ADDRESS_PATTERN, SPECIAL_SYMBOLS_PATTERN, PAGE_NUMBER_PATTERN, GENERIC_AMOUNT_PATTERN
+)
+from .logger import get_logger
+from models.movement import Movement
+
+logger = get_logger(__name__)
+
+
+def camelot_fallback_enabled() -> bool:
+    """Si FSB_CAMELOT habilita Camelot cuando la tabla Santander no se reconoce"""
+    return os.environ.get('FSB_CAMELOT', '').lower() in ('1', 'true', 'yes', 'si')
+
 
 class FileReader:
     """Lee archivos XLSX y PDF detectando automáticamente banco y tipo de producto"""
@@ -34,94 +64,91 @@ class FileReader:
             m['banco'] = banco
             m['tipo_cuenta'] = tipo_cuenta
 
-    def read_xlsx(self, file_path):
-        """Lee un archivo Excel"""
+    def read_xlsx(self, file_path: Union[str, ExcelDocument]):
+        """Lee un archivo Excel (ruta o ExcelDocument ya leído)"""
         try:
-            filename = Path(file_path).name.lower()
-            print(f"\n📄 Procesando XLSX: {filename}")
+            workbook = as_excel_document(file_path)
+            filename = workbook.name.lower()
+            logger.info("📄 Procesando XLSX: %s", filename)
 
-            df = pd.read_excel(file_path)
+            df = workbook.frame_with_header(0)
             
             # Detectar banco y tipo desde contenido
             detection = self._detect_from_dataframe(df)
-            print(f"   Banco: {detection['bank']} | Tipo: {detection['product_type']}")
+            logger.info("   Banco: %s | Tipo: %s", detection['bank'], detection['product_type'])
 
-            movements = self._extract_from_dataframe(df, file_path, detection)
+            movements = self._extract_from_dataframe(df, str(workbook.path), detection)
             
             if not movements:
-                print(f"   Intentando saltar filas...")
-                for skip_rows in range(1, 15):
+                logger.debug("   Intentando saltar filas...")
+                # El encabezado se busca sobre la hoja ya leída, sin releer el archivo
+                for skip_rows in range(1, min(15, workbook.row_count)):
                     try:
-                        df = pd.read_excel(file_path, skiprows=skip_rows)
-                        movements = self._extract_from_dataframe(df, file_path, detection)
+                        df = workbook.frame_with_header(skip_rows)
+                        movements = self._extract_from_dataframe(df, str(workbook.path), detection)
                         if movements:
-                            print(f"   Datos encontrados saltando {skip_rows} fila(s)")
+                            logger.debug("   Datos encontrados saltando %d fila(s)", skip_rows)
                             break
                     except:
                         continue
 
             self._add_bank_info(movements, detection)
 
-            print(f"   Total movimientos: {len(movements)}")
+            logger.info("   Total movimientos: %d", len(movements))
             return movements
 
         except Exception as e:
-            print(f"Error leyendo XLSX: {e}")
+            logger.error("Error leyendo XLSX: %s", e)
             return []
 
-    def read_pdf(self, file_path: str) -> List[Dict]:
-        """Lee un archivo PDF detectando automáticamente el contenido"""
+    def read_pdf(self, file_path: Union[str, PdfDocument]) -> List[Dict]:
+        """Lee un archivo PDF (ruta o documento ya abierto) detectando automáticamente el contenido"""
         try:
-            filename = Path(file_path).name.lower()
-            print(f"\n📄 Procesando PDF: {filename}")
-
-            with pdfplumber.open(file_path) as pdf:
-                print(f"   Total de páginas: {len(pdf.pages)}")
+            with as_pdf_document(file_path) as pdf:
+                file_path = str(pdf.path)
+                filename = pdf.name.lower()
+                logger.info("📄 Procesando PDF: %s (%d páginas)", filename, pdf.page_count)
 
                  # Detectar banco y tipo desde primeras páginas
                 detection = self._detect_from_pdf(pdf)
-                print(f"   Banco: {detection['bank']} | Tipo: {detection['product_type']}")
+                logger.info("   Banco: %s | Tipo: %s", detection['bank'], detection['product_type'])
 
                 # ✅ ESPECIAL PARA BICE: Usar tabla directamente
                 if detection['bank'] == 'BICE' and detection['product_type'] == 'CUENTA_CORRIENTE':
-                    print(f"   Procesando página 1...")
-                    movements = self._parse_bice_checking_from_pdf(file_path)
+                    logger.debug("   Procesando página 1...")
+                    movements = self._parse_bice_checking_from_pdf(pdf)
                     self._add_bank_info(movements, detection)
-                    print(f"   Total movimientos extraídos: {len(movements)}")
+                    logger.info("   Total movimientos extraídos: %d", len(movements))
                     return movements
                 
-                # ✅ SANTANDER CUENTA CORRIENTE: Usar Camelot
+                # ✅ SANTANDER CUENTA CORRIENTE: tabla por coordenadas de palabras
                 if detection['bank'] == 'SANTANDER' and detection['product_type'] == 'CUENTA_CORRIENTE':
-                    print(f"   Procesando página 1...")
-                    movements = self._parse_santander_with_camelot(file_path)
+                    logger.debug("   Procesando TODAS las páginas...")
+                    movements = self._parse_santander_checking(pdf)
                     self._add_bank_info(movements, detection)
-                    print(f"   Total movimientos extraídos: {len(movements)}")
+                    logger.info("   Total movimientos extraídos: %d", len(movements))
                     return movements
                 
                 # ✅ SANTANDER TARJETA DE CRÉDITO
                 if detection['bank'] == 'SANTANDER' and detection['product_type'] == 'TARJETA_CREDITO':
-                    print(f"   Procesando TODAS las páginas...")
+                    logger.debug("   Procesando TODAS las páginas...")
                     # Extraer texto de TODAS las páginas
-                    text_all_pages = ""
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_all_pages += page_text + "\n"
+                    text_all_pages = pdf.text()
                     
                     movements = self._parse_santander_tarjeta_credito(text_all_pages, file_path)
                     self._add_bank_info(movements, detection)
-                    print(f"   Total movimientos extraídos: {len(movements)}")
+                    logger.info("   Total movimientos extraídos: %d", len(movements))
                     return movements
                 
                 # Para otros bancos: procesamiento tradicional
                 movements = []
-                for page_num, page in enumerate(pdf.pages, 1):
-                    print(f"   Procesando página {page_num}...")
+                for page_index in range(pdf.page_count):
+                    logger.debug("   Procesando página %d...", page_index + 1)
                     
                     page_movements = []
                     
                     # OTROS BANCOS: Usar texto
-                    text = page.extract_text()
+                    text = pdf.page_text(page_index)
                     if not text:
                         continue
                     page_movements = self._extract_movements_from_text(
@@ -129,39 +156,33 @@ class FileReader:
                         file_path, 
                         detection['bank'],
                         detection['product_type'],
-                        page
+                        pdf.page(page_index)
                     )
                     
                     if page_movements:
                         movements.extend(page_movements)
-                        print(f"      → {len(page_movements)} movimientos")
+                        logger.debug("      → %d movimientos", len(page_movements))
 
                 self._add_bank_info(movements, detection)
 
-                print(f"   Total movimientos extraídos: {len(movements)}")
+                logger.info("   Total movimientos extraídos: %d", len(movements))
                 return movements
             
         except ImportError:
-            print(f"Error: pdfplumber no instalado")
+            logger.error("Error: pdfplumber no instalado")
             return []
         except Exception as e:
-            print(f"Error leyendo PDF: {e}")
+            logger.error("Error leyendo PDF: %s", e)
             return []
 
-    def _detect_from_pdf(self, pdf) -> Dict[str, str]:
+    def _detect_from_pdf(self, pdf: PdfDocument) -> Dict[str, str]:
         """Detecta banco y tipo de producto desde el PDF"""
-        full_text = ""
-        
         # Leer primeras 5 páginas
-        for page in pdf.pages[:5]:
-            text = page.extract_text()
-            if text:
-                full_text += text.lower() + " "
+        full_text = pdf.text(max_pages=5, separator=" ").lower()
         
-        print("DEBUG: Antes de _detect_bank():")
-        print(f"  - 'pantoja' en texto: {'pantoja' in full_text}")
-        print(f"  - 'cuenta corriente' en texto: {'cuenta corriente' in full_text}")
-        print(f"  - 'cmr' en texto: {'cmr' in full_text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Antes de _detect_bank(): pantoja=%s, cuenta corriente=%s, cmr=%s",
+                         'pantoja' in full_text, 'cuenta corriente' in full_text, 'cmr' in full_text)
         
         return self._analyze_content(full_text)
 
@@ -193,35 +214,35 @@ class FileReader:
         
         # ✅ PASO 1: BUSCAR "BANCO BICE" PRIMERO (MÁS ESPECÍFICO)
         if 'banco bice' in text_lower or 'banco = bice' in text_lower:
-            print(f"🏦 Institución detectada: bice (confianza: 1.0) [por 'BANCO BICE']")
+            logger.debug("🏦 Institución detectada: bice (confianza: 1.0) [por 'BANCO BICE']")
             return "BICE"
         
         # ✅ PASO 1b: Buscar número de cuenta BICE (21-XXXXX-X)
-        if re.search(r'\b21-\d{5}-\d\b', text_lower):
-            print(f"🏦 Institución detectada: bice (confianza: 1.0) [por número de cuenta]")
+        if BICE_ACCOUNT_PATTERN.search(text_lower):
+            logger.debug("🏦 Institución detectada: bice (confianza: 1.0) [por número de cuenta]")
             return "BICE"
         
         # ✅ PASO 1c: Buscar "Cuenta en pesos" (BICE específico)
         if 'cuenta en pesos n°' in text_lower or 'cuenta en pesos' in text_lower:
-            print(f"🏦 Institución detectada: bice (confianza: 1.0) [por 'Cuenta en pesos']")
+            logger.debug("🏦 Institución detectada: bice (confianza: 1.0) [por 'Cuenta en pesos']")
             return "BICE"
         
         # ✅ PASO 2: CMR (número de tarjeta específico)
-        if re.search(r'\b4517\s*9123\s*\d{4}\s*\d{4}\b', text_lower):
-            print(f"🏦 Institución detectada: cmr (confianza: 1.0) [por número de tarjeta]")
+        if CMR_CARD_PATTERN.search(text_lower):
+            logger.debug("🏦 Institución detectada: cmr (confianza: 1.0) [por número de tarjeta]")
             return "CMR"
         
         # ✅ PASO 3: SANTANDER (después de descartar BICE)
         # Si tiene "pantoja" + "cuenta corriente" + NO es BICE = SANTANDER
         if ('pantoja' in text_lower) and ('cuenta corriente' in text_lower):
             score = text_lower.count('pantoja') + text_lower.count('cuenta corriente')
-            print(f"🏦 Institución detectada: santander (confianza: {min(score, 10)}/10) [por pantoja + cuenta corriente]")
+            logger.debug("🏦 Institución detectada: santander (confianza: %d/10) [por pantoja + cuenta corriente]", min(score, 10))
             return "SANTANDER"
         
         # Si tiene "banco santander" o "santander chile"
         if 'banco santander' in text_lower or 'santander chile' in text_lower:
             score = text_lower.count('banco santander') + text_lower.count('santander chile')
-            print(f"🏦 Institución detectada: santander (confianza: {min(score, 10)}/10)")
+            logger.debug("🏦 Institución detectada: santander (confianza: %d/10)", min(score, 10))
             return "SANTANDER"
         
         # ✅ PASO 4: Otros bancos
@@ -242,7 +263,7 @@ class FileReader:
         best_bank = max(bank_scores, key=bank_scores.get)
         
         if bank_scores[best_bank] > 0:
-            print(f"🏦 Institución detectada: {best_bank.lower()} (confianza: {bank_scores[best_bank]}/10)")
+            logger.debug("🏦 Institución detectada: %s (confianza: %d/10)", best_bank.lower(), bank_scores[best_bank])
             return best_bank.upper()
         
         return "DESCONOCIDO"
@@ -256,7 +277,7 @@ class FileReader:
 
         # ✅ PASO 0: BUSCAR ENCABEZADO ESPECÍFICO DE TDC SANTANDER
         if 'estado de cuenta en moneda nacional de tarjeta de credito' in text.lower():
-            print(f"      ✅ Detectado: TARJETA_CREDITO (por encabezado específico)")
+            logger.debug("      ✅ Detectado: TARJETA_CREDITO (por encabezado específico)")
             return 'TARJETA_CREDITO'
 
         # Palabras clave para tarjeta de crédito
@@ -281,23 +302,23 @@ class FileReader:
 
         # ✅ PRIMERO: Buscar palabras muy específicas de cuenta corriente
         if 'cuenta corriente ml' in text.lower():
-            print(f"      ✅ Detectado: CUENTA_CORRIENTE (por 'cuenta corriente ml')")
+            logger.debug("      ✅ Detectado: CUENTA_CORRIENTE (por 'cuenta corriente ml')")
             return 'CUENTA_CORRIENTE'
         
         if 'detalle de movimientos' in text.lower():
-            print(f"      ✅ Detectado: CUENTA_CORRIENTE (por 'detalle de movimientos')")
+            logger.debug("      ✅ Detectado: CUENTA_CORRIENTE (por 'detalle de movimientos')")
             return 'CUENTA_CORRIENTE'
 
         cc_count = sum(text.count(keyword) for keyword in credit_card_keywords)
         checking_count = sum(text.count(keyword) for keyword in checking_keywords)
 
-        print(f"      DEBUG: CC count={cc_count}, Checking count={checking_count}")
+        logger.debug("      CC count=%d, Checking count=%d", cc_count, checking_count)
 
         if cc_count > checking_count:
-            print(f"      ✅ Detectado: TARJETA_CREDITO")
+            logger.debug("      ✅ Detectado: TARJETA_CREDITO")
             return 'TARJETA_CREDITO'
         else:
-            print(f"      ✅ Detectado: CUENTA_CORRIENTE")
+            logger.debug("      ✅ Detectado: CUENTA_CORRIENTE")
             return 'CUENTA_CORRIENTE'
         
     def _extract_movements_from_text(self, text: str, file_path: str, bank: str, product_type: str, page) -> List[Dict]:
@@ -323,52 +344,38 @@ class FileReader:
                 return movements
                 
             except Exception as e:
-                print(f"      ❌ Error extrayendo movimientos: {e}")
+                logger.error("      ❌ Error extrayendo movimientos: %s", e)
                 return []
             
     def _parse_santander_tarjeta_credito(self, text: str, file_path: str) -> List[Dict]:
         """Parser para Santander Tarjeta de Crédito - Procesa TODAS las páginas"""
+        debug = logger.isEnabledFor(logging.DEBUG)
         movements = []
+        vistos = set()  # Claves de duplicado ya vistas
         
         # Extraer fecha de estado de cuenta
-        fecha_estado_pattern = r'FECHA ESTADO DE CUENTA\s+(\d{2})/(\d{2})/(\d{4})'
-        fecha_estado_match = re.search(fecha_estado_pattern, text)
+        fecha_estado_match = SANTANDER_TDC_STATEMENT_DATE_PATTERN.search(text)
         
         if fecha_estado_match:
             estado_day, estado_month_str, estado_year_str = fecha_estado_match.groups()
             estado_month = int(estado_month_str)
             estado_year = int(estado_year_str)
             month_name = self._get_month_name(estado_month)
-            print(f"   📅 Fecha de estado: {month_name} {estado_year}")
+            logger.info("   📅 Fecha de estado: %s %s", month_name, estado_year)
         else:
             from datetime import datetime
             now = datetime.now()
             estado_year = now.year
             estado_month = now.month
             month_name = self._get_month_name(estado_month)
-            print(f"   ⚠️ No se encontró fecha de estado, usando: {month_name} {estado_year}")
+            logger.warning("   ⚠️ No se encontró fecha de estado, usando: %s %s", month_name, estado_year)
         
         # Dividir por secciones de "PERÍODO ACTUAL" (puede haber múltiples)
         # Las páginas 2+ también tienen "2.PERÍODO ACTUAL"
         
         lines = text.split('\n')
         
-        # Patrón para detectar líneas de movimiento
-        fecha_pattern = r'(\d{2})/(\d{2})/(\d{2})'  # DD/MM/YY
-        
-        exclude_keywords = [
-            'total operaciones', 'movimientos tarjeta', 'productos o servicios',
-            'cargos, comisiones', 'período anterior', 'período actual',
-            'lugar de operación', 'fecha de operación', 'descripción operación',
-            'nºcuota', 'valor cuota', 'monto origen', 'monto total',
-            'operación pagar', 'cargo del mes', 'mensual', 'o cobro',
-            'información general', 'detalle', 'pagar hasta', 'monto mínimo',
-            'comprobante de pago', 'emisor', 'cliente', 'cheque', 'efectivo',
-            'nombre', 'número de tarjeta', 'timbre', 'banco',
-            'información compras en cuotas', 'de 3'
-        ]
-        
-        print(f"   🔍 Buscando movimientos en {len(lines)} líneas...")
+        logger.debug("   🔍 Buscando movimientos en %d líneas...", len(lines))
         
         i = 0
         in_movimientos_section = False
@@ -379,7 +386,7 @@ class FileReader:
             # Detectar inicio de sección de movimientos
             if 'PERÍODO ACTUAL' in line.upper() or 'TOTAL OPERACIONES' in line:
                 in_movimientos_section = True
-                print(f"   ➜ Sección de movimientos en línea {i}")
+                logger.debug("   ➜ Sección de movimientos en línea %d", i)
                 i += 1
                 continue
             
@@ -389,9 +396,10 @@ class FileReader:
                 continue
             
             # Detectar fin de sección (cuando encontramos otra sección o fin de documento)
-            if in_movimientos_section and any(keyword in line.lower() for keyword in ['emisor', 'comprobante de pago', 'cheque', 'efectivo', 'nombre', 'número de tarjeta', 'información compras']):
+            line_lower = line.lower()
+            if in_movimientos_section and SANTANDER_TDC_SECTION_END.search(line_lower):
                 if 'INFORMACIÓN COMPRAS' not in line.upper():  # No contar este
-                    print(f"   ⏹️  Fin de sección en línea {i}")
+                    logger.debug("   ⏹️  Fin de sección en línea %d", i)
                     in_movimientos_section = False
                 i += 1
                 continue
@@ -402,12 +410,12 @@ class FileReader:
                 continue
             
             # Saltar líneas con palabras clave de exclusión
-            if any(keyword in line.lower() for keyword in exclude_keywords):
+            if SANTANDER_TDC_EXCLUDE.search(line_lower):
                 i += 1
                 continue
             
             # Buscar fecha en formato DD/MM/YY
-            fecha_match = re.search(fecha_pattern, line)
+            fecha_match = SANTANDER_TDC_DATE_PATTERN.search(line)
             if not fecha_match:
                 i += 1
                 continue
@@ -443,8 +451,7 @@ class FileReader:
                     continue
                 
                 # Buscar monto (formato: $118.931 o $ -5.602 o $-3.000.000 o $29,745)
-                monto_pattern = r'\$\s*(-?\d+(?:\.\d{3})*(?:,\d{2})?)\s*$'
-                monto_match = re.search(monto_pattern, resto)
+                monto_match = SANTANDER_TDC_AMOUNT_PATTERN.search(resto)
                 
                 if not monto_match:
                     i += 1
@@ -483,49 +490,46 @@ class FileReader:
                     monto_abs = monto
                 
                 # Evitar duplicados
-                existe = any(
-                    m['fecha'] == fecha and 
-                    m['monto'] == monto_abs and 
-                    m['descripcion'].lower() == descripcion.lower()
-                    for m in movements
-                )
-                if existe:
-                    print(f"   ⏭️  DUPLICADO: {fecha} | {descripcion[:40]}")
+                clave = (fecha, monto_abs, descripcion.lower())
+                if clave in vistos:
+                    logger.debug("   ⏭️  DUPLICADO: %s | %.40s", fecha, descripcion)
                     i += 1
                     continue
-                
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": monto_abs,
-                    "tipo": tipo,
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria"
-                }
+                vistos.add(clave)
+                
+                movement = Movement(
+                    id=len(movements),
+                    fecha=fecha,
+                    descripcion=descripcion,
+                    monto=monto_abs,
+                    tipo=tipo,
+                    archivo_referencia=Path(file_path).name,
+                    categoria="Sin Categoria",
+                    subcategoria="Sin Subcategoria"
+                )
                 movements.append(movement)
-                print(f"   ✅ [{len(movements):2d}] {fecha} | {tipo:7} | {descripcion[:50]:50} | ${monto_abs:>12,.0f}")
+                if debug:
+                    logger.debug(f"   ✅ [{len(movements):2d}] {fecha} | {tipo:7} | {descripcion[:50]:50} | ${monto_abs:>12,.0f}")
             
             except Exception as e:
-                print(f"   ⚠️  Error línea {i}: {str(e)[:60]}")
+                logger.debug("   ⚠️  Error línea %d: %.60s", i, e)
             
             i += 1
         
-        print(f"   Total movimientos extraídos: {len(movements)}")
+        logger.info("   Total movimientos extraídos: %d", len(movements))
         return movements
     
     def _clean_santander_tdc_description(self, desc: str) -> str:
         """Limpia descripción de Santander TDC"""
         
         # Remover "COMPRAS P.A.T." al final
-        desc = re.sub(r'\s+COMPRAS\s+P\.A\.T\.\s*$', '', desc, flags=re.IGNORECASE)
+        desc = SANTANDER_TDC_PAT_PATTERN.sub('', desc)
         
         # Remover códigos al final (como "T", "A", "I")
-        desc = re.sub(r'\s+[TAI]\s*$', '', desc)
+        desc = TRAILING_TYPE_CODE_PATTERN.sub('', desc)
         
         # Normalizar espacios
-        desc = re.sub(r'\s+', ' ', desc).strip()
+        desc = WHITESPACE_PATTERN.sub(' ', desc).strip()
         
         return desc
                 
@@ -534,36 +538,21 @@ class FileReader:
         movements = []
         lines = text.split('\n')
 
-        fecha_pattern = r'(\d{1,2}/\d{1,2}/\d{4})'
-        
-        exclude_keywords = [
-            'compras nacionales', 'sin movimientos', 'cupo total', 'cupo compra',
-            'cupo avance', 'tasa interes', 'periodo anterior', 'periodo actual',
-            'saldo adeudado', 'informacion general', 'detalle',
-            'encabezado', 'titulo', 'estado de cuenta', 'cliente elite',
-            'resumen de pago', 'monto total', 'total pesos', 'total dolares',
-            'fecha pactada', 'encabezado', 'paga hasta', 'cupon de pago',
-            'iii detalle', 'ii informacion', 'i resumén', 'tasas', 'conceptos',
-            'pago minimo', 'credito disponible', 'limite', 'financiamiento',
-            'iv. costo', 'información de pago', 'vencimiento próximos',
-            'monto interés', 'gasto de cobranza'
-        ]
-
         for line in lines:
             line = line.strip()
             
             if not line or len(line) < 15:
                 continue
             
-            if any(keyword in line.lower() for keyword in exclude_keywords):
+            if CMR_EXCLUDE.search(line.lower()):
                 continue
             
             # Filtro: Si la línea tiene MUCHAS fechas (>2), es basura
-            fecha_count = len(re.findall(fecha_pattern, line))
+            fecha_count = len(DATE_DMY_PATTERN.findall(line))
             if fecha_count > 2:
                 continue
             
-            fecha_match = re.search(fecha_pattern, line)
+            fecha_match = DATE_DMY_PATTERN.search(line)
             if not fecha_match:
                 continue
 
@@ -581,8 +570,7 @@ class FileReader:
 
                 # NUEVO: Detección especial para "Pago tarjeta cmr T"
                 if 'pago tarjeta' in resto.lower():
-                    pago_pattern = r'-\s*(\d+(?:\.\d{3})*(?:,\d{2})?)'
-                    pago_match = re.search(pago_pattern, resto)
+                    pago_match = CMR_PAYMENT_AMOUNT_PATTERN.search(resto)
                     
                     if pago_match:
                         monto_str = pago_match.group(1)
@@ -594,8 +582,7 @@ class FileReader:
                         continue
                 else:
                     # PARSER GENERAL para otros movimientos
-                    monto_pattern = r'-?\s*\$?\s*(\d+(?:\.\d{3})*(?:,\d{2})?)'
-                    montos_matches = list(re.finditer(monto_pattern, resto))
+                    montos_matches = list(CMR_AMOUNT_PATTERN.finditer(resto))
                     
                     if not montos_matches:
                         continue
@@ -654,16 +641,16 @@ class FileReader:
                 else:
                     tipo = "gasto"
 
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": abs(monto),
-                    "tipo": tipo,
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria"
-                }
+                movement = Movement(
+                    id=len(movements),
+                    fecha=fecha,
+                    descripcion=descripcion,
+                    monto=abs(monto),
+                    tipo=tipo,
+                    archivo_referencia=Path(file_path).name,
+                    categoria="Sin Categoria",
+                    subcategoria="Sin Subcategoria"
+                )
                 movements.append(movement)
 
             except Exception as e:
@@ -685,27 +672,166 @@ class FileReader:
         desc = re.sub(rf'\s+{re.escape(monto_str)}\s*$', '', desc)
         
         # ✅ LIMPIAR ESPACIOS FINALES
-        desc = re.sub(r'\s+', ' ', desc).strip()
+        desc = WHITESPACE_PATTERN.sub(' ', desc).strip()
         
         return desc
         
-    def _parse_santander_with_camelot(self, file_path: str) -> List[Dict]:
-        """Extrae tabla Santander con Camelot"""
-        import camelot
+    def _parse_santander_checking(self, pdf: Union[str, PdfDocument]) -> List[Dict]:
+        """Extrae la tabla Santander cuenta corriente (coordenadas; Camelot sólo si se habilita)"""
+        movements = self._parse_santander_from_words(pdf)
+        if movements is None:
+            if camelot_fallback_enabled():
+                logger.info("   Encabezado no reconocido, usando Camelot")
+                return self._parse_santander_with_camelot(pdf)
+            logger.warning("   ⚠️  Encabezado de movimientos Santander no encontrado")
+            return []
+        return movements
 
+    def _parse_santander_from_words(self, pdf: Union[str, PdfDocument]) -> Optional[List[Dict]]:
+        """
+        Extrae la tabla Santander por franjas de columnas, en todas las páginas
+
+        Las franjas salen del encabezado (DESCRIPCION, Nº DCTO, CARGOS, ABONOS,
+        SALDO) de cada página; una página sin encabezado usa las de la anterior.
+
+        Returns:
+            list: Movimientos, o None si ninguna página tiene el encabezado
+        """
         movements = []
 
         try:
-            tables = camelot.read_pdf(file_path, pages='1', flavor='stream')
+            with as_pdf_document(pdf) as pdf:
+                file_path = str(pdf.path)
+                year_hasta, month_name = self._extract_year_from_santander_pdf(pdf)
+                logger.info("   📅 Período de corte: %s %s", month_name, year_hasta)
+                month_hasta_int = int(self._get_month_number(month_name))
+
+                bands = None
+                for page_index in range(pdf.page_count):
+                    rows = group_rows(pdf.page_words(page_index, keep_blank_chars=True))
+                    header = find_header(rows, SANTANDER_CC_COLUMN_TITLES)
+                    if header:
+                        header_row, bands = header
+                        rows = rows[header_row + 1:]
+                    elif bands is None:
+                        continue
 
-            if not tables:
-                return []
+                    for row in rows:
+                        # Detener al llegar a "Resumen de Comisiones"
+                        text = row_text(row).lower()
+                        if 'resumen' in text and 'comisiones' in text:
+                            logger.debug("   Fin de movimientos en página %d", page_index + 1)
+                            return movements
+
+                        # La primera palabra trae fecha y sucursal ("05/11Agustinas")
+                        fecha_match = SANTANDER_CC_DATE_PATTERN.match(row[0]['text'])
+                        if not fecha_match:
+                            continue
+
+                        cells = bands.split(row[1:])
+                        movement = self._santander_checking_movement(
+                            fecha_match, cells['descripcion'], cells['cargo'], cells['abono'],
+                            year_hasta, month_hasta_int, file_path, len(movements)
+                        )
+                        if movement:
+                            movements.append(movement)
 
-            df = tables[0].df
+            if bands is None:
+                return None
+            return movements
 
-            # Extraer año y mes de HASTA (período de corte)
-            year_hasta, month_name = self._extract_year_from_santander_pdf(file_path)
-            print(f"   📅 Período de corte: {month_name} {year_hasta}")
+        except Exception as e:
+            logger.error("   ❌ Error leyendo tabla Santander: %s", e)
+            return []
+
+    def _santander_checking_movement(self, fecha_match, descripcion: str, cargo_str: str, abono_str: str,
+                                     year_hasta: str, month_hasta_int: int, file_path: str,
+                                     movement_id: int) -> Optional[Movement]:
+        """Arma un movimiento de una fila de la tabla Santander (None si la fila no es válida)"""
+        # Determinar el año:
+        # Si el mes del movimiento es <= mes de corte, usa year_hasta
+        # Si es > mes de corte, es del año anterior
+        day = fecha_match.group(1)
+        month = fecha_match.group(2)
+
+        if int(month) <= month_hasta_int:
+            year = year_hasta
+        else:
+            year = str(int(year_hasta) - 1)
+
+        fecha = self._parse_date(f"{day}/{month}/{year}", '%d/%m/%Y')
+        if not fecha:
+            return None
+
+        descripcion = descripcion.strip()
+        if not descripcion or len(descripcion) < 2:
+            return None
+
+        cargo_str = cargo_str.strip()
+        abono_str = abono_str.strip()
+
+        monto_val = None
+        tipo = None
+
+        # CARGO = GASTO
+        if cargo_str and cargo_str.lower() != 'nan':
+            try:
+                monto_val = float(cargo_str.replace('.', '').replace(',', '.'))
+                tipo = "gasto"
+            except ValueError:
+                pass
+
+        # ABONO = INGRESO
+        if abono_str and abono_str.lower() != 'nan':
+            try:
+                monto_val = float(abono_str.replace('.', '').replace(',', '.'))
+                tipo = "ingreso"
+            except ValueError:
+                pass
+
+        if not monto_val or monto_val <= 0 or monto_val > 100000000:
+            return None
+
+        if not tipo:
+            return None
+
+        return Movement(
+            id=movement_id,
+            fecha=fecha,
+            descripcion=descripcion,
+            monto=monto_val,
+            tipo=tipo,
+            archivo_referencia=Path(file_path).name,
+            categoria="Sin Categoria",
+            subcategoria="Sin Subcategoria"
+        )
+
+    def _parse_santander_with_camelot(self, pdf: Union[str, PdfDocument]) -> List[Dict]:
+        """Extrae tabla Santander con Camelot (respaldo opcional, sólo página 1)"""
+        try:
+            import camelot
+        except ImportError:
+            logger.warning("   ⚠️  Camelot no instalado")
+            return []
+
+        movements = []
+
+        try:
+            with as_pdf_document(pdf) as pdf:
+                file_path = str(pdf.path)
+                # Camelot abre el archivo por su cuenta
+                tables = camelot.read_pdf(file_path, pages='1', flavor='stream')
+
+                if not tables:
+                    return []
+
+                df = tables[0].df
+
+                # Extraer año y mes de HASTA (período de corte)
+                year_hasta, month_name = self._extract_year_from_santander_pdf(pdf)
+
+            logger.info("   📅 Período de corte: %s %s", month_name, year_hasta)
+            month_hasta_int = int(self._get_month_number(month_name))
 
             # Procesar filas (saltar encabezados: filas 0, 1, 2)
             for idx, row in df.iterrows():
@@ -715,7 +841,7 @@ class FileReader:
                 # Detener si encuentras "Resumen de Comisiones"
                 descripcion_check = str(row[1]).strip().lower()
                 if 'resumen' in descripcion_check and 'comisiones' in descripcion_check:
-                    print(f"   ⚠️ Fin de movimientos en fila {idx}")
+                    logger.debug("   Fin de movimientos en fila %s", idx)
                     break
 
                 try:
@@ -724,166 +850,96 @@ class FileReader:
                     if not fecha_str or '/' not in fecha_str:
                         continue
 
-                    fecha_match = re.match(r'(\d{2})/(\d{2})', fecha_str)
+                    fecha_match = SANTANDER_CC_DATE_PATTERN.match(fecha_str)
                     if not fecha_match:
                         continue
 
-                    # Extraer día y mes del movimiento
-                    day = fecha_match.group(1)
-                    month = fecha_match.group(2)
-                    
-                    # Determinar el año:
-                    # Si el mes del movimiento es <= mes de corte, usa year_hasta
-                    # Si es > mes de corte, es del año anterior
-                    month_int = int(month)
-                    month_hasta_int = int(self._get_month_number(month_name))
-                    
-                    if month_int <= month_hasta_int:
-                        year = year_hasta
-                    else:
-                        year = str(int(year_hasta) - 1)
-                    
-                    fecha = self._parse_date(f"{day}/{month}/{year}", '%d/%m/%Y')
-                    if not fecha:
-                        continue
-
-                    # Descripción
-                    descripcion = str(row[1]).strip()
-                    if not descripcion or len(descripcion) < 2:
-                        continue
-
-                    # Cargo y Abono
-                    cargo_str = str(row[3]).strip()
-                    abono_str = str(row[4]).strip()
-
-                    monto_val = None
-                    tipo = None
-
-                    # CARGO = GASTO
-                    if cargo_str and cargo_str.lower() != 'nan':
-                        try:
-                            monto_val = float(cargo_str.replace('.', '').replace(',', '.'))
-                            tipo = "gasto"
-                        except:
-                            pass
-
-                    # ABONO = INGRESO
-                    if abono_str and abono_str.lower() != 'nan':
-                        try:
-                            monto_val = float(abono_str.replace('.', '').replace(',', '.'))
-                            tipo = "ingreso"
-                        except:
-                            pass
-
-                    if not monto_val or monto_val <= 0 or monto_val > 100000000:
-                        continue
-
-                    if not tipo:
-                        continue
-
-                    movement = {
-                        "id": len(movements),
-                        "fecha": fecha,
-                        "descripcion": descripcion,
-                        "monto": monto_val,
-                        "tipo": tipo,
-                        "archivo_referencia": Path(file_path).name,
-                        "categoria": "Sin Categoria",
-                        "subcategoria": "Sin Subcategoria"
-                    }
-                    movements.append(movement)
+                    movement = self._santander_checking_movement(
+                        fecha_match, str(row[1]), str(row[3]), str(row[4]),
+                        year_hasta, month_hasta_int, file_path, len(movements)
+                    )
+                    if movement:
+                        movements.append(movement)
 
                 except Exception as e:
                     continue
 
-            print(f"   Total movimientos extraídos: {len(movements)}")
+            logger.info("   Total movimientos extraídos: %d", len(movements))
             return movements
 
         except Exception as e:
-            print(f"   ❌ Error Camelot: {e}")
+            logger.error("   ❌ Error Camelot: %s", e)
             return []
         
-    def _extract_year_from_santander_pdf(self, file_path: str) -> Tuple[str, str]:
+    def _extract_year_from_santander_pdf(self, pdf: Union[str, PdfDocument]) -> Tuple[str, str]:
         """Extrae año y mes de la sección CARTOLA DESDE en PDFs de Santander"""
-        import pdfplumber
-        
         try:
-            with pdfplumber.open(file_path) as pdf:
-                text = pdf.pages[0].extract_text()
+            with as_pdf_document(pdf) as pdf:
+                text = pdf.page_text(0)
                 text_lower = text.lower()
                 
-                print(f"      DEBUG: Buscando patrón CARTOLA...")
+                logger.debug("      Buscando patrón CARTOLA...")
                 
                 # ✅ NUEVO: Buscar línea que tenga "CARTOLA DESDE HASTA"
                 lines = text.split('\n')
                 for i, line in enumerate(lines):
                     if 'cartola' in line.lower() and 'desde' in line.lower() and 'hasta' in line.lower():
-                        print(f"      Línea CARTOLA: {line}")
+                        logger.debug("      Línea CARTOLA: %s", line)
                         
                         # La siguiente línea o esta misma tiene las fechas
                         # Buscar patrón: número FECHA1 FECHA2 número
                         for check_line in [line, lines[i+1] if i+1 < len(lines) else ""]:
                             # Buscar dos fechas consecutivas DD/MM/YYYY
-                            matches = re.findall(r'(\d{2})/(\d{2})/(\d{4})', check_line)
-                            print(f"      Fechas en línea: {matches}")
+                            matches = DATE_DD_MM_YYYY_PATTERN.findall(check_line)
+                            logger.debug("      Fechas en línea: %s", matches)
                             
                             if len(matches) >= 2:
                                 # Primera fecha = DESDE, Segunda = HASTA
                                 day_desde, month_desde, year_desde = matches[0]
                                 day_hasta, month_hasta, year_hasta = matches[1]
                                 
-                                print(f"      DESDE: {day_desde}/{month_desde}/{year_desde}")
-                                print(f"      HASTA: {day_hasta}/{month_hasta}/{year_hasta}")
+                                logger.debug("      DESDE: %s/%s/%s", day_desde, month_desde, year_desde)
+                                logger.debug("      HASTA: %s/%s/%s", day_hasta, month_hasta, year_hasta)
                                 
                                 month_name = self._get_month_name(int(month_hasta))
-                                print(f"      ✅ Período: {month_name} {year_hasta}")
+                                logger.debug("      ✅ Período: %s %s", month_name, year_hasta)
                                 return year_hasta, month_name
                 
-                print(f"      ❌ No encontró patrón CARTOLA, intentando alternativo...")
+                logger.debug("      No encontró patrón CARTOLA, intentando alternativo...")
                 
                 # Fallback: buscar PRIMERA pareja de fechas (no la última)
-                all_matches = re.findall(r'(\d{2})/(\d{2})/(\d{4})', text_lower)
-                print(f"      Todas las fechas: {all_matches}")
+                all_matches = DATE_DD_MM_YYYY_PATTERN.findall(text_lower)
+                logger.debug("      Todas las fechas: %s", all_matches)
                 
                 if len(all_matches) >= 2:
                     # Usar la segunda fecha como "HASTA" (primer par probablemente sea DESDE/HASTA)
                     day, month, year = all_matches[1]
                     month_name = self._get_month_name(int(month))
-                    print(f"      ✅ Usando segunda fecha: {month_name} {year}")
+                    logger.debug("      ✅ Usando segunda fecha: %s %s", month_name, year)
                     return year, month_name
                 
                 from datetime import datetime
                 now = datetime.now()
                 year = str(now.year)
                 month_name = self._get_month_name(now.month)
-                print(f"      ⚠️ Sin fechas, usando actual: {month_name} {year}")
+                logger.warning("      ⚠️ Sin fechas, usando actual: %s %s", month_name, year)
                 return year, month_name
                 
         except Exception as e:
-            print(f"      ❌ Error: {e}")
+            logger.error("      ❌ Error: %s", e)
             from datetime import datetime
             now = datetime.now()
             return str(now.year), self._get_month_name(now.month)
 
     def _get_month_name(self, month_num: int) -> str:
         """Convierte número de mes a nombre en español"""
-        months = {
-            1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-            5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-            9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-        }
-        return months.get(month_num, 'Desconocido')
+        return MONTH_NAMES.get(month_num, 'Desconocido')
     
     def _get_month_number(self, month_name: str) -> str:
         """Convierte nombre de mes a número (01-12)"""
-        months = {
-            'Enero': '01', 'Febrero': '02', 'Marzo': '03', 'Abril': '04',
-            'Mayo': '05', 'Junio': '06', 'Julio': '07', 'Agosto': '08',
-            'Septiembre': '09', 'Octubre': '10', 'Noviembre': '11', 'Diciembre': '12'
-        }
-        return months.get(month_name, '01')
+        return MONTH_NUMBERS.get(month_name, '01')
             
-    def _parse_bice_checking(self, text: str, file_path: str) -> List[Dict]:
+    def _parse_bice_checking(self, text: str, file_path: Union[str, PdfDocument]) -> List[Dict]:
         """Parser BICE Cuenta Corriente - Usa tabla en lugar de texto"""
         movements = []
         
@@ -898,16 +954,20 @@ class FileReader:
             pass
         
         # Fallback a parsing de texto
+        if isinstance(file_path, PdfDocument):
+            file_path = str(file_path.path)
         return self._parse_bice_from_text(text, file_path)
 
-    def _parse_bice_from_table(self, file_path: str) -> List[Dict]:
+    def _parse_bice_from_table(self, pdf: Union[str, PdfDocument]) -> List[Dict]:
         """Extrae movimientos de la tabla BICE usando pdfplumber"""
         movements = []
+        vistos = set()  # Claves de duplicado ya vistas
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    tables = page.extract_tables()
+            with as_pdf_document(pdf) as pdf:
+                file_path = str(pdf.path)
+                for page_index in range(pdf.page_count):
+                    tables = pdf.page_tables(page_index)
                     
                     if not tables:
                         continue
@@ -929,23 +989,14 @@ class FileReader:
                             monto_str = (row[4] or '').strip() if len(row) > 4 else ''
                             
                             # Parsear fecha
-                            fecha_match = re.search(r'(\d{1,2})\s+([a-z]{3})\s+(\d{4})', fecha_str, re.IGNORECASE)
+                            fecha_match = BICE_DATE_PATTERN.search(fecha_str)
                             if not fecha_match:
                                 continue
                             
-                            month_map = {
-                                'ene': 1, 'enero': 1, 'jan': 1, 'feb': 2, 'febrero': 2,
-                                'mar': 3, 'marzo': 3, 'apr': 4, 'abr': 4, 'abril': 4,
-                                'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6, 'jul': 7,
-                                'julio': 7, 'ago': 8, 'agos': 8, 'agosto': 8, 'aug': 8,
-                                'sep': 9, 'sept': 9, 'septiembre': 9, 'oct': 10, 'octubre': 10,
-                                'nov': 11, 'noviembre': 11, 'dic': 12, 'diciembre': 12, 'dec': 12
-                            }
-                            
                             dia_str, mes_str, ano_str = fecha_match.groups()
                             dia = int(dia_str)
                             ano = int(ano_str)
-                            mes = month_map.get(mes_str.lower())
+                            mes = BICE_MONTHS.get(mes_str.lower())
                             
                             if not mes or mes < 1 or mes > 12 or dia < 1 or dia > 31:
                                 continue
@@ -953,7 +1004,7 @@ class FileReader:
                             fecha = f"{ano}-{mes:02d}-{dia:02d}"
                             
                             # Parsear monto
-                            monto_match = re.search(r'\$\s*([\d\.,]+)', monto_str)
+                            monto_match = BICE_AMOUNT_PATTERN.search(monto_str)
                             if not monto_match:
                                 continue
                             
@@ -973,35 +1024,30 @@ class FileReader:
                             
                             # Detectar tipo
                             desc_lower = descripcion.lower()
-                            if any(word in desc_lower for word in ['abono', 'deposito', 'liquidacion', 'ingreso']):
+                            if BICE_INCOME_WORDS.search(desc_lower):
                                 tipo = "ingreso"
                             else:
                                 tipo = "gasto"
                             
                             # Evitar duplicados
-                            existe = any(
-                                m['fecha'] == fecha and 
-                                m['monto'] == monto and 
-                                m['descripcion'].lower() == descripcion.lower()
-                                for m in movements
-                            )
-                            if existe:
+                            if (fecha, monto, descripcion.lower()) in vistos:
                                 continue
+                            vistos.add((fecha, abs(monto), descripcion.lower()))
                             
-                            movement = {
-                                "id": len(movements),
-                                "fecha": fecha,
-                                "descripcion": descripcion,
-                                "monto": abs(monto),
-                                "tipo": tipo,
-                                "archivo_referencia": Path(file_path).name,
-                                "categoria": "Sin Categoria",
-                                "subcategoria": "Sin Subcategoria"
-                            }
+                            movement = Movement(
+                                id=len(movements),
+                                fecha=fecha,
+                                descripcion=descripcion,
+                                monto=abs(monto),
+                                tipo=tipo,
+                                archivo_referencia=Path(file_path).name,
+                                categoria="Sin Categoria",
+                                subcategoria="Sin Subcategoria"
+                            )
                             movements.append(movement)
         
         except Exception as e:
-            print(f"   ⚠️ Error extrayendo tabla BICE: {e}")
+            logger.warning("   ⚠️ Error extrayendo tabla BICE: %s", e)
             return []
         
         return movements
@@ -1009,30 +1055,19 @@ class FileReader:
     def _parse_bice_from_text(self, text: str, file_path: str) -> List[Dict]:
         """Fallback: Parsear desde texto si la tabla no funciona"""
         movements = []
+        vistos = set()  # Claves de duplicado ya vistas
         lines = text.split('\n')
         
-        fecha_pattern = r'(\d{1,2})\s+([a-z]{3})\s+(\d{4})'
-        month_map = {
-            'ene': 1, 'enero': 1, 'jan': 1, 'feb': 2, 'febrero': 2,
-            'mar': 3, 'marzo': 3, 'apr': 4, 'abr': 4, 'abril': 4,
-            'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6, 'jul': 7,
-            'julio': 7, 'ago': 8, 'agos': 8, 'agosto': 8, 'aug': 8,
-            'sep': 9, 'sept': 9, 'septiembre': 9, 'oct': 10, 'octubre': 10,
-            'nov': 11, 'noviembre': 11, 'dic': 12, 'diciembre': 12, 'dec': 12
-        }
-        
-        palabras_descartables = ['saldo', 'resumen', 'periodo', 'total', 'cartola', 'página', 'derechos', 'abonos y cargos', 'fecha', 'categoría', 'descripción', 'monto']
-        
         for line in lines:
             line = line.strip()
             
             if not line or len(line) < 20:
                 continue
             
-            if any(palabra in line.lower() for palabra in palabras_descartables):
+            if BICE_TEXT_EXCLUDE.search(line.lower()):
                 continue
             
-            fecha_match = re.search(fecha_pattern, line, re.IGNORECASE)
+            fecha_match = BICE_DATE_PATTERN.search(line)
             if not fecha_match:
                 continue
             
@@ -1040,7 +1075,7 @@ class FileReader:
                 dia_str, mes_str, ano_str = fecha_match.groups()
                 dia = int(dia_str)
                 ano = int(ano_str)
-                mes = month_map.get(mes_str.lower())
+                mes = BICE_MONTHS.get(mes_str.lower())
                 
                 if not mes or mes < 1 or mes > 12 or dia < 1 or dia > 31:
                     continue
@@ -1053,8 +1088,7 @@ class FileReader:
                 if not resto or len(resto) < 10:
                     continue
                 
-                monto_pattern = r'\$\s*([\d\.,]+)\s*$'
-                monto_match = re.search(monto_pattern, resto)
+                monto_match = BICE_TRAILING_AMOUNT_PATTERN.search(resto)
                 
                 if not monto_match:
                     continue
@@ -1084,30 +1118,25 @@ class FileReader:
                     continue
                 
                 desc_lower = descripcion.lower()
-                if any(word in desc_lower for word in ['abono', 'deposito', 'liquidacion', 'ingreso']):
+                if BICE_INCOME_WORDS.search(desc_lower):
                     tipo = "ingreso"
                 else:
                     tipo = "gasto"
                 
-                existe = any(
-                    m['fecha'] == fecha and 
-                    m['monto'] == monto and 
-                    m['descripcion'].lower() == descripcion.lower()
-                    for m in movements
-                )
-                if existe:
+                if (fecha, monto, descripcion.lower()) in vistos:
                     continue
-                
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": abs(monto),
-                    "tipo": tipo,
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria"
-                }
+                vistos.add((fecha, abs(monto), descripcion.lower()))
+                
+                movement = Movement(
+                    id=len(movements),
+                    fecha=fecha,
+                    descripcion=descripcion,
+                    monto=abs(monto),
+                    tipo=tipo,
+                    archivo_referencia=Path(file_path).name,
+                    categoria="Sin Categoria",
+                    subcategoria="Sin Subcategoria"
+                )
                 movements.append(movement)
             
             except Exception as e:
@@ -1128,7 +1157,7 @@ class FileReader:
                 next_line = lines[i + 1].strip()
                 
                 # Si la siguiente línea también es corta y no tiene fecha, probablemente es continuación
-                if next_line and not re.match(r'^\d{1,2}\s+[a-z]{3}', next_line.lower()):
+                if next_line and not BICE_LOWER_LINE_START_PATTERN.match(next_line.lower()):
                     line = line + " " + next_line
                     i += 2
                     rejoined.append(line)
@@ -1149,26 +1178,22 @@ class FileReader:
             
             # PATRÓN 1: "Transferencia de [ORIGEN] ... a [DESTINATARIO]"
             # Buscar el último " a " en la descripción (el más probable destinatario)
-            match = re.search(
-                r'transferencia\s+de\s+([A-Za-zÁáÉéÍíÓóÚúñÑ\s]+?)\s+(?:rut|run)?\s*[\d\.\-]*\s+(?:desde\s+)?(?:banco[a-z]*\s+)?a\s+([A-Za-zÁáÉéÍíÓóÚúñÑ\s]+?)(?:\s+(?:rut|run|cuenta|corriente|pesos|chile|el\s+\d)|\s*$)',
-                desc,
-                re.IGNORECASE
-            )
+            match = BICE_TRANSFER_TO_PATTERN.search(desc)
             if match:
                 destinatario = match.group(2).strip()
                 # Limpiar números de RUT o fechas al final
-                destinatario = re.sub(r'\s+(?:rut|run|cuenta|corriente|el\s+\d).*$', '', destinatario, flags=re.IGNORECASE).strip()
-                destinatario = re.sub(r'\d+[\.\-]*\d+.*$', '', destinatario).strip()  # Elimina RUT pegado
+                destinatario = BICE_RECIPIENT_SUFFIX_PATTERN.sub('', destinatario).strip()
+                destinatario = ATTACHED_RUT_PATTERN.sub('', destinatario).strip()  # Elimina RUT pegado
                 
                 if destinatario and 3 <= len(destinatario) <= 100 and any(c.isalpha() for c in destinatario):
                     return f"Transferencia a {destinatario}"
             
             # PATRÓN 2: Si no encontró "a [DESTINATARIO]", buscar nombre más simple
             # Esto captura "Transferencia de Juan Carlos Pantoja Robles"
-            match = re.search(r'transferencia\s+(?:de\s+)?([A-Za-zÁáÉéÍíÓóÚúñÑ\s]+?)(?:\s+rut|\s+run|\s*$)', desc, re.IGNORECASE)
+            match = BICE_TRANSFER_NAME_PATTERN.search(desc)
             if match:
                 nombre = match.group(1).strip()
-                nombre = re.sub(r'\s+(?:rut|run).*$', '', nombre, flags=re.IGNORECASE).strip()
+                nombre = BICE_RUT_RUN_SUFFIX_PATTERN.sub('', nombre).strip()
                 if nombre and 3 <= len(nombre) <= 100 and any(c.isalpha() for c in nombre):
                     return f"Transferencia {nombre}"
         
@@ -1182,14 +1207,10 @@ class FileReader:
             
             if 'transferencia' in desc_lower:
                 # "Abono por transferencia de [ORIGEN]"
-                match = re.search(
-                    r'(?:abono\s+)?(?:por\s+)?transferencia\s+de\s+([A-Za-zÁáÉéÍíÓóÚúñÑ\s]+?)(?:\s+(?:rut|run|cuenta|el\s+\d)|\s*$)',
-                    desc,
-                    re.IGNORECASE
-                )
+                match = BICE_INCOMING_TRANSFER_PATTERN.search(desc)
                 if match:
                     origen = match.group(1).strip()
-                    origen = re.sub(r'\s+(?:rut|run|cuenta|el\s+\d).*$', '', origen, flags=re.IGNORECASE).strip()
+                    origen = BICE_ORIGIN_SUFFIX_PATTERN.sub('', origen).strip()
                     if origen and 3 <= len(origen) <= 100 and any(c.isalpha() for c in origen):
                         return f"Abono de {origen}"
             
@@ -1209,14 +1230,10 @@ class FileReader:
             
             if 'transferencia' in desc_lower:
                 # "Cargo por transferencia a [DESTINATARIO]"
-                match = re.search(
-                    r'(?:cargo\s+)?(?:por\s+)?transferencia\s+a\s+([A-Za-zÁáÉéÍíÓóÚúñÑ\s]+?)(?:\s+(?:rut|run|cuenta)|\s*$)',
-                    desc,
-                    re.IGNORECASE
-                )
+                match = BICE_OUTGOING_TRANSFER_PATTERN.search(desc)
                 if match:
                     dest = match.group(1).strip()
-                    dest = re.sub(r'\s+(?:rut|run|cuenta).*$', '', dest, flags=re.IGNORECASE).strip()
+                    dest = BICE_ACCOUNT_SUFFIX_PATTERN.sub('', dest).strip()
                     if dest and 3 <= len(dest) <= 100 and any(c.isalpha() for c in dest):
                         return f"Cargo Transferencia a {dest}"
             
@@ -1224,7 +1241,7 @@ class FileReader:
         
         # ============ FALLBACK ============
         # Si no encaja en ningún patrón, limpiar y retornar
-        desc_clean = re.sub(r'\s+', ' ', desc).strip()
+        desc_clean = WHITESPACE_PATTERN.sub(' ', desc).strip()
         
         # Limitar longitud
         if len(desc_clean) > 100:
@@ -1232,32 +1249,35 @@ class FileReader:
         
         return desc_clean
     
-    def _parse_bice_checking_from_pdf(self, file_path: str) -> List[Dict]:
+    def _parse_bice_checking_from_pdf(self, pdf: Union[str, PdfDocument]) -> List[Dict]:
         """Extrae movimientos BICE - Intenta tabla, fallback a texto mejorado"""
         movements = []
+        vistos = set()  # Claves de duplicado ya vistas
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
+            with as_pdf_document(pdf) as pdf:
+                file_path = str(pdf.path)
+                for page_num in range(1, pdf.page_count + 1):
                     # Intento 1: Extraer con configuración de tabla
                     settings = {
                         "vertical_strategy": "lines",
                         "horizontal_strategy": "lines",
                     }
-                    tables = page.extract_tables(settings)
+                    tables = pdf.page_tables(page_num - 1, settings)
                     
                     if not tables or len(tables) == 0:
-                        print(f"      ⚠️ No se encontraron tablas en página {page_num}, usando texto...")
+                        logger.debug("      No se encontraron tablas en página %d, usando texto...", page_num)
                         
                         # Fallback: Procesar como texto pero juntando líneas correctamente
-                        text = page.extract_text()
+                        text = pdf.page_text(page_num - 1)
                         if text:
                             page_movements = self._parse_bice_from_text_improved(text, file_path)
                             movements.extend(page_movements)
-                            print(f"      ✅ {len(page_movements)} movimientos extraídos del texto")
+                            vistos.update((m['fecha'], m['monto'], m['descripcion'].lower()) for m in page_movements)
+                            logger.debug("      ✅ %d movimientos extraídos del texto", len(page_movements))
                         continue
                     
-                    print(f"      📊 Tabla encontrada en página {page_num}, procesando...")
+                    logger.debug("      📊 Tabla encontrada en página %d, procesando...", page_num)
                     
                     for table in tables:
                         for row_idx, row in enumerate(table):
@@ -1265,7 +1285,7 @@ class FileReader:
                                 continue
                             
                             row_text = ' '.join(str(cell or '') for cell in row).lower()
-                            if any(word in row_text for word in ['fecha', 'categoría', 'descripción']):
+                            if BICE_TABLE_HEADER_WORDS.search(row_text):
                                 continue
                             
                             try:
@@ -1276,26 +1296,19 @@ class FileReader:
                                 if not fecha_str or not descripcion_raw or not monto_str:
                                     continue
                                 
-                                fecha_match = re.search(r'(\d{1,2})\s+([a-z]{3})\s+(\d{4})', fecha_str, re.IGNORECASE)
+                                fecha_match = BICE_DATE_PATTERN.search(fecha_str)
                                 if not fecha_match:
                                     continue
                                 
-                                month_map = {
-                                    'ene': 1, 'enero': 1, 'feb': 2, 'febrero': 2, 'mar': 3, 'marzo': 3,
-                                    'apr': 4, 'abr': 4, 'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6,
-                                    'jul': 7, 'julio': 7, 'ago': 8, 'agos': 8, 'sep': 9, 'sept': 9,
-                                    'oct': 10, 'octubre': 10, 'nov': 11, 'noviembre': 11, 'dic': 12
-                                }
-                                
                                 dia_str, mes_str, ano_str = fecha_match.groups()
-                                mes = month_map.get(mes_str.lower())
+                                mes = BICE_CHECKING_TABLE_MONTHS.get(mes_str.lower())
                                 
                                 if not mes:
                                     continue
                                 
                                 fecha = f"{int(ano_str):04d}-{mes:02d}-{int(dia_str):02d}"
                                 
-                                monto_match = re.search(r'\$\s*([\d\.,]+)', monto_str)
+                                monto_match = BICE_AMOUNT_PATTERN.search(monto_str)
                                 if not monto_match:
                                     continue
                                 
@@ -1310,29 +1323,29 @@ class FileReader:
                                     continue
                                 
                                 desc_lower = descripcion.lower()
-                                tipo = "ingreso" if any(w in desc_lower for w in ['abono', 'liquidacion']) else "gasto"
+                                tipo = "ingreso" if BICE_CHECKING_INCOME_WORDS.search(desc_lower) else "gasto"
                                 
-                                existe = any(m['fecha'] == fecha and m['monto'] == monto and m['descripcion'].lower() == descripcion.lower() for m in movements)
-                                if existe:
+                                if (fecha, monto, descripcion.lower()) in vistos:
                                     continue
+                                vistos.add((fecha, abs(monto), descripcion.lower()))
                                 
-                                movement = {
-                                    "id": len(movements),
-                                    "fecha": fecha,
-                                    "descripcion": descripcion,
-                                    "monto": abs(monto),
-                                    "tipo": tipo,
-                                    "archivo_referencia": Path(file_path).name,
-                                    "categoria": "Sin Categoria",
-                                    "subcategoria": "Sin Subcategoria"
-                                }
+                                movement = Movement(
+                                    id=len(movements),
+                                    fecha=fecha,
+                                    descripcion=descripcion,
+                                    monto=abs(monto),
+                                    tipo=tipo,
+                                    archivo_referencia=Path(file_path).name,
+                                    categoria="Sin Categoria",
+                                    subcategoria="Sin Subcategoria"
+                                )
                                 movements.append(movement)
                             
                             except Exception as e:
                                 continue
         
         except Exception as e:
-            print(f"      ❌ Error: {e}")
+            logger.error("      ❌ Error: %s", e)
         
         return movements
 
@@ -1340,34 +1353,12 @@ class FileReader:
         """
         Parser BICE ROBUSTO v6 - N° operación solo para evitar duplicados
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         movements = []
+        vistos = set()  # Claves de duplicado ya vistas
         lines = text.split('\n')
         
-        fecha_pattern = r'^(\d{1,2})\s+([a-z]{3})\s+(\d{4})'
-        monto_pattern = r'\$\s*([\d\.,]+)\s*$'
-        numero_operacion_pattern = r'\b(\d{8})\b'
-        
-        month_map = {
-            'ene': 1, 'enero': 1, 'jan': 1, 'feb': 2, 'febrero': 2, 'fev': 2,
-            'mar': 3, 'marzo': 3, 'apr': 4, 'abr': 4, 'abril': 4,
-            'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6, 'jul': 7, 'julio': 7,
-            'ago': 8, 'agos': 8, 'agosto': 8, 'aug': 8, 'sep': 9, 'sept': 9,
-            'oct': 10, 'octubre': 10, 'nov': 11, 'noviembre': 11,
-            'dic': 12, 'diciembre': 12, 'dec': 12
-        }
-        
-        palabras_descartables = [
-            'saldo inicial', 'saldo final', 'saldo contable',
-            'resumen del periodo', 'resumen', 
-            'total abonos', 'total cargos',
-            'sobregiro usado', 'sobregiro disponible',
-            'abonos y cargos', 'fecha', 'categoría', 'descripción', 'monto',
-            'saldos diarios', 'n° operación', 'número operación',
-            'página', 'derechos reservados', 'casa matriz',
-            'tu ejecutiva', 'email', 'sucursal', 'dirección'
-        ]
-        
-        print(f"\n=== PARSING BICE FROM TEXT v6 ===\n")
+        logger.debug("=== PARSING BICE FROM TEXT v6 ===")
         
         i = 0
         while i < len(lines):
@@ -1377,7 +1368,7 @@ class FileReader:
                 i += 1
                 continue
             
-            if any(palabra in line.lower() for palabra in palabras_descartables):
+            if BICE_TEXT_V6_EXCLUDE.search(line.lower()):
                 i += 1
                 continue
             
@@ -1385,14 +1376,14 @@ class FileReader:
                 i += 1
                 continue
             
-            fecha_match = re.match(fecha_pattern, line, re.IGNORECASE)
+            fecha_match = BICE_LINE_DATE_PATTERN.match(line)
             if not fecha_match:
                 i += 1
                 continue
             
             try:
                 dia_str, mes_str, ano_str = fecha_match.groups()
-                mes = month_map.get(mes_str.lower())
+                mes = BICE_TEXT_MONTHS.get(mes_str.lower())
                 if not mes or mes < 1 or mes > 12:
                     i += 1
                     continue
@@ -1400,10 +1391,10 @@ class FileReader:
                 fecha = f"{int(ano_str):04d}-{mes:02d}-{int(dia_str):02d}"
                 
                 # Extraer número de operación (para duplicados)
-                numero_operacion_match = re.search(numero_operacion_pattern, line)
+                numero_operacion_match = BICE_OPERATION_NUMBER_PATTERN.search(line)
                 numero_operacion = numero_operacion_match.group(1) if numero_operacion_match else None
                 
-                monto_match = re.search(monto_pattern, line)
+                monto_match = BICE_TRAILING_AMOUNT_PATTERN.search(line)
                 
                 if monto_match:
                     monto_str = monto_match.group(1)
@@ -1417,13 +1408,13 @@ class FileReader:
                     while siguiente_idx < len(lines) and siguiente_idx < i + 5:
                         siguiente_line = lines[siguiente_idx].strip()
                         
-                        if re.match(fecha_pattern, siguiente_line, re.IGNORECASE):
+                        if BICE_LINE_DATE_PATTERN.match(siguiente_line):
                             break
                         
                         if not siguiente_line:
                             break
                         
-                        monto_match_obj = re.search(monto_pattern, siguiente_line)
+                        monto_match_obj = BICE_TRAILING_AMOUNT_PATTERN.search(siguiente_line)
                         if monto_match_obj:
                             monto_str = monto_match_obj.group(1)
                             linea_sin_monto = siguiente_line[:monto_match_obj.start()].strip()
@@ -1445,7 +1436,7 @@ class FileReader:
                     i += 1
                     continue
                 
-                if any(palabra in descripcion_raw.lower() for palabra in ['saldo inicial', 'saldo final', 'total abonos', 'total cargos']):
+                if BICE_BALANCE_WORDS.search(descripcion_raw.lower()):
                     i += 1
                     continue
                 
@@ -1469,37 +1460,33 @@ class FileReader:
                     tipo = "gasto"
                 
                 # ✅ CAMBIO: Usa número de operación en la clave de duplicados
-                existe = any(
-                    m['fecha'] == fecha and 
-                    m['monto'] == monto and 
-                    m['descripcion'].lower() == descripcion.lower() and
-                    m.get('numero_operacion') == numero_operacion  # Permite mismo desc con diferente N° op
-                    for m in movements
-                )
-                if existe:
+                # Permite mismo desc con diferente N° op
+                if (fecha, monto, descripcion.lower(), numero_operacion) in vistos:
                     i += 1
                     continue
-                
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": abs(monto),
-                    "tipo": tipo,
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria",
-                    "numero_operacion": numero_operacion  # Guardarlo internamente
-                }
+                vistos.add((fecha, abs(monto), descripcion.lower(), numero_operacion))
+                
+                movement = Movement(
+                    id=len(movements),
+                    fecha=fecha,
+                    descripcion=descripcion,
+                    monto=abs(monto),
+                    tipo=tipo,
+                    archivo_referencia=Path(file_path).name,
+                    categoria="Sin Categoria",
+                    subcategoria="Sin Subcategoria",
+                    numero_operacion=numero_operacion  # Guardarlo internamente
+                )
                 movements.append(movement)
-                print(f"   ✅ [{len(movements):2d}] {fecha} | {tipo:7} | {descripcion[:60]:60} | ${monto:>12,.0f}")
+                if debug:
+                    logger.debug(f"   ✅ [{len(movements):2d}] {fecha} | {tipo:7} | {descripcion[:60]:60} | ${monto:>12,.0f}")
             
             except Exception as e:
-                print(f"   ❌ Error línea {i}: {str(e)[:50]}")
+                logger.debug("   ❌ Error línea %d: %.50s", i, e)
             
             i += 1
         
-        print(f"\n=== TOTAL: {len(movements)} movimientos ===\n")
+        logger.debug("=== TOTAL: %d movimientos ===", len(movements))
         return movements
 
     def _clean_bice_description_robust(self, text: str) -> str:
@@ -1508,36 +1495,36 @@ class FileReader:
         # Solo eliminar las cosas MÁS molestas:
         
         # 1. Eliminar URLs y emails
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
-        text = re.sub(r'www\.[A-Za-z0-9.-]+\.[A-Za-z]{2,}', '', text)
+        text = EMAIL_PATTERN.sub('', text)
+        text = WEB_ADDRESS_PATTERN.sub('', text)
         
         # 2. Eliminar copyright/símbolos especiales
-        text = re.sub(r'[©®™]', '', text)
+        text = SPECIAL_SYMBOLS_PATTERN.sub('', text)
         
         # 3. Eliminar "Página X de Y"
-        text = re.sub(r'P[áa]gina\s+\d+\s+de\s+\d+', '', text, flags=re.IGNORECASE)
+        text = PAGE_NUMBER_PATTERN.sub('', text)
         
         # 4. Limpiar espacios múltiples
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text
 
     def _rejoin_bice_lines(self, lines: list) -> list:
         """Rejunta líneas de BICE que fueron divididas por el extractor"""
+        debug = logger.isEnabledFor(logging.DEBUG)
         rejoin = []
         i = 0
         
-        print(f"\n=== DEBUG _rejoin_bice_lines ===")
-        print(f"Total de líneas: {len(lines)}")
-        print(f"\nPrimeras 20 líneas:")
-        for idx, line in enumerate(lines[:20]):
-            print(f"  [{idx}] {repr(line[:80])}")
+        if debug:
+            logger.debug("=== _rejoin_bice_lines: %d líneas ===", len(lines))
+            for idx, line in enumerate(lines[:20]):
+                logger.debug("  [%d] %r", idx, line[:80])
         
         while i < len(lines):
             line = lines[i].strip()
             
             # Si empieza con fecha, es inicio de movimiento
-            if re.match(r'^\d{1,2}\s+[a-z]{3}', line, re.IGNORECASE):
+            if BICE_LINE_START_PATTERN.match(line):
                 # Juntar con siguientes líneas hasta encontrar otra fecha o fin
                 combined = line
                 start_i = i
@@ -1547,7 +1534,7 @@ class FileReader:
                     next_line = lines[i].strip()
                     
                     # Si la siguiente línea empieza con fecha, parar
-                    if re.match(r'^\d{1,2}\s+[a-z]{3}', next_line, re.IGNORECASE):
+                    if BICE_LINE_START_PATTERN.match(next_line):
                         break
                     
                     # Si es vacía, parar
@@ -1558,13 +1545,12 @@ class FileReader:
                     combined += " " + next_line
                     i += 1
                 
-                print(f"✅ [Movimiento {len(rejoin)+1}] Líneas {start_i}-{i}: {combined[:80]}...")
+                logger.debug("✅ [Movimiento %d] Líneas %d-%d: %.80s...", len(rejoin) + 1, start_i, i, combined)
                 rejoin.append(combined)
             else:
                 i += 1
         
-        print(f"\nTotal movimientos rejuntados: {len(rejoin)}")
-        print(f"=== FIN DEBUG ===\n")
+        logger.debug("Total movimientos rejuntados: %d", len(rejoin))
         
         return rejoin
     
@@ -1573,15 +1559,13 @@ class FileReader:
         movements = []
         lines = text.split('\n')
 
-        fecha_pattern = r'(\d{1,2}/\d{1,2}/\d{4})'
-
         for line in lines:
             line = line.strip()
             
             if not line or len(line) < 20:
                 continue
 
-            fecha_match = re.search(fecha_pattern, line)
+            fecha_match = DATE_DMY_PATTERN.search(line)
             if not fecha_match:
                 continue
 
@@ -1595,7 +1579,7 @@ class FileReader:
                 resto = line[fecha_end:].strip()
 
                 # Buscar montos
-                montos = re.findall(r'\$\s*(\d+(?:\.\d{3})*(?:,\d{2})?)', resto)
+                montos = GENERIC_AMOUNT_PATTERN.findall(resto)
                 if not montos:
                     continue
 
@@ -1616,16 +1600,16 @@ class FileReader:
                 if not descripcion or len(descripcion) < 3:
                     continue
 
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": abs(monto),
-                    "tipo": "gasto",
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria"
-                }
+                movement = Movement(
+                    id=len(movements),
+                    fecha=fecha,
+                    descripcion=descripcion,
+                    monto=abs(monto),
+                    tipo="gasto",
+                    archivo_referencia=Path(file_path).name,
+                    categoria="Sin Categoria",
+                    subcategoria="Sin Subcategoria"
+                )
                 movements.append(movement)
 
             except Exception as e:
@@ -1634,11 +1618,12 @@ class FileReader:
         return movements
 
     def _extract_from_dataframe(self, df, file_path: str, detection: Dict) -> List[Dict]:
-        """Extrae movimientos desde DataFrame"""
+        """Extrae movimientos desde DataFrame (por columnas, sin recorrer filas)"""
+        import pandas as pd
+
         if df.empty:
             return []
 
-        movements = []
         df.columns = [str(col).strip() for col in df.columns]
         df.columns = [str(col).lower().strip() for col in df.columns]
 
@@ -1649,104 +1634,125 @@ class FileReader:
         if not date_col or not desc_col or not amount_col:
             return []
 
-        for idx, row in df.iterrows():
-            try:
-                fecha_val = row[date_col]
-                desc_val = row[desc_col]
-                monto_val = row[amount_col]
+        fecha_values, desc_values, monto_values = df[date_col], df[desc_col], df[amount_col]
+        if any(isinstance(values, pd.DataFrame) for values in (fecha_values, desc_values, monto_values)):
+            # Nombre de columna repetido: ninguna fila es utilizable
+            return []
 
-                if pd.isna(fecha_val) or pd.isna(desc_val) or pd.isna(monto_val):
-                    continue
+        valid = ~(fecha_values.isna() | desc_values.isna() | monto_values.isna())
+        if not valid.any():
+            return []
 
-                fecha = self._parse_date(str(fecha_val))
-                if not fecha:
-                    continue
+        fechas = self._parse_date_column(fecha_values[valid].map(str).reset_index(drop=True))
+        descripciones = self._clean_description_column(desc_values[valid].map(str).reset_index(drop=True))
+        montos, montos_ok = self._parse_amount_column(monto_values[valid].map(str).reset_index(drop=True))
+
+        keep = fechas.notna() & (descripciones.str.len() >= 2) & montos_ok & ~(montos <= 0)
+
+        archivo = Path(file_path).name
+        tipo = detection['product_type']
+
+        return [
+            Movement(
+                id=idx,
+                fecha=fecha,
+                descripcion=descripcion,
+                monto=abs(monto),
+                tipo=tipo,
+                archivo_referencia=archivo,
+                categoria="Sin Categoria",
+                subcategoria="Sin Subcategoria"
+            )
+            for idx, (fecha, descripcion, monto) in enumerate(zip(
+                fechas[keep].tolist(), descripciones[keep].tolist(), montos[keep].tolist()
+            ))
+        ]
 
-                descripcion = self._clean_description(str(desc_val))
-                if not descripcion or len(descripcion) < 2:
-                    continue
+    def _parse_date_column(self, values):
+        """
+        Versión por columna de _parse_date.
+        Las fechas se repiten mucho en una cartola, así que cada valor
+        distinto se parsea una sola vez y el resultado se mapea a la columna.
+        """
+        import pandas as pd
 
-                monto = self._parse_amount(str(monto_val))
-                if monto is None or monto <= 0:
-                    continue
+        parsed = {value: self._parse_date(value) for value in pd.unique(values)}
+        return values.map(parsed)
 
-                movement = {
-                    "id": len(movements),
-                    "fecha": fecha,
-                    "descripcion": descripcion,
-                    "monto": abs(monto),
-                    "tipo": detection['product_type'],
-                    "archivo_referencia": Path(file_path).name,
-                    "categoria": "Sin Categoria",
-                    "subcategoria": "Sin Subcategoria"
-                }
-                movements.append(movement)
+    def _parse_amount_column(self, values):
+        """
+        Versión por columna de _parse_amount (mismas reglas de miles y decimales)
 
-            except Exception as e:
-                continue
+        Returns:
+            tuple: (montos float, máscara de montos válidos)
+        """
+        import pandas as pd
+
+        ok = ~(values.eq('') | values.str.lower().eq('nan'))
+
+        amounts = values.str.strip().str.replace(' ', '', regex=False)
+        ok &= amounts.ne('')
+
+        negative = amounts.str.startswith('-')
+        amounts = amounts.where(~negative, amounts.str.slice(1))
+
+        dots = amounts.str.count(r'\.')
+        has_dot = dots > 0
+        has_comma = amounts.str.contains(',', regex=False)
+        last_dot = amounts.str.rfind('.')
+
+        # Miles con punto y decimales con coma (1.234,56)
+        many_dots = dots >= 2
+        both = ~many_dots & has_dot & has_comma
+        european = many_dots | (both & (amounts.str.rfind(',') > last_dot))
+        american = both & ~european
+        thousands = ~many_dots & ~both & has_dot & ((amounts.str.len() - last_dot - 1) == 3)
+        decimal_comma = ~has_dot & has_comma
+
+        amounts = amounts.where(
+            ~european, amounts.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        )
+        amounts = amounts.where(~american, amounts.str.replace(',', '', regex=False))
+        amounts = amounts.where(~thousands, amounts.str.replace('.', '', regex=False))
+        amounts = amounts.where(~decimal_comma, amounts.str.replace(',', '.', regex=False))
+
+        # float() por valor para conservar exactamente la conversión original
+        converted = [self._to_float(amount) for amount in amounts.tolist()]
+        ok &= pd.Series([number is not None for number in converted], index=amounts.index)
+        numbers = pd.Series([0.0 if number is None else number for number in converted], index=amounts.index, dtype='float64')
+
+        numbers = numbers.where(~negative, -numbers)
+        return numbers, ok
+
+    @staticmethod
+    def _to_float(text: str):
+        try:
+            return float(text)
+        except ValueError:
+            return None
 
-        return movements
+    def _clean_description_column(self, values):
+        """Versión por columna de _clean_description (mismas expresiones)"""
+        desc = values.str.strip()
+        desc = desc.str.replace(TRAILING_TYPE_CODE_PATTERN, '', regex=True)
+        desc = desc.str.replace(TRAILING_AMOUNTS_PATTERN, '', regex=True)
+        desc = desc.str.replace(INSTALLMENT_DATE_PATTERN, '', regex=True)
+        desc = desc.str.replace(RUT_SUFFIX_PATTERN, '', regex=True)
+        desc = desc.str.replace(LONG_NUMBER_PATTERN, ' ', regex=True)
+        desc = desc.str.replace(TRAILING_DAY_MONTH_SLASH_PATTERN, '', regex=True)
+        desc = desc.str.replace(TRAILING_DAY_MONTH_PATTERN, '', regex=True)
+        desc = desc.str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+
+        desc = desc.where(desc.str.len() <= 100, desc.str.slice(0, 97) + "...")
+        return desc.str.strip()
 
     def _parse_date(self, date_str: str, date_format: str = None) -> str:
         """Parsea fecha con múltiples formatos"""
-        if not date_str or date_str.lower() == 'nan':
-            return None
-
-        date_str = str(date_str).strip()
-
-        formats = [
-            '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d',
-            '%d %b %Y', '%d %B %Y', '%d %m %Y', '%Y/%m/%d'
-        ]
-
-        if date_format:
-            formats.insert(0, date_format)
-
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_str, fmt)
-                return date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-
-        return None
+        return parse_date(date_str, date_format)
 
     def _parse_amount(self, amount_str: str) -> float:
         """Parsea monto en diferentes formatos"""
-        if not amount_str or amount_str.lower() == 'nan':
-            return None
-
-        amount_str = str(amount_str).strip().replace(' ', '')
-
-        if not amount_str:
-            return None
-
-        is_negative = amount_str.startswith('-')
-        if is_negative:
-            amount_str = amount_str[1:]
-
-        # Manejo de miles con punto y decimales con coma (1.234,56)
-        if amount_str.count('.') >= 2:
-            amount_str = amount_str.replace('.', '').replace(',', '.')
-        elif ',' in amount_str and '.' in amount_str:
-            if amount_str.rfind(',') > amount_str.rfind('.'):
-                amount_str = amount_str.replace('.', '').replace(',', '.')
-            else:
-                amount_str = amount_str.replace(',', '')
-        elif '.' in amount_str:
-            parts = amount_str.split('.')
-            if len(parts[-1]) == 3:
-                amount_str = amount_str.replace('.', '')
-        elif ',' in amount_str:
-            amount_str = amount_str.replace(',', '.')
-
-        try:
-            result = float(amount_str)
-            if is_negative:
-                result = -result
-            return result
-        except ValueError:
-            return None
+        return parse_amount(amount_str)
 
     def _clean_description(self, desc: str) -> str:
         """Limpia descripción - MEJORADO para remover T, A, I finales"""
@@ -1754,24 +1760,24 @@ class FileReader:
 
         # NUEVO: Remover letras al final (T, A, I = códigos de tipo de transacción)
         # Ejemplo: "Ikea.com T" -> "Ikea.com"
-        desc = re.sub(r'\s+[TAI]\s*$', '', desc)
+        desc = TRAILING_TYPE_CODE_PATTERN.sub('', desc)
         
         # Remover montos al final de la descripción
-        desc = re.sub(r'\s+\d+(?:\.\d{3})*(?:,\d{2})?(?:\s+\d+(?:\.\d{3})*(?:,\d{2})?)*\s*$', '', desc)
+        desc = TRAILING_AMOUNTS_PATTERN.sub('', desc)
         
         # Remover patrones de fecha
-        desc = re.sub(r'\d{1,2}/\d{1,2}\s+\w+-\d{4}', '', desc, flags=re.IGNORECASE)
-        desc = re.sub(r'\s*RUT\s+[\d\-\.]+.*', '', desc, flags=re.IGNORECASE)
+        desc = INSTALLMENT_DATE_PATTERN.sub('', desc)
+        desc = RUT_SUFFIX_PATTERN.sub('', desc)
         
         # Remover números largos (RUT, referencias)
-        desc = re.sub(r'\s+\d{7,}\s*', ' ', desc)
+        desc = LONG_NUMBER_PATTERN.sub(' ', desc)
         
         # Remover fechas al final
-        desc = re.sub(r'\b\d{1,2}/\d{1,2}/\s*$', '', desc)
-        desc = re.sub(r'\b\d{1,2}/\d{1,2}[\s|]*$', '', desc)
+        desc = TRAILING_DAY_MONTH_SLASH_PATTERN.sub('', desc)
+        desc = TRAILING_DAY_MONTH_PATTERN.sub('', desc)
         
         # Normalizar espacios
-        desc = re.sub(r'\s+', ' ', desc).strip()
+        desc = WHITESPACE_PATTERN.sub(' ', desc).strip()
 
         # Limitar longitud
         if len(desc) > 100:
@@ -0,0 +1,126 @@
+"""
+Autómata Aho-Corasick para buscar muchas palabras clave a la vez
+Encuentra todos los patrones contenidos en un texto en una sola pasada,
+lineal en el largo del texto (más la cantidad de coincidencias). Los
+patrones se agregan y quitan de forma incremental: el trie se actualiza
+al instante y los enlaces de falla se recalculan en la siguiente búsqueda.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+ROOT = 0
+
+
+class KeywordMatcher:
+    """Conjunto de patrones con búsqueda de subcadenas en una pasada"""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [ROOT]
+        self._terminal: List[Optional[str]] = [None]
+        # Nodo terminal más cercano siguiendo enlaces de falla (ROOT = ninguno)
+        self._output_link: List[int] = [ROOT]
+
+        self._nodes_by_pattern: Dict[str, int] = {}
+        self._removed = 0
+        self._dirty = False
+
+        for pattern in patterns:
+            self.add(pattern)
+
+    def __len__(self) -> int:
+        return len(self._nodes_by_pattern)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._nodes_by_pattern
+
+    def add(self, pattern: str) -> None:
+        """Agrega un patrón (sin efecto si ya estaba)"""
+        if pattern in self._nodes_by_pattern:
+            return
+
+        node = ROOT
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(ROOT)
+                self._terminal.append(None)
+                self._output_link.append(ROOT)
+                self._goto[node][char] = next_node
+            node = next_node
+
+        self._terminal[node] = pattern
+        self._nodes_by_pattern[pattern] = node
+        self._dirty = True
+
+    def remove(self, pattern: str) -> bool:
+        """Quita un patrón; los nodos quedan en el trie hasta la próxima compactación"""
+        node = self._nodes_by_pattern.pop(pattern, None)
+        if node is None:
+            return False
+
+        self._terminal[node] = None
+        self._removed += 1
+        self._dirty = True
+        return True
+
+    def find_all(self, text: str) -> Set[str]:
+        """Patrones que aparecen como subcadena de `text`"""
+        if self._dirty:
+            self._rebuild()
+
+        found = set()
+        if self._terminal[ROOT] is not None:
+            # El patrón vacío está contenido en cualquier texto
+            found.add(self._terminal[ROOT])
+
+        goto = self._goto
+        fail = self._fail
+        terminal = self._terminal
+        output_link = self._output_link
+
+        node = ROOT
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, ROOT)
+
+            match = node if terminal[node] is not None else output_link[node]
+            while match:
+                found.add(terminal[match])
+                match = output_link[match]
+
+        return found
+
+    def _rebuild(self) -> None:
+        """Recalcula enlaces de falla y de salida (y compacta si hay muchos patrones quitados)"""
+        if self._removed and self._removed >= len(self._nodes_by_pattern):
+            patterns = list(self._nodes_by_pattern)
+            self.__init__(patterns)
+
+        queue = deque()
+        for child in self._goto[ROOT].values():
+            self._fail[child] = ROOT
+            self._output_link[child] = ROOT
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, ROOT)
+                self._fail[child] = target if target != child else ROOT
+
+                fail_node = self._fail[child]
+                self._output_link[child] = (
+                    fail_node if self._terminal[fail_node] is not None and fail_node != ROOT
+                    else self._output_link[fail_node]
+                )
+                queue.append(child)
+
+        self._dirty = False
@@ -0,0 +1,77 @@
+"""
+Logging de la aplicación
+Los módulos piden su logger con get_logger(__name__); todos cuelgan de
+APP_LOGGER. setup_logging() deja un QueueHandler en ese logger y un
+QueueListener en un hilo aparte escribe en stderr, así quien registra un
+mensaje nunca espera la escritura.
+
+Nivel por defecto INFO (un resumen por archivo). FSB_DEBUG=1 activa los
+diagnósticos por página y por línea de los parsers; FSB_LOG_LEVEL fija
+cualquier otro nivel. Los mensajes usan formato perezoso (%s), que sólo
+se arma si el nivel está habilitado.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+APP_LOGGER = 'financial_bot'
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+_listener = None
+_lock = threading.Lock()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger del módulo `name` (bajo APP_LOGGER)"""
+    return logging.getLogger(f"{APP_LOGGER}.{name}")
+
+
+def debug_enabled() -> bool:
+    """Si FSB_DEBUG pide los diagnósticos detallados"""
+    return os.environ.get('FSB_DEBUG', '').lower() in ('1', 'true', 'yes', 'si')
+
+
+def _configured_level() -> int:
+    if debug_enabled():
+        return logging.DEBUG
+    level = logging.getLevelName(os.environ.get('FSB_LOG_LEVEL', 'INFO').upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def setup_logging() -> None:
+    """Configura el logger de la aplicación con una cola y un hilo escritor (idempotente)"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        records = queue.SimpleQueue()
+        app_logger = logging.getLogger(APP_LOGGER)
+        app_logger.setLevel(_configured_level())
+        app_logger.addHandler(logging.handlers.QueueHandler(records))
+        app_logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola y detiene el hilo escritor"""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        app_logger = logging.getLogger(APP_LOGGER)
+        for handler in list(app_logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                app_logger.removeHandler(handler)
@@ -0,0 +1,163 @@
+"""
+Agregaciones para el dashboard
+KPIs por tipo, flujo de caja mensual/diario y totales por categoría y
+subcategoría, calculados con group-bys de pandas sobre una tabla columnar
+de los movimientos activos. Los resultados se memoizan por parámetros
+(LRU acotado) hasta que se reconstruye la tabla.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .movement_store import AMOUNT_SCALE, MovementStore
+
+UNCATEGORIZED_LABEL = 'Sin Categoría'
+
+# Resolución de cada periodo del flujo de caja (unidad de datetime64)
+PERIODS = {'mes': 'M', 'dia': 'D'}
+
+# Resultados memoizados por instancia (combinaciones de parámetros distintas)
+CACHE_SIZE = 256
+
+
+def _parse_range(value: str) -> Tuple[np.datetime64, np.datetime64]:
+    """
+    Inicio y fin (exclusivo) del periodo de un filtro de fecha: un día
+    (YYYY-MM-DD), un mes completo (YYYY-MM) o un año (YYYY), igual que
+    el filtro por prefijo de /movements
+    """
+    try:
+        start = np.datetime64(value[:10])
+    except ValueError:
+        raise ValueError(f"Fecha inválida: {value}")
+    if np.datetime_data(start.dtype)[0] not in ('D', 'M', 'Y'):
+        raise ValueError(f"Fecha inválida: {value}")
+    return start.astype('datetime64[ns]'), (start + 1).astype('datetime64[ns]')
+
+
+class MovementAnalytics:
+    """Columnas del MovementStore ordenadas por fecha, con agregaciones memoizadas"""
+
+    def __init__(self, store: MovementStore):
+        # Los movimientos con monto inválido no cuentan en ningún total ni conteo
+        valid = store.valid_positions()
+        df = store.frame(['fecha', 'tipo', 'monto'], valid)
+        df['categoria'] = pd.Categorical(store.map_values('categoria', str.strip)[valid])
+        df['subcategoria'] = pd.Categorical(store.map_values('subcategoria', str.strip)[valid])
+        df['es_ingreso'] = (df['tipo'] == 'ingreso').to_numpy()
+        df['es_gasto'] = (df['tipo'] == 'gasto').to_numpy()
+
+        # Orden por fecha para recortar ventanas con searchsorted (fechas inválidas al final)
+        self.df = df.sort_values('fecha', kind='stable').reset_index(drop=True)
+        self._fechas = self.df['fecha'].to_numpy()
+        self._dated = int(self.df['fecha'].notna().sum())
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _memoized(self, key: tuple, compute):
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        value = compute()
+        with self._cache_lock:
+            self._cache[key] = value
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return value
+
+    def _window(self, desde: str = None, hasta: str = None) -> pd.DataFrame:
+        """
+        Movimientos con fecha en [desde, hasta], ambos inclusivos; con YYYY-MM
+        o YYYY `hasta` abarca el mes o el año completo
+        """
+        if not desde and not hasta:
+            return self.df
+        # Las fechas inválidas quedan al final del orden y no pertenecen a ninguna ventana
+        dated = self._fechas[:self._dated]
+        start = dated.searchsorted(_parse_range(desde)[0], side='left') if desde else 0
+        end = dated.searchsorted(_parse_range(hasta)[1], side='left') if hasta else self._dated
+        return self.df.iloc[start:end]
+
+    def kpis(self, desde: str = None, hasta: str = None) -> Dict[str, Any]:
+        """Totales de ingresos, gastos y saldo neto"""
+        def compute():
+            df = self._window(desde, hasta)
+            ingresos = int(df['monto'].where(df['es_ingreso'], 0).sum()) / AMOUNT_SCALE
+            gastos = int(df['monto'].where(df['es_gasto'], 0).sum()) / AMOUNT_SCALE
+            return {
+                'total_ingresos': ingresos,
+                'total_gastos': gastos,
+                'saldo': ingresos - gastos,
+                'cantidad_ingresos': int(df['es_ingreso'].sum()),
+                'cantidad_gastos': int(df['es_gasto'].sum()),
+                'total_movimientos': int(len(df)),
+            }
+        return self._memoized(('kpis', desde, hasta), compute)
+
+    def cash_flow(self, periodo: str = 'mes', desde: str = None, hasta: str = None) -> List[Dict[str, Any]]:
+        """Ingresos, gastos y saldo por mes (YYYY-MM) o por día (YYYY-MM-DD)"""
+        if periodo not in PERIODS:
+            raise ValueError(f"Periodo no soportado: {periodo}")
+
+        def compute():
+            df = self._window(desde, hasta)
+            df = df[df['fecha'].notna()]
+            if df.empty:
+                return []
+            grouped = pd.DataFrame({
+                'periodo': df['fecha'].to_numpy().astype(f'datetime64[{PERIODS[periodo]}]').astype(str),
+                'ingresos': df['monto'].where(df['es_ingreso'], 0),
+                'gastos': df['monto'].where(df['es_gasto'], 0),
+            }).groupby('periodo', sort=True).sum() / AMOUNT_SCALE
+            grouped['saldo'] = grouped['ingresos'] - grouped['gastos']
+            return [
+                {'periodo': key, 'ingresos': float(row[0]), 'gastos': float(row[1]), 'saldo': float(row[2])}
+                for key, row in zip(grouped.index.tolist(), grouped[['ingresos', 'gastos', 'saldo']].to_numpy().tolist())
+            ]
+        return self._memoized(('cash_flow', periodo, desde, hasta), compute)
+
+    def category_breakdown(self, tipo: str = 'gasto', desde: str = None, hasta: str = None) -> List[Dict[str, Any]]:
+        """
+        Totales (valor absoluto) por categoría y subcategoría para un tipo,
+        ordenados de mayor a menor
+        """
+        def compute():
+            df = self._window(desde, hasta)
+            df = df[(df['tipo'] == tipo).to_numpy()]
+            if df.empty:
+                return []
+
+            categoria = df['categoria'].astype(str)
+            sin_categoria = categoria.str.lower().isin(['', 'sin categoria', 'sin categoría'])
+            frame = pd.DataFrame({
+                'categoria': categoria.where(~sin_categoria, UNCATEGORIZED_LABEL),
+                'subcategoria': df['subcategoria'].astype(str).where(~sin_categoria, ''),
+                'monto': df['monto'].abs(),
+            })
+
+            by_sub = frame.groupby(['categoria', 'subcategoria'], sort=False)['monto'].agg(['sum', 'count'])
+            by_cat = by_sub.groupby(level='categoria', sort=False).sum().sort_values('sum', ascending=False, kind='stable')
+
+            subcategories: Dict[str, List[Dict[str, Any]]] = {}
+            for (cat, sub), (total, count) in zip(by_sub.index.tolist(), by_sub.to_numpy().tolist()):
+                subcategories.setdefault(cat, []).append({
+                    'subcategoria': sub,
+                    'total': total / AMOUNT_SCALE,
+                    'movimientos': int(count),
+                })
+
+            return [
+                {
+                    'categoria': cat,
+                    'total': total / AMOUNT_SCALE,
+                    'movimientos': int(count),
+                    'subcategorias': sorted(subcategories[cat], key=lambda s: s['total'], reverse=True),
+                }
+                for cat, (total, count) in zip(by_cat.index.tolist(), by_cat.to_numpy().tolist())
+            ]
+        return self._memoized(('category_breakdown', tipo, desde, hasta), compute)
@@ -0,0 +1,189 @@
+"""
+Índice de consulta sobre los movimientos activos
+Permite filtrar, ordenar y paginar con cursor en el servidor sin recorrer
+ni serializar todo el historial en cada request.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .movement_store import MovementStore
+
+# Campos con filtro por igualdad
+FILTER_FIELDS = ['institucion', 'tipo_producto', 'tipo', 'categoria']
+
+# Campos por los que se puede ordenar ('-campo' = descendente)
+SORT_FIELDS = ['fecha', 'monto', 'descripcion']
+
+# Valores de categoría que cuentan como "sin categorizar"
+UNCATEGORIZED = {'', 'sin categoria', 'sin categoría'}
+
+
+class InvalidQueryError(ValueError):
+    """Parámetros de consulta inválidos (orden o cursor)"""
+
+
+def encode_cursor(orden: str, key: Any, position: int) -> str:
+    raw = json.dumps([orden, key, position], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    try:
+        orden, key, position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return orden, key, int(position)
+    except Exception:
+        raise InvalidQueryError("Cursor inválido")
+
+
+class MovementIndex:
+    """Filtros, orden y paginación sobre un MovementStore"""
+
+    def __init__(self, store: MovementStore, active_files: int = 0):
+        self.store = store
+        self.active_files = active_files
+
+        self._uncategorized = store.map_values(
+            'categoria', lambda text: text.strip().lower() in UNCATEGORIZED
+        ).astype(bool)
+
+        # Orden por campo (se calcula al primer uso): (posiciones ordenadas, claves en ese orden)
+        self._orders: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def _order(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Posiciones ordenadas por (clave, posición) y la clave de cada una"""
+        if field not in self._orders:
+            if not field:
+                positions = np.arange(len(self.store))
+                self._orders[field] = (positions, positions)
+            elif field == 'monto':
+                # Montos inválidos al final del orden ascendente (al inicio del descendente)
+                montos = np.where(self.store.monto_valid, self.store.montos, np.iinfo(np.int64).max)
+                positions = np.argsort(montos, kind='stable')
+                self._orders[field] = (positions, montos[positions])
+            else:
+                func = str.lower if field == 'descripcion' else None
+                keys, ranks = self.store.ranked(field, func)
+                positions = np.argsort(ranks, kind='stable')
+                self._orders[field] = (positions, keys[ranks[positions]])
+        return self._orders[field]
+
+    def filter(self, desde: str = None, hasta: str = None, institucion: str = None,
+               tipo_producto: str = None, tipo: str = None, categoria: str = None,
+               sin_categoria: bool = False, buscar: str = None) -> Optional[np.ndarray]:
+        """
+        Retorna la máscara booleana de movimientos que cumplen los filtros,
+        o None si no hay ningún filtro (todas las posiciones)
+        """
+        mask = None
+
+        def intersect(condition: np.ndarray):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        equality = {'institucion': institucion, 'tipo_producto': tipo_producto, 'tipo': tipo, 'categoria': categoria}
+        for field, value in equality.items():
+            if value is not None:
+                intersect(self.store.equals(field, value))
+
+        if sin_categoria:
+            intersect(self._uncategorized)
+
+        if desde or hasta:
+            intersect(self.store.between_dates(desde, hasta))
+
+        if buscar:
+            intersect(self.store.contains('descripcion', buscar))
+
+        return mask
+
+    def positions(self, **filters) -> np.ndarray:
+        """Posiciones (en orden de carga) que cumplen los filtros"""
+        mask = self.filter(**filters)
+        return np.arange(len(self.store)) if mask is None else np.flatnonzero(mask)
+
+    def select(self, orden: str = None, limite: int = None, cursor: str = None,
+               **filters) -> Tuple[int, np.ndarray, Optional[str]]:
+        """
+        Filtra, ordena y pagina sin armar los movimientos.
+
+        Returns:
+            tuple: (coincidencias, posiciones de la página en orden, siguiente_cursor o None)
+        """
+        field = (orden or '').lstrip('-')
+        descending = bool(orden) and orden.startswith('-')
+        if field and field not in SORT_FIELDS:
+            raise InvalidQueryError(f"Orden no soportado: {orden}")
+
+        mask = self.filter(**filters)
+        total = len(self.store) if mask is None else int(mask.sum())
+
+        positions, keys = self._order(field)
+
+        # Rangos (índices en el orden) desde el punto de partida del cursor
+        if cursor:
+            cursor_orden, key, position = decode_cursor(cursor)
+            if cursor_orden != (orden or ''):
+                raise InvalidQueryError("El cursor corresponde a otro orden")
+            try:
+                low = int(np.searchsorted(keys, key, side='left'))
+                high = int(np.searchsorted(keys, key, side='right'))
+            except TypeError:
+                raise InvalidQueryError("Cursor inválido")
+            if descending:
+                end = low + int(np.searchsorted(positions[low:high], position, side='left'))
+                ranks = np.arange(end - 1, -1, -1)
+            else:
+                start = low + int(np.searchsorted(positions[low:high], position, side='right'))
+                ranks = np.arange(start, len(positions))
+        else:
+            ranks = np.arange(len(positions) - 1, -1, -1) if descending else np.arange(len(positions))
+
+        if mask is not None:
+            ranks = ranks[mask[positions[ranks]]]
+
+        has_more = limite is not None and len(ranks) > limite
+        page = ranks[:limite] if limite is not None else ranks
+
+        next_cursor = None
+        if has_more and len(page):
+            last = page[-1]
+            key = keys[last]
+            next_cursor = encode_cursor(orden or '', key.item() if isinstance(key, np.generic) else key,
+                                        int(positions[last]))
+
+        return total, positions[page], next_cursor
+
+    def query(self, orden: str = None, limite: int = None, cursor: str = None, **filters) -> Dict[str, Any]:
+        """
+        Filtra, ordena y pagina.
+
+        Returns:
+            dict: {'total': coincidencias, 'movimientos': página, 'siguiente_cursor': str o None}
+        """
+        total, page, next_cursor = self.select(orden=orden, limite=limite, cursor=cursor, **filters)
+        return {
+            'total': total,
+            'movimientos': self.store.to_dicts(page),
+            'siguiente_cursor': next_cursor
+        }
+
+    def stream(self, orden: str = None, limite: int = None, cursor: str = None,
+               chunk_size: int = 500, **filters) -> Dict[str, Any]:
+        """
+        Como query, pero 'movimientos' es un iterador de tandas de chunk_size
+        dicts que se arman a medida que se consumen (para respuestas en streaming).
+        Los errores de parámetros se lanzan aquí, antes de empezar a iterar.
+        """
+        total, page, next_cursor = self.select(orden=orden, limite=limite, cursor=cursor, **filters)
+        return {
+            'total': total,
+            'movimientos': self.store.iter_dicts(page, chunk_size),
+            'siguiente_cursor': next_cursor
+        }
@@ -0,0 +1,228 @@
+"""
+Almacén columnar de movimientos en memoria
+Guarda los movimientos activos como columnas de pandas/NumPy en vez de
+una lista de dicts: campos repetitivos como categóricos (descripción
+incluida, que queda internada), montos en centavos int64 y fechas en
+datetime64. Los dicts sólo se arman al serializar una página a JSON.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Campos de texto con pocos valores distintos (se guardan como categóricos)
+CATEGORICAL_FIELDS = [
+    'descripcion', 'fecha', 'tipo', 'categoria', 'subcategoria',
+    'institucion', 'tipo_producto', 'banco', 'tipo_cuenta', 'archivo_referencia'
+]
+
+# Escala de los montos guardados (centavos)
+AMOUNT_SCALE = 100
+
+# Mayor monto cuyos centavos caben en un int64 (los mayores son inválidos)
+MAX_AMOUNT = (2 ** 63 - 1) // AMOUNT_SCALE
+
+
+class MovementStore:
+    """Movimientos en columnas, con máscaras de filtro, group-by y serialización por posiciones"""
+
+    def __init__(self, movements: Sequence[Dict]):
+        self._size = len(movements)
+
+        # Conjunto de claves (y su orden) de cada movimiento, para reconstruir los dicts tal cual
+        shape_codes = {}
+        self._shapes: List[tuple] = []
+        codes = np.empty(self._size, dtype=np.int32)
+        for position, movement in enumerate(movements):
+            keys = tuple(movement)
+            code = shape_codes.get(keys)
+            if code is None:
+                code = shape_codes[keys] = len(self._shapes)
+                self._shapes.append(keys)
+            codes[position] = code
+        self._shape_codes = codes
+
+        fields = list(dict.fromkeys(key for shape in self._shapes for key in shape))
+        self.columns: Dict[str, Any] = {}
+        # Montos válidos (numéricos y finitos); los inválidos no cuentan en las agregaciones
+        self.monto_valid = np.zeros(self._size, dtype=bool)
+        # Valor original de los montos inválidos por posición, para serializarlos tal cual
+        self._invalid_montos: Dict[int, Any] = {}
+        for field in fields:
+            values = [movement.get(field) for movement in movements]
+            if field == 'monto':
+                numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+                with np.errstate(invalid='ignore'):
+                    self.monto_valid = np.isfinite(numbers) & (np.abs(numbers) <= MAX_AMOUNT)
+                # NaN/infinito no son JSON válido: se serializan como None
+                self._invalid_montos = {
+                    position: None if isinstance(values[position], float) and not np.isfinite(values[position])
+                    else values[position]
+                    for position in np.flatnonzero(~self.monto_valid).tolist()
+                }
+                numbers = np.where(self.monto_valid, numbers, 0.0)
+                self.columns[field] = np.rint(numbers * AMOUNT_SCALE).astype(np.int64)
+            elif field in CATEGORICAL_FIELDS:
+                self.columns[field] = pd.Categorical(values)
+            else:
+                self.columns[field] = np.array(values + [None], dtype=object)[:-1]
+
+        # Fecha como datetime64 (día); las fechas no parseables quedan NaT
+        fecha = self.columns.get('fecha')
+        if fecha is not None and len(fecha.categories):
+            parsed = pd.to_datetime(pd.Series(fecha.categories.astype(str)).str.slice(0, 10),
+                                    format='%Y-%m-%d', errors='coerce').to_numpy()
+            self.fechas = np.where(fecha.codes >= 0, parsed[fecha.codes], np.datetime64('NaT'))
+            self.fechas = self.fechas.astype('datetime64[ns]')
+        else:
+            self.fechas = np.full(self._size, np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    def __len__(self) -> int:
+        return self._size
+
+    # =================================================================
+    # COLUMNAS
+    # =================================================================
+
+    @property
+    def montos(self) -> np.ndarray:
+        """Montos en centavos (int64); los inválidos quedan en 0, ver monto_valid"""
+        column = self.columns.get('monto')
+        return column if column is not None else np.zeros(self._size, dtype=np.int64)
+
+    def text(self, field: str) -> np.ndarray:
+        """Columna como texto (None -> ''), calculada una vez por valor distinto"""
+        column = self.columns.get(field)
+        if column is None:
+            return np.full(self._size, '', dtype=object)
+        if isinstance(column, pd.Categorical):
+            categories = np.array([str(value) for value in column.categories] + [''], dtype=object)
+            return categories[column.codes]
+        return np.array(['' if value is None else str(value) for value in column], dtype=object)
+
+    def map_values(self, field: str, func) -> np.ndarray:
+        """
+        Aplica `func` al texto de cada valor distinto de un campo categórico
+        y reparte el resultado por posición (None se trata como '')
+        """
+        column = self.columns.get(field)
+        if not isinstance(column, pd.Categorical):
+            return np.array([func(value) for value in self.text(field)] + [None], dtype=object)[:-1]
+        mapped = np.array([func(str(value)) for value in column.categories] + [func('')], dtype=object)
+        return mapped[column.codes]
+
+    def ranked(self, field: str, func=None) -> tuple:
+        """
+        Valores distintos de un campo (transformados con `func`) ordenados y el
+        rango de cada movimiento en ese orden
+
+        Returns:
+            tuple: (valores ordenados, rangos por posición)
+        """
+        func = func or (lambda text: text)
+        column = self.columns.get(field)
+        if isinstance(column, pd.Categorical):
+            mapped = np.array([func(str(value)) for value in column.categories] + [func('')], dtype=object)
+            keys, inverse = np.unique(mapped, return_inverse=True)
+            return keys, inverse[column.codes]
+        keys, ranks = np.unique(self.map_values(field, func), return_inverse=True)
+        return keys, ranks
+
+    # =================================================================
+    # FILTROS
+    # =================================================================
+
+    def equals(self, field: str, value: Any) -> np.ndarray:
+        """Máscara de movimientos con `field == value`"""
+        column = self.columns.get(field)
+        if column is None:
+            return np.full(self._size, value is None)
+        if isinstance(column, pd.Categorical):
+            if value is None:
+                return column.codes < 0
+            categories = column.categories
+            if value not in categories:
+                return np.zeros(self._size, dtype=bool)
+            return column.codes == categories.get_loc(value)
+        return np.array([item == value for item in column], dtype=bool)
+
+    def between_dates(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> np.ndarray:
+        """Máscara de fechas en [desde, hasta] (inclusivos, comparando el texto de la fecha)"""
+        def inside(fecha: str) -> bool:
+            return (not desde or fecha >= desde) and (not hasta or fecha <= hasta + '\uffff')
+        return self.map_values('fecha', inside).astype(bool)
+
+    def contains(self, field: str, needle: str) -> np.ndarray:
+        """Máscara de movimientos cuyo campo contiene `needle` (sin distinguir mayúsculas)"""
+        needle = needle.lower()
+        return self.map_values(field, lambda text: needle in text.lower()).astype(bool)
+
+    # =================================================================
+    # AGRUPACIONES
+    # =================================================================
+
+    def frame(self, fields: Iterable[str], positions: np.ndarray = None) -> pd.DataFrame:
+        """DataFrame con las columnas pedidas (monto en centavos, fecha como datetime64)"""
+        data = {}
+        for field in fields:
+            if field == 'fecha':
+                data[field] = self.fechas
+            elif field == 'monto':
+                data[field] = self.montos
+            else:
+                column = self.columns.get(field)
+                data[field] = column if column is not None else np.full(self._size, None, dtype=object)
+        frame = pd.DataFrame(data)
+        return frame if positions is None else frame.iloc[positions].reset_index(drop=True)
+
+    def valid_positions(self, positions: np.ndarray = None) -> np.ndarray:
+        """Posiciones (todas, o las dadas) cuyo monto es válido"""
+        if positions is None:
+            return np.flatnonzero(self.monto_valid)
+        positions = np.asarray(positions, dtype=np.int64)
+        return positions[self.monto_valid[positions]]
+
+    def group_by(self, fields: List[str], positions: np.ndarray = None) -> pd.DataFrame:
+        """
+        Suma de montos (centavos) y cantidad de movimientos por combinación de
+        campos (sin los movimientos de monto inválido)
+        """
+        frame = self.frame(fields + ['monto'], self.valid_positions(positions))
+        return frame.groupby(fields, sort=False, observed=True)['monto'].agg(['sum', 'count'])
+
+    # =================================================================
+    # SERIALIZACIÓN
+    # =================================================================
+
+    def to_dicts(self, positions: Iterable[int] = None) -> List[Dict[str, Any]]:
+        """Movimientos como dicts (mismas claves y orden que al cargarlos) listos para JSON"""
+        positions = np.arange(self._size) if positions is None else np.asarray(positions, dtype=np.int64)
+        if len(positions) == 0:
+            return []
+
+        values = {}
+        for field, column in self.columns.items():
+            if field == 'monto':
+                values[field] = (column[positions] / AMOUNT_SCALE).tolist()
+                if self._invalid_montos:
+                    for row in np.flatnonzero(~self.monto_valid[positions]).tolist():
+                        values[field][row] = self._invalid_montos[int(positions[row])]
+            elif isinstance(column, pd.Categorical):
+                categories = np.array(list(column.categories) + [None], dtype=object)
+                values[field] = categories[column.codes[positions]].tolist()
+            else:
+                values[field] = column[positions].tolist()
+
+        shapes = self._shapes
+        shape_codes = self._shape_codes[positions].tolist()
+        return [
+            {key: values[key][row] for key in shapes[shape]}
+            for row, shape in enumerate(shape_codes)
+        ]
+
+    def iter_dicts(self, positions: Iterable[int] = None, chunk_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Como to_dicts pero en tandas de chunk_size: en memoria queda sólo la tanda actual"""
+        positions = np.arange(self._size) if positions is None else np.asarray(positions, dtype=np.int64)
+        for start in range(0, len(positions), chunk_size):
+            yield self.to_dicts(positions[start:start + chunk_size])
@@ -2,14 +2,20 @@
 Módulo para normalización y consolidación de datos
 """
 
-import pandas as pd
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 class DataNormalizer:
     """Normaliza y consolida movimientos de múltiples fuentes"""
     
     @staticmethod
-    def consolidate(all_movements: List[List[Dict[str, Any]]]) -> pd.DataFrame:
+    def consolidate(all_movements: List[List[Dict[str, Any]]]) -> 'pd.DataFrame':
         """
         Consolida todos los movimientos en un único DataFrame
         
@@ -19,6 +25,8 @@ class DataNormalizer:
         Returns:
             pd.DataFrame: Datos consolidados y normalizados
         """
+        import pandas as pd
+
         # Aplanar lista de listas en una única lista
         flat_movements = []
         for movements_list in all_movements:
@@ -28,7 +36,7 @@ class DataNormalizer:
                 flat_movements.append(movements_list)
         
         if not flat_movements:
-            print("⚠️  No hay movimientos para consolidar")
+            logger.warning("⚠️  No hay movimientos para consolidar")
             return pd.DataFrame()
         
         # Convertir a DataFrame
@@ -41,12 +49,12 @@ class DataNormalizer:
         if 'fecha' in df.columns:
             df = df.sort_values('fecha').reset_index(drop=True)
         
-        print(f"✅ Se consolidaron {len(df)} movimientos")
+        logger.info("✅ Se consolidaron %s movimientos", len(df))
         
         return df
     
     @staticmethod
-    def _normalize_types(df: pd.DataFrame) -> pd.DataFrame:
+    def _normalize_types(df: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         Normaliza tipos de datos del DataFrame
         
@@ -56,17 +64,19 @@ class DataNormalizer:
         Returns:
             pd.DataFrame: DataFrame con tipos normalizados
         """
+        import pandas as pd
+
         if 'fecha' in df.columns:
             try:
                 df['fecha'] = pd.to_datetime(df['fecha'], errors='coerce').dt.strftime('%Y-%m-%d')
             except Exception as e:
-                print(f"❌ Error normalizando fechas: {e}")
+                logger.error("❌ Error normalizando fechas: %s", e)
         
         if 'monto' in df.columns:
             try:
                 df['monto'] = pd.to_numeric(df['monto'], errors='coerce')
             except Exception as e:
-                print(f"❌ Error normalizando montos: {e}")
+                logger.error("❌ Error normalizando montos: %s", e)
         
         # Asegurar que las columnas texto sean strings
         for col in ['descripcion', 'categoria', 'subcategoria', 'archivo_referencia', 'banco']:
@@ -76,7 +86,7 @@ class DataNormalizer:
         return df
     
     @staticmethod
-    def save_to_csv(df: pd.DataFrame, output_path: str) -> bool:
+    def save_to_csv(df: 'pd.DataFrame', output_path: str) -> bool:
         """
         Guarda el DataFrame consolidado a CSV
         
@@ -89,14 +99,14 @@ class DataNormalizer:
         """
         try:
             df.to_csv(output_path, index=False, encoding='utf-8')
-            print(f"✅ Archivo guardado en: {output_path}")
+            logger.info("✅ Archivo guardado en: %s", output_path)
             return True
         except Exception as e:
-            print(f"❌ Error guardando CSV: {e}")
+            logger.error("❌ Error guardando CSV: %s", e)
             return False
     
     @staticmethod
-    def load_from_csv(csv_path: str) -> pd.DataFrame:
+    def load_from_csv(csv_path: str) -> 'pd.DataFrame':
         """
         Carga un archivo maestro desde CSV
         
@@ -106,16 +116,18 @@ class DataNormalizer:
         Returns:
             pd.DataFrame: Datos cargados
         """
+        import pandas as pd
+
         try:
             df = pd.read_csv(csv_path)
-            print(f"✅ Archivo cargado desde: {csv_path}")
+            logger.info("✅ Archivo cargado desde: %s", csv_path)
             return df
         except Exception as e:
-            print(f"❌ Error cargando CSV: {e}")
+            logger.error("❌ Error cargando CSV: %s", e)
             return pd.DataFrame()
     
     @staticmethod
-    def get_summary_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    def get_summary_stats(df: 'pd.DataFrame') -> Dict[str, Any]:
         """
         Obtiene estadísticas resumidas del DataFrame
         
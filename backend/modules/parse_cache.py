@@ -0,0 +1,72 @@
+"""
+Caché persistente de movimientos parseados
+Guarda el resultado de FileReader por hash SHA256 del archivo para no
+volver a parsear PDFs/Excel en cada request. Los movimientos se persisten
+en la tabla `movements` de Storage.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from models.movement import Movement
+
+# Módulos cuyo código determina el resultado del parseo.
+# Si cualquiera cambia, las entradas de la caché quedan obsoletas.
+PARSER_MODULES = ['file_reader.py', 'field_parsers.py', 'parser_patterns.py', 'word_table.py', 'pdf_document.py', 'excel_document.py']
+
+# Se incrementa si cambia el formato de las entradas de la caché
+# (3: cada entrada se registra en parsed_files, también las vacías)
+CACHE_FORMAT = 3
+
+
+def compute_parser_version() -> str:
+    """Calcula la versión del parser a partir del código fuente de sus módulos"""
+    sha256_hash = hashlib.sha256(f"format={CACHE_FORMAT}".encode())
+    modules_dir = Path(__file__).parent
+    for module_name in PARSER_MODULES:
+        module_path = modules_dir / module_name
+        if module_path.exists():
+            sha256_hash.update(module_path.read_bytes())
+    return sha256_hash.hexdigest()[:16]
+
+
+class ParseCache:
+    """Almacén de resultados de parseo indexado por hash de archivo (tabla movements)"""
+
+    def __init__(self, storage, parser_version: str = None):
+        self.storage = storage
+        self.parser_version = parser_version or compute_parser_version()
+        self._memory: Dict[str, List[Movement]] = {}
+
+    def get(self, file_hash: str) -> Optional[List[Movement]]:
+        """
+        Retorna una copia de los movimientos parseados, o None si no hay
+        entrada válida para la versión actual del parser. Un archivo sin
+        movimientos es un acierto y retorna [].
+        """
+        movements = self._memory.get(file_hash)
+
+        if movements is None:
+            rows = self.storage.load_parsed_movements(file_hash, self.parser_version)
+            if rows is None:
+                return None
+            movements = self._memory[file_hash] = [Movement.from_dict(row) for row in rows]
+
+        # Los llamadores mutan los movimientos (ids, categorías), así que se entrega una copia
+        return [m.copy() for m in movements]
+
+    def put(self, file_hash: str, movements: List[Movement]) -> None:
+        """Guarda los movimientos parseados de un archivo (en la tabla como JSON)"""
+        self.storage.save_parsed_movements(file_hash, self.parser_version, [m.to_dict() for m in movements])
+        self._memory[file_hash] = [m.copy() for m in movements]
+
+    def invalidate(self, file_hash: str) -> None:
+        """Elimina la entrada de un archivo"""
+        self._memory.pop(file_hash, None)
+        self.storage.delete_parsed_movements(file_hash)
+
+    def clear(self) -> None:
+        """Elimina todas las entradas"""
+        self._memory.clear()
+        self.storage.clear_parsed_movements()
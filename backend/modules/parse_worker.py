@@ -0,0 +1,124 @@
+"""
+Detección y parseo de archivos en procesos separados
+`detect_and_parse` es una función de nivel superior (serializable con
+pickle) para que las cargas masivas repartan los archivos entre los
+núcleos con un ProcessPoolExecutor.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from .file_detector import FileDetector
+from .file_reader import FileReader
+from .excel_document import ExcelDocument
+from .pdf_document import PdfDocument, open_document
+from .logger import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Lector y detector propios de cada proceso (se crean al primer uso)
+_reader = None
+_detector = None
+
+
+def _components() -> Tuple[FileReader, FileDetector]:
+    global _reader, _detector
+    if _reader is None:
+        _reader = FileReader()
+        _detector = FileDetector()
+    return _reader, _detector
+
+
+def parse_source(source: Union[str, Path, PdfDocument, ExcelDocument], reader: FileReader = None) -> List[Dict]:
+    """Parsea un archivo (ruta, PdfDocument abierto o ExcelDocument leído) con el lector correspondiente"""
+    if reader is None:
+        reader, _ = _components()
+
+    if isinstance(source, PdfDocument):
+        return reader.read_pdf(source)
+    if isinstance(source, ExcelDocument):
+        return reader.read_xlsx(source)
+    if Path(source).name.lower().endswith('.pdf'):
+        return reader.read_pdf(str(source))
+    return reader.read_xlsx(str(source))
+
+
+def detect_and_parse(file_path: Union[str, Path], reader: FileReader = None,
+                     detector: FileDetector = None) -> Tuple[Dict, List[Dict]]:
+    """
+    Detecta institución/producto y extrae los movimientos abriendo el archivo una sola vez
+
+    Returns:
+        tuple: (detección, movimientos)
+    """
+    if reader is None or detector is None:
+        reader, detector = _components()
+
+    with open_document(file_path) as source:
+        detection = detector.detect_from_file(source)
+        movements = parse_source(source, reader)
+
+    return detection, movements
+
+
+class ParsePool:
+    """Pool de procesos para detect_and_parse, con respaldo en el proceso actual"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: el servidor tiene hilos y una conexión SQLite abiertos, no conviene hacer fork
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    # Cada worker escribe sus diagnósticos con su propia cola
+                    initializer=setup_logging
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, file_path: Union[str, Path]) -> Future:
+        """Encola el parseo de un archivo; retorna un Future con (detección, movimientos)"""
+        try:
+            executor = self._get_executor()
+            future = executor.submit(detect_and_parse, str(file_path))
+        except (OSError, RuntimeError, BrokenProcessPool) as e:
+            logger.warning("⚠️  Pool de procesos no disponible (%s); parseando en el proceso actual", e)
+            return self._run_inline(file_path)
+
+        def on_done(done: Future):
+            # Un proceso caído deja el pool inutilizable: se recrea en el siguiente lote
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                self._discard(executor)
+
+        future.add_done_callback(on_done)
+        return future
+
+    @staticmethod
+    def _run_inline(file_path: Union[str, Path]) -> Future:
+        future = Future()
+        try:
+            future.set_result(detect_and_parse(str(file_path)))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
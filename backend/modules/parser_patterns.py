@@ -0,0 +1,201 @@
+"""
+Expresiones regulares y constantes de los parsers de FileReader
+Se compilan una sola vez al importar el módulo en vez de en cada línea
+del texto. Las listas de palabras de exclusión se combinan en una sola
+alternancia: `PATRON.search(linea_en_minusculas)` equivale a
+`any(palabra in linea_en_minusculas for palabra in palabras)`.
+"""
+
+import re
+from typing import Iterable
+
+
+def keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """Alternancia de palabras literales; se busca sobre texto ya en minúsculas"""
+    unique = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword) for keyword in unique))
+
+
+# =====================================================================
+# MESES
+# =====================================================================
+
+MONTH_NAMES = {
+    1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
+    5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
+    9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
+}
+
+MONTH_NUMBERS = {name: f"{number:02d}" for number, name in MONTH_NAMES.items()}
+
+# Meses abreviados de las cartolas BICE (tabla y texto)
+BICE_MONTHS = {
+    'ene': 1, 'enero': 1, 'jan': 1, 'feb': 2, 'febrero': 2,
+    'mar': 3, 'marzo': 3, 'apr': 4, 'abr': 4, 'abril': 4,
+    'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6, 'jul': 7,
+    'julio': 7, 'ago': 8, 'agos': 8, 'agosto': 8, 'aug': 8,
+    'sep': 9, 'sept': 9, 'septiembre': 9, 'oct': 10, 'octubre': 10,
+    'nov': 11, 'noviembre': 11, 'dic': 12, 'diciembre': 12, 'dec': 12
+}
+
+# Tabla de cuenta corriente BICE (sin nombres en inglés)
+BICE_CHECKING_TABLE_MONTHS = {
+    'ene': 1, 'enero': 1, 'feb': 2, 'febrero': 2, 'mar': 3, 'marzo': 3,
+    'apr': 4, 'abr': 4, 'may': 5, 'mayo': 5, 'jun': 6, 'junio': 6,
+    'jul': 7, 'julio': 7, 'ago': 8, 'agos': 8, 'sep': 9, 'sept': 9,
+    'oct': 10, 'octubre': 10, 'nov': 11, 'noviembre': 11, 'dic': 12
+}
+
+# Texto BICE v6 (acepta también 'fev')
+BICE_TEXT_MONTHS = {**BICE_MONTHS, 'fev': 2}
+
+# =====================================================================
+# DETECCIÓN
+# =====================================================================
+
+BICE_ACCOUNT_PATTERN = re.compile(r'\b21-\d{5}-\d\b')
+CMR_CARD_PATTERN = re.compile(r'\b4517\s*9123\s*\d{4}\s*\d{4}\b')
+
+# =====================================================================
+# COMUNES
+# =====================================================================
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DATE_DMY_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})')
+DATE_DD_MM_YYYY_PATTERN = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+
+# _clean_description (y su versión por columna)
+TRAILING_TYPE_CODE_PATTERN = re.compile(r'\s+[TAI]\s*$')
+TRAILING_AMOUNTS_PATTERN = re.compile(r'\s+\d+(?:\.\d{3})*(?:,\d{2})?(?:\s+\d+(?:\.\d{3})*(?:,\d{2})?)*\s*$')
+INSTALLMENT_DATE_PATTERN = re.compile(r'\d{1,2}/\d{1,2}\s+\w+-\d{4}', re.IGNORECASE)
+RUT_SUFFIX_PATTERN = re.compile(r'\s*RUT\s+[\d\-\.]+.*', re.IGNORECASE)
+LONG_NUMBER_PATTERN = re.compile(r'\s+\d{7,}\s*')
+TRAILING_DAY_MONTH_SLASH_PATTERN = re.compile(r'\b\d{1,2}/\d{1,2}/\s*$')
+TRAILING_DAY_MONTH_PATTERN = re.compile(r'\b\d{1,2}/\d{1,2}[\s|]*$')
+
+# =====================================================================
+# SANTANDER TARJETA DE CRÉDITO
+# =====================================================================
+
+SANTANDER_TDC_STATEMENT_DATE_PATTERN = re.compile(r'FECHA ESTADO DE CUENTA\s+(\d{2})/(\d{2})/(\d{4})')
+SANTANDER_TDC_DATE_PATTERN = re.compile(r'(\d{2})/(\d{2})/(\d{2})')  # DD/MM/YY
+SANTANDER_TDC_AMOUNT_PATTERN = re.compile(r'\$\s*(-?\d+(?:\.\d{3})*(?:,\d{2})?)\s*$')
+SANTANDER_TDC_PAT_PATTERN = re.compile(r'\s+COMPRAS\s+P\.A\.T\.\s*$', re.IGNORECASE)
+
+SANTANDER_TDC_SECTION_END = keyword_pattern([
+    'emisor', 'comprobante de pago', 'cheque', 'efectivo', 'nombre',
+    'número de tarjeta', 'información compras'
+])
+
+SANTANDER_TDC_EXCLUDE = keyword_pattern([
+    'total operaciones', 'movimientos tarjeta', 'productos o servicios',
+    'cargos, comisiones', 'período anterior', 'período actual',
+    'lugar de operación', 'fecha de operación', 'descripción operación',
+    'nºcuota', 'valor cuota', 'monto origen', 'monto total',
+    'operación pagar', 'cargo del mes', 'mensual', 'o cobro',
+    'información general', 'detalle', 'pagar hasta', 'monto mínimo',
+    'comprobante de pago', 'emisor', 'cliente', 'cheque', 'efectivo',
+    'nombre', 'número de tarjeta', 'timbre', 'banco',
+    'información compras en cuotas', 'de 3'
+])
+
+# =====================================================================
+# CMR TARJETA DE CRÉDITO
+# =====================================================================
+
+CMR_PAYMENT_AMOUNT_PATTERN = re.compile(r'-\s*(\d+(?:\.\d{3})*(?:,\d{2})?)')
+CMR_AMOUNT_PATTERN = re.compile(r'-?\s*\$?\s*(\d+(?:\.\d{3})*(?:,\d{2})?)')
+
+CMR_EXCLUDE = keyword_pattern([
+    'compras nacionales', 'sin movimientos', 'cupo total', 'cupo compra',
+    'cupo avance', 'tasa interes', 'periodo anterior', 'periodo actual',
+    'saldo adeudado', 'informacion general', 'detalle',
+    'encabezado', 'titulo', 'estado de cuenta', 'cliente elite',
+    'resumen de pago', 'monto total', 'total pesos', 'total dolares',
+    'fecha pactada', 'paga hasta', 'cupon de pago',
+    'iii detalle', 'ii informacion', 'i resumén', 'tasas', 'conceptos',
+    'pago minimo', 'credito disponible', 'limite', 'financiamiento',
+    'iv. costo', 'información de pago', 'vencimiento próximos',
+    'monto interés', 'gasto de cobranza'
+])
+
+# =====================================================================
+# SANTANDER CUENTA CORRIENTE (tabla "Detalle de movimientos")
+# =====================================================================
+
+SANTANDER_CC_DATE_PATTERN = re.compile(r'(\d{2})/(\d{2})')
+
+# Títulos del encabezado (palabras con sus espacios) que fijan cada columna
+SANTANDER_CC_COLUMN_TITLES = (
+    ('descripcion', ('DESCRIPCION', 'DESCRIPCIÓN')),
+    ('documento', ('Nº DCTO', 'N° DCTO', 'DCTO')),
+    ('cargo', ('CHEQUES Y OTROS', 'CARGOS')),
+    ('abono', ('DEPOSITOS Y OTROS', 'DEPÓSITOS Y OTROS', 'ABONOS')),
+    ('saldo', ('SALDO',)),
+)
+
+# =====================================================================
+# BICE CUENTA CORRIENTE
+# =====================================================================
+
+BICE_DATE_PATTERN = re.compile(r'(\d{1,2})\s+([a-z]{3})\s+(\d{4})', re.IGNORECASE)
+BICE_LINE_DATE_PATTERN = re.compile(r'^(\d{1,2})\s+([a-z]{3})\s+(\d{4})', re.IGNORECASE)
+BICE_LINE_START_PATTERN = re.compile(r'^\d{1,2}\s+[a-z]{3}', re.IGNORECASE)
+BICE_LOWER_LINE_START_PATTERN = re.compile(r'^\d{1,2}\s+[a-z]{3}')
+BICE_AMOUNT_PATTERN = re.compile(r'\$\s*([\d\.,]+)')
+BICE_TRAILING_AMOUNT_PATTERN = re.compile(r'\$\s*([\d\.,]+)\s*$')
+BICE_OPERATION_NUMBER_PATTERN = re.compile(r'\b(\d{8})\b')
+
+BICE_INCOME_WORDS = keyword_pattern(['abono', 'deposito', 'liquidacion', 'ingreso'])
+BICE_CHECKING_INCOME_WORDS = keyword_pattern(['abono', 'liquidacion'])
+BICE_TABLE_HEADER_WORDS = keyword_pattern(['fecha', 'categoría', 'descripción'])
+BICE_BALANCE_WORDS = keyword_pattern(['saldo inicial', 'saldo final', 'total abonos', 'total cargos'])
+
+BICE_TEXT_EXCLUDE = keyword_pattern([
+    'saldo', 'resumen', 'periodo', 'total', 'cartola', 'página', 'derechos',
+    'abonos y cargos', 'fecha', 'categoría', 'descripción', 'monto'
+])
+
+BICE_TEXT_V6_EXCLUDE = keyword_pattern([
+    'saldo inicial', 'saldo final', 'saldo contable',
+    'resumen del periodo', 'resumen',
+    'total abonos', 'total cargos',
+    'sobregiro usado', 'sobregiro disponible',
+    'abonos y cargos', 'fecha', 'categoría', 'descripción', 'monto',
+    'saldos diarios', 'n° operación', 'número operación',
+    'página', 'derechos reservados', 'casa matriz',
+    'tu ejecutiva', 'email', 'sucursal', 'dirección'
+])
+
+# _improve_bice_description
+_NAME = r'[A-Za-zÁáÉéÍíÓóÚúñÑ\s]'
+BICE_TRANSFER_TO_PATTERN = re.compile(
+    rf'transferencia\s+de\s+({_NAME}+?)\s+(?:rut|run)?\s*[\d\.\-]*\s+(?:desde\s+)?(?:banco[a-z]*\s+)?a\s+({_NAME}+?)(?:\s+(?:rut|run|cuenta|corriente|pesos|chile|el\s+\d)|\s*$)',
+    re.IGNORECASE
+)
+BICE_TRANSFER_NAME_PATTERN = re.compile(rf'transferencia\s+(?:de\s+)?({_NAME}+?)(?:\s+rut|\s+run|\s*$)', re.IGNORECASE)
+BICE_INCOMING_TRANSFER_PATTERN = re.compile(
+    rf'(?:abono\s+)?(?:por\s+)?transferencia\s+de\s+({_NAME}+?)(?:\s+(?:rut|run|cuenta|el\s+\d)|\s*$)',
+    re.IGNORECASE
+)
+BICE_OUTGOING_TRANSFER_PATTERN = re.compile(
+    rf'(?:cargo\s+)?(?:por\s+)?transferencia\s+a\s+({_NAME}+?)(?:\s+(?:rut|run|cuenta)|\s*$)',
+    re.IGNORECASE
+)
+BICE_RECIPIENT_SUFFIX_PATTERN = re.compile(r'\s+(?:rut|run|cuenta|corriente|el\s+\d).*$', re.IGNORECASE)
+BICE_RUT_RUN_SUFFIX_PATTERN = re.compile(r'\s+(?:rut|run).*$', re.IGNORECASE)
+BICE_ORIGIN_SUFFIX_PATTERN = re.compile(r'\s+(?:rut|run|cuenta|el\s+\d).*$', re.IGNORECASE)
+BICE_ACCOUNT_SUFFIX_PATTERN = re.compile(r'\s+(?:rut|run|cuenta).*$', re.IGNORECASE)
+ATTACHED_RUT_PATTERN = re.compile(r'\d+[\.\-]*\d+.*$')
+
+# _clean_bice_description_robust
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+WEB_ADDRESS_PATTERN = re.compile(r'www\.[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+SPECIAL_SYMBOLS_PATTERN = re.compile(r'[©®™]')
+PAGE_NUMBER_PATTERN = re.compile(r'P[áa]gina\s+\d+\s+de\s+\d+', re.IGNORECASE)
+
+# =====================================================================
+# GENÉRICO
+# =====================================================================
+
+GENERIC_AMOUNT_PATTERN = re.compile(r'\$\s*(\d+(?:\.\d{3})*(?:,\d{2})?)')
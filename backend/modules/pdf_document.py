@@ -0,0 +1,126 @@
+"""
+Documento PDF compartido entre detección y parseo
+Abre el archivo una sola vez y memoiza por página el texto, las palabras
+y las tablas, para que FileDetector y FileReader no repitan la extracción.
+"""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .excel_document import ExcelDocument
+
+
+class PdfDocument:
+    """PDF abierto una sola vez con extracción memoizada por página"""
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.path = Path(file_path)
+        self._pdf = None
+        self._text: Dict[int, Optional[str]] = {}
+        self._words: Dict[tuple, List[Dict]] = {}
+        self._tables: Dict[tuple, List[List]] = {}
+
+    def __enter__(self) -> "PdfDocument":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self) -> None:
+        """Abre el PDF (solo la primera vez)"""
+        if self._pdf is None:
+            import pdfplumber
+            self._pdf = pdfplumber.open(self.path)
+
+    def close(self) -> None:
+        """Cierra el PDF y libera la memoria de las páginas"""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def pages(self) -> list:
+        self.open()
+        return self._pdf.pages
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page(self, page_index: int):
+        """Retorna el objeto página de pdfplumber"""
+        return self.pages[page_index]
+
+    def page_text(self, page_index: int) -> Optional[str]:
+        """Texto de una página (memoizado)"""
+        if page_index not in self._text:
+            self._text[page_index] = self.page(page_index).extract_text()
+        return self._text[page_index]
+
+    def page_words(self, page_index: int, **kwargs) -> List[Dict[str, Any]]:
+        """Palabras con coordenadas de una página (memoizado por parámetros)"""
+        key = (page_index, json.dumps(kwargs, sort_keys=True))
+        if key not in self._words:
+            self._words[key] = self.page(page_index).extract_words(**kwargs)
+        return self._words[key]
+
+    def page_tables(self, page_index: int, settings: Dict = None) -> List[List]:
+        """Tablas de una página (memoizado por configuración)"""
+        key = (page_index, json.dumps(settings or {}, sort_keys=True))
+        if key not in self._tables:
+            if settings:
+                self._tables[key] = self.page(page_index).extract_tables(settings)
+            else:
+                self._tables[key] = self.page(page_index).extract_tables()
+        return self._tables[key]
+
+    def text(self, max_pages: int = None, separator: str = "\n") -> str:
+        """Texto concatenado de las primeras `max_pages` páginas (todas si es None)"""
+        count = self.page_count if max_pages is None else min(max_pages, self.page_count)
+        texts = []
+        for page_index in range(count):
+            page_text = self.page_text(page_index)
+            if page_text:
+                texts.append(page_text + separator)
+        return "".join(texts)
+
+
+@contextmanager
+def as_pdf_document(source: Union[str, Path, PdfDocument]):
+    """
+    Entrega un PdfDocument para una ruta o un documento ya abierto.
+    Solo cierra el documento si lo abrió este contexto.
+    """
+    if isinstance(source, PdfDocument):
+        yield source
+        return
+
+    document = PdfDocument(source)
+    try:
+        document.open()
+        yield document
+    finally:
+        document.close()
+
+
+@contextmanager
+def open_document(file_path: Union[str, Path]):
+    """
+    Abre un archivo para detección y parseo: PdfDocument para PDFs,
+    ExcelDocument para Excel y la ruta como string para el resto
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.pdf':
+        with PdfDocument(file_path) as document:
+            yield document
+    elif suffix in ('.xlsx', '.xls'):
+        yield ExcelDocument(file_path)
+    else:
+        yield str(file_path)
@@ -0,0 +1,233 @@
+"""
+Índice de similitud de descripciones para /movements/find-similar
+Agrupa los movimientos por descripción normalizada (única) y poda los
+candidatos con cotas superiores baratas del ratio de SequenceMatcher
+(largo y conteo de caracteres, vectorizado con NumPy) antes de calcular
+el ratio exacto. Se actualiza por archivo al cargar, activar, desactivar
+o eliminar; las descripciones que ya no usa ningún archivo se compactan
+cuando superan a las vigentes.
+"""
+
+import threading
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.65
+
+# Cubetas de caracteres: ASCII imprimible directo, el resto agrupado.
+# Agrupar sólo puede aumentar la intersección, así que la cota sigue siendo válida.
+_ASCII_START = 32
+_ASCII_SLOTS = 96
+_EXTRA_SLOTS = 32
+N_BUCKETS = _ASCII_SLOTS + _EXTRA_SLOTS
+
+# Margen para comparar cotas en punto flotante sin descartar candidatos válidos
+_EPSILON = 1e-9
+
+# Descripciones sin uso a partir de las cuales se compacta (si además superan a las vigentes)
+COMPACT_MIN_DEAD = 256
+
+
+def normalize_description(descripcion: Optional[str]) -> str:
+    """Normalización usada para comparar descripciones"""
+    return (descripcion or '').lower().strip()
+
+
+def _char_counts(text: str) -> np.ndarray:
+    counts = np.zeros(N_BUCKETS, dtype=np.uint16)
+    for char in text:
+        code = ord(char)
+        if _ASCII_START <= code < _ASCII_START + _ASCII_SLOTS:
+            counts[code - _ASCII_START] += 1
+        else:
+            counts[_ASCII_SLOTS + code % _EXTRA_SLOTS] += 1
+    return counts
+
+
+class SimilarityIndex:
+    """Descripciones únicas con posting lists por archivo y poda por cotas del ratio"""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.RLock()
+
+        # Descripción normalizada -> id de descripción
+        self._desc_ids: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._refcount: List[int] = []
+        # Descripciones con refcount 0 (siguen ocupando filas hasta compactar)
+        self._dead = 0
+
+        # Columnas vectorizadas (se extienden con las filas pendientes al consultar)
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._counts = np.zeros((0, N_BUCKETS), dtype=np.uint16)
+        self._pending_counts: List[np.ndarray] = []
+
+        # id de descripción -> {file_hash: [posiciones]}
+        self._postings: Dict[int, Dict[str, List[int]]] = {}
+
+        # file_hash -> movimientos (datos para la respuesta) e ids de descripción por posición
+        self._files: Dict[str, List[Dict[str, Any]]] = {}
+        self._file_desc_ids: Dict[str, List[int]] = {}
+
+    def __contains__(self, file_hash: str) -> bool:
+        return file_hash in self._files
+
+    def add_file(self, file_hash: str, movements: List[Dict]) -> None:
+        """Indexa los movimientos de un archivo (reemplaza los anteriores si ya estaba)"""
+        with self._lock:
+            self.remove_file(file_hash)
+
+            entries = []
+            desc_ids = []
+            for position, movement in enumerate(movements):
+                desc_id = self._intern(normalize_description(movement.get('descripcion')))
+                self._postings.setdefault(desc_id, {}).setdefault(file_hash, []).append(position)
+                desc_ids.append(desc_id)
+                entries.append({
+                    "id": movement.get('id'),
+                    "descripcion": movement.get('descripcion'),
+                    "fecha": movement.get('fecha'),
+                    "monto": movement.get('monto'),
+                    "categoria_actual": movement.get('categoria', 'Sin Categoría'),
+                    "subcategoria_actual": movement.get('subcategoria', 'Sin Subcategoría'),
+                })
+
+            self._files[file_hash] = entries
+            self._file_desc_ids[file_hash] = desc_ids
+
+    def remove_file(self, file_hash: str) -> None:
+        """Quita del índice los movimientos de un archivo"""
+        with self._lock:
+            desc_ids = self._file_desc_ids.pop(file_hash, None)
+            if desc_ids is None:
+                return
+            self._files.pop(file_hash, None)
+
+            for desc_id in desc_ids:
+                postings = self._postings.get(desc_id)
+                if postings is not None:
+                    postings.pop(file_hash, None)
+                    if not postings:
+                        del self._postings[desc_id]
+                self._refcount[desc_id] -= 1
+                if self._refcount[desc_id] == 0:
+                    self._dead += 1
+
+            if self._dead >= COMPACT_MIN_DEAD and self._dead > len(self._texts) - self._dead:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Renumera las descripciones vigentes y descarta las que no usa ningún archivo"""
+        self._flush_pending()
+        live = np.flatnonzero(np.asarray(self._refcount, dtype=np.int64) > 0)
+        remap = np.full(len(self._texts), -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+
+        self._texts = [self._texts[desc_id] for desc_id in live.tolist()]
+        self._refcount = [self._refcount[desc_id] for desc_id in live.tolist()]
+        self._desc_ids = {text: desc_id for desc_id, text in enumerate(self._texts)}
+        self._lengths = self._lengths[live]
+        self._counts = self._counts[live]
+        # Una descripción sin uso ya no tiene posting lists
+        self._postings = {int(remap[desc_id]): postings for desc_id, postings in self._postings.items()}
+        self._file_desc_ids = {
+            file_hash: remap[desc_ids].tolist() for file_hash, desc_ids in self._file_desc_ids.items()
+        }
+        self._dead = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self.__init__(self.threshold)
+
+    def _intern(self, text: str) -> int:
+        desc_id = self._desc_ids.get(text)
+        if desc_id is None:
+            desc_id = len(self._texts)
+            self._desc_ids[text] = desc_id
+            self._texts.append(text)
+            self._refcount.append(0)
+            self._pending_counts.append(_char_counts(text))
+        elif self._refcount[desc_id] == 0:
+            self._dead -= 1
+        self._refcount[desc_id] += 1
+        return desc_id
+
+    def _flush_pending(self) -> None:
+        if self._pending_counts:
+            new_counts = np.vstack(self._pending_counts)
+            self._counts = np.vstack([self._counts, new_counts])
+            self._lengths = np.concatenate([
+                self._lengths,
+                np.array([len(text) for text in self._texts[len(self._lengths):]], dtype=np.int64)
+            ])
+            self._pending_counts = []
+
+    def _candidates(self, query: str) -> np.ndarray:
+        """Ids de descripción cuyo ratio con la consulta puede alcanzar el umbral"""
+        self._flush_pending()
+        if len(self._lengths) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        query_length = len(query)
+        totals = self._lengths + query_length
+        alive = np.asarray(self._refcount, dtype=np.int64) > 0
+
+        # Cota por largo: ratio <= 2 * min(la, lb) / (la + lb)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            length_bound = np.where(totals > 0, 2.0 * np.minimum(self._lengths, query_length) / totals, 1.0)
+        rows = np.flatnonzero(alive & (length_bound >= self.threshold - _EPSILON))
+        if len(rows) == 0:
+            return rows
+
+        # Cota por conteo de caracteres (quick_ratio): ratio <= 2 * |A ∩ B| / (la + lb)
+        common = np.minimum(self._counts[rows], _char_counts(query)).sum(axis=1, dtype=np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            count_bound = np.where(totals[rows] > 0, 2.0 * common / totals[rows], 1.0)
+        return rows[count_bound >= self.threshold - _EPSILON]
+
+    def find_similar(self, descripcion: str, exclude_id: Any = None,
+                     file_order: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Movimientos con descripción igual ("Exacta") o con ratio de SequenceMatcher
+        >= umbral ("Parcial"), ordenados como el recorrido original: exactas primero,
+        luego por similitud descendente y, en empate, por orden de archivo y posición.
+        """
+        query = normalize_description(descripcion)
+
+        with self._lock:
+            order = file_order if file_order is not None else list(self._files)
+            rank = {file_hash: i for i, file_hash in enumerate(order)}
+
+            scored = []  # (es_parcial, -similitud, rango archivo, posición, movimiento, similitud, tipo)
+            exact_id = self._desc_ids.get(query)
+
+            def collect(desc_id: int, similarity: float, tipo: str):
+                for file_hash, positions in self._postings.get(desc_id, {}).items():
+                    if file_hash not in rank:
+                        continue
+                    entries = self._files[file_hash]
+                    for position in positions:
+                        entry = entries[position]
+                        if entry["id"] == exclude_id:
+                            continue
+                        scored.append((tipo != "Exacta", -similarity, rank[file_hash], position, entry, similarity, tipo))
+
+            if exact_id is not None and self._refcount[exact_id] > 0:
+                collect(exact_id, 100.0, "Exacta")
+
+            for desc_id in self._candidates(query).tolist():
+                if desc_id == exact_id:
+                    continue
+                ratio = SequenceMatcher(None, query, self._texts[desc_id]).ratio()
+                if ratio >= self.threshold:
+                    collect(desc_id, round(ratio * 100, 1), "Parcial")
+
+        scored.sort(key=lambda item: item[:4])
+
+        return [
+            {**entry, "similitud": similarity, "tipo_similitud": tipo}
+            for _, _, _, _, entry, similarity, tipo in scored
+        ]
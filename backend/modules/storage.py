@@ -0,0 +1,497 @@
+"""
+Almacenamiento local en SQLite para Financial Statement Bot
+Reemplaza los JSON de estado (registro de archivos, archivos activos,
+BD de movimientos categorizados y mapeos aprendidos) por tablas con
+escrituras por fila y consultas indexadas.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# En modo WAL, synchronous=NORMAL no hace fsync en cada commit: los commits
+# se agregan al WAL y se sincronizan en lote al hacer checkpoint. Una caída
+# no corrompe la BD (a lo más pierde los últimos commits ante un corte de luz).
+SYNCHRONOUS = "NORMAL"
+# Páginas de WAL antes de copiarlas a la BD (checkpoint automático)
+WAL_AUTOCHECKPOINT_PAGES = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    hash TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    fecha_carga TEXT,
+    movimientos INTEGER NOT NULL DEFAULT 0,
+    institucion TEXT,
+    tipo_producto TEXT,
+    deteccion_confianza REAL,
+    ultimo_mes TEXT,
+    activo INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_files_activo ON files(activo);
+
+CREATE TABLE IF NOT EXISTS movements (
+    file_hash TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    parser_version TEXT NOT NULL,
+    fecha TEXT,
+    descripcion TEXT,
+    monto REAL,
+    tipo TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (file_hash, position)
+);
+CREATE INDEX IF NOT EXISTS idx_movements_fecha ON movements(fecha);
+
+-- Un registro por archivo parseado (también si no tuvo movimientos)
+CREATE TABLE IF NOT EXISTS parsed_files (
+    file_hash TEXT PRIMARY KEY,
+    parser_version TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS categorizations (
+    id TEXT PRIMARY KEY,
+    categoria TEXT,
+    subcategoria TEXT,
+    descripcion TEXT,
+    fecha TEXT,
+    monto REAL,
+    actualizado TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_categorizations_content
+    ON categorizations(descripcion, fecha, monto);
+
+CREATE TABLE IF NOT EXISTS learned_mappings (
+    pattern TEXT PRIMARY KEY,
+    categoria TEXT,
+    subcategoria TEXT,
+    veces_asignada INTEGER NOT NULL DEFAULT 0,
+    fecha_ultima_actualizacion TEXT
+);
+"""
+
+FILE_FIELDS = [
+    'nombre', 'fecha_carga', 'movimientos', 'institucion',
+    'tipo_producto', 'deteccion_confianza', 'ultimo_mes'
+]
+CATEGORIZATION_FIELDS = ['categoria', 'subcategoria', 'descripcion', 'fecha', 'monto', 'actualizado']
+
+# Clave en meta del contador de versión de datos (ETag de las lecturas)
+DATA_VERSION_KEY = 'data_version'
+
+# Límite de parámetros por consulta IN (...)
+_IN_CHUNK = 500
+
+
+def _chunks(items: List, size: int = _IN_CHUNK) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Storage:
+    """Base de datos SQLite local (modo WAL) con el estado de la aplicación"""
+
+    def __init__(self, db_path: str = "processed_files/financial_bot.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        # isolation_level=None: las transacciones se controlan con transaction()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+        self._conn.execute(f"PRAGMA wal_autocheckpoint={WAL_AUTOCHECKPOINT_PAGES}")
+        # Al abrir, SQLite reaplica o descarta el WAL pendiente de una caída anterior
+        self.integrity_ok = self.check_integrity()
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.checkpoint()
+            self._conn.close()
+
+    def check_integrity(self) -> bool:
+        """Verificación rápida de la BD al iniciar (PRAGMA quick_check)"""
+        with self._lock:
+            problems = [row[0] for row in self._conn.execute("PRAGMA quick_check").fetchall()]
+        if problems == ['ok']:
+            return True
+        logger.error("❌ BD %s con problemas de integridad: %s", self.db_path.name, problems[:5])
+        return False
+
+    def checkpoint(self) -> None:
+        """Copia el WAL a la BD y lo trunca (al cerrar, o para acotar su tamaño)"""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # =================================================================
+    # TRANSACCIONES Y CONSULTAS
+    # =================================================================
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa escrituras en una sola transacción.
+        Las transacciones anidadas se unen a la externa.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("COMMIT")
+
+    def _execute(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        with self.transaction() as conn:
+            return conn.execute(sql, tuple(params))
+
+    def _executemany(self, sql: str, rows: Iterable) -> None:
+        with self.transaction() as conn:
+            conn.executemany(sql, rows)
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _scalar(self, sql: str, params: Iterable = ()) -> Any:
+        rows = self._query(sql, params)
+        return rows[0][0] if rows else None
+
+    # =================================================================
+    # META
+    # =================================================================
+
+    def get_meta(self, key: str, default: str = None) -> Optional[str]:
+        value = self._scalar("SELECT value FROM meta WHERE key = ?", (key,))
+        return default if value is None else value
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def data_version(self) -> int:
+        """
+        Versión de los datos; sube con cada escritura de archivos o
+        categorizaciones (en la misma transacción) y con cada cambio de
+        categorías, también desde otros procesos que usen la misma BD
+        """
+        return int(self.get_meta(DATA_VERSION_KEY, '0'))
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (DATA_VERSION_KEY,)
+        )
+
+    def bump_data_version(self) -> int:
+        """Incrementa la versión de los datos y retorna la nueva"""
+        with self.transaction() as conn:
+            self._bump_version(conn)
+            return int(conn.execute("SELECT value FROM meta WHERE key = ?", (DATA_VERSION_KEY,)).fetchone()[0])
+
+    # =================================================================
+    # ARCHIVOS CARGADOS
+    # =================================================================
+
+    @staticmethod
+    def _file_row_to_dict(row: sqlite3.Row) -> Dict:
+        """Convierte una fila al formato del antiguo uploaded_files.json"""
+        info = {'nombre': row['nombre'], 'fecha_carga': row['fecha_carga'],
+                'movimientos': row['movimientos'], 'hash': row['hash']}
+        for field in ('institucion', 'tipo_producto', 'deteccion_confianza', 'ultimo_mes'):
+            if row[field] is not None:
+                info[field] = row[field]
+        return info
+
+    def upsert_file(self, file_hash: str, file_info: Dict, active: bool = None) -> None:
+        """Registra o actualiza un archivo cargado"""
+        values = [file_info.get(field) for field in FILE_FIELDS]
+        if values[2] is None:
+            values[2] = 0
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO files (hash, nombre, fecha_carga, movimientos, institucion, "
+                "tipo_producto, deteccion_confianza, ultimo_mes) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET nombre = excluded.nombre, "
+                "fecha_carga = excluded.fecha_carga, movimientos = excluded.movimientos, "
+                "institucion = excluded.institucion, tipo_producto = excluded.tipo_producto, "
+                "deteccion_confianza = excluded.deteccion_confianza, ultimo_mes = excluded.ultimo_mes",
+                [file_hash] + values
+            )
+            if active is not None:
+                conn.execute("UPDATE files SET activo = ? WHERE hash = ?", (int(active), file_hash))
+            self._bump_version(conn)
+
+    def update_file(self, file_hash: str, bump_version: bool = True, **fields) -> None:
+        """
+        Actualiza columnas puntuales de un archivo.
+        bump_version=False para datos derivados que no cambian lo que ven las
+        lecturas (p.ej. completar ultimo_mes ya calculado al responder).
+        """
+        fields = {k: v for k, v in fields.items() if k in FILE_FIELDS}
+        if not fields:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.transaction() as conn:
+            conn.execute(
+                f"UPDATE files SET {assignments} WHERE hash = ?",
+                list(fields.values()) + [file_hash]
+            )
+            if bump_version:
+                self._bump_version(conn)
+
+    def get_file(self, file_hash: str) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM files WHERE hash = ?", (file_hash,))
+        return self._file_row_to_dict(rows[0]) if rows else None
+
+    def list_files(self, active_only: bool = False) -> List[Dict]:
+        """Archivos en orden de carga, con su estado de activación en 'activo'"""
+        sql = "SELECT * FROM files"
+        if active_only:
+            sql += " WHERE activo = 1"
+        rows = self._query(sql + " ORDER BY rowid")
+        files = []
+        for row in rows:
+            info = self._file_row_to_dict(row)
+            info['activo'] = bool(row['activo'])
+            files.append(info)
+        return files
+
+    def set_file_active(self, file_hash: str, active: bool) -> None:
+        with self.transaction() as conn:
+            conn.execute("UPDATE files SET activo = ? WHERE hash = ?", (int(active), file_hash))
+            self._bump_version(conn)
+
+    def is_file_active(self, file_hash: str) -> bool:
+        return bool(self._scalar("SELECT activo FROM files WHERE hash = ?", (file_hash,)))
+
+    def active_file_hashes(self) -> List[str]:
+        rows = self._query("SELECT hash FROM files WHERE activo = 1 ORDER BY rowid")
+        return [row['hash'] for row in rows]
+
+    def count_files(self, active_only: bool = False) -> int:
+        sql = "SELECT COUNT(*) FROM files"
+        if active_only:
+            sql += " WHERE activo = 1"
+        return self._scalar(sql)
+
+    def delete_file(self, file_hash: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM files WHERE hash = ?", (file_hash,))
+            conn.execute("DELETE FROM movements WHERE file_hash = ?", (file_hash,))
+            conn.execute("DELETE FROM parsed_files WHERE file_hash = ?", (file_hash,))
+            self._bump_version(conn)
+
+    def delete_all_files(self) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM movements")
+            conn.execute("DELETE FROM parsed_files")
+            self._bump_version(conn)
+
+    # =================================================================
+    # MOVIMIENTOS PARSEADOS (caché de parseo)
+    # =================================================================
+
+    def save_parsed_movements(self, file_hash: str, parser_version: str, movements: List[Dict]) -> None:
+        """Reemplaza los movimientos parseados de un archivo (una lista vacía también queda guardada)"""
+        rows = [
+            (file_hash, position, parser_version, mov.get('fecha'), mov.get('descripcion'),
+             mov.get('monto'), mov.get('tipo'), json.dumps(mov, ensure_ascii=False))
+            for position, mov in enumerate(movements)
+        ]
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM movements WHERE file_hash = ?", (file_hash,))
+            conn.executemany(
+                "INSERT INTO movements (file_hash, position, parser_version, fecha, "
+                "descripcion, monto, tipo, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed_files (file_hash, parser_version) VALUES (?, ?)",
+                (file_hash, parser_version)
+            )
+
+    def load_parsed_movements(self, file_hash: str, parser_version: str) -> Optional[List[Dict]]:
+        """
+        Movimientos parseados de un archivo para la versión de parser dada.
+        Retorna None si no hay entrada vigente (y borra las obsoletas); un
+        archivo parseado sin movimientos retorna [].
+        """
+        with self._lock:
+            stored_version = self._scalar(
+                "SELECT parser_version FROM parsed_files WHERE file_hash = ?", (file_hash,)
+            )
+            if stored_version != parser_version:
+                if stored_version is not None:
+                    self.delete_parsed_movements(file_hash)
+                return None
+            rows = self._query(
+                "SELECT data FROM movements WHERE file_hash = ? ORDER BY position",
+                (file_hash,)
+            )
+        return [json.loads(row['data']) for row in rows]
+
+    def delete_parsed_movements(self, file_hash: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM movements WHERE file_hash = ?", (file_hash,))
+            conn.execute("DELETE FROM parsed_files WHERE file_hash = ?", (file_hash,))
+
+    def clear_parsed_movements(self) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM movements")
+            conn.execute("DELETE FROM parsed_files")
+
+    # =================================================================
+    # CATEGORIZACIONES DEL USUARIO (antes movements_db.json)
+    # =================================================================
+
+    @staticmethod
+    def _categorization_row_to_dict(row: sqlite3.Row) -> Dict:
+        return {field: row[field] for field in CATEGORIZATION_FIELDS if row[field] is not None}
+
+    def upsert_categorization(self, mov_id: str, data: Dict) -> None:
+        values = [data.get(field) for field in CATEGORIZATION_FIELDS]
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO categorizations (id, categoria, subcategoria, descripcion, fecha, monto, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET categoria = excluded.categoria, "
+                "subcategoria = excluded.subcategoria, descripcion = excluded.descripcion, "
+                "fecha = excluded.fecha, monto = excluded.monto, actualizado = excluded.actualizado",
+                [mov_id] + values
+            )
+            self._bump_version(conn)
+
+    def get_categorizations(self, mov_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Categorizaciones guardadas para los ids dados"""
+        mov_ids = [str(mov_id) for mov_id in dict.fromkeys(mov_ids)]
+        result = {}
+        for chunk in _chunks(mov_ids):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._query(f"SELECT * FROM categorizations WHERE id IN ({placeholders})", chunk)
+            for row in rows:
+                result[row['id']] = self._categorization_row_to_dict(row)
+        return result
+
+    def find_categorization_id(self, descripcion: str, fecha: str, monto: Any) -> Optional[str]:
+        """
+        Id de la categorización con el mismo contenido (descripcion, fecha, monto).
+        Si hay varias gana la más antigua.
+        """
+        return self._scalar(
+            "SELECT id FROM categorizations WHERE descripcion IS ? AND fecha IS ? AND monto IS ? "
+            "ORDER BY rowid LIMIT 1",
+            (descripcion, fecha, monto)
+        )
+
+    def categorization_stats(self) -> Dict[str, int]:
+        row = self._query(
+            "SELECT COUNT(*) AS total, "
+            "COALESCE(SUM(CASE WHEN categoria IS NOT NULL AND categoria != '' "
+            "AND categoria != 'Sin Categoría' THEN 1 ELSE 0 END), 0) AS categorized "
+            "FROM categorizations"
+        )[0]
+        return {'total': row['total'], 'categorized': row['categorized']}
+
+    # =================================================================
+    # MAPEOS APRENDIDOS
+    # =================================================================
+
+    def load_learned_mappings(self) -> Dict[str, Dict]:
+        """Mapeos en orden de creación (el orden define la prioridad)"""
+        rows = self._query("SELECT * FROM learned_mappings ORDER BY rowid")
+        return {
+            row['pattern']: {
+                'categoria': row['categoria'],
+                'subcategoria': row['subcategoria'],
+                'veces_asignada': row['veces_asignada'],
+                'fecha_ultima_actualizacion': row['fecha_ultima_actualizacion']
+            }
+            for row in rows
+        }
+
+    def upsert_learned_mapping(self, pattern: str, mapping: Dict) -> None:
+        self._execute(
+            "INSERT INTO learned_mappings (pattern, categoria, subcategoria, veces_asignada, "
+            "fecha_ultima_actualizacion) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(pattern) DO UPDATE SET categoria = excluded.categoria, "
+            "subcategoria = excluded.subcategoria, veces_asignada = excluded.veces_asignada, "
+            "fecha_ultima_actualizacion = excluded.fecha_ultima_actualizacion",
+            (pattern, mapping.get('categoria'), mapping.get('subcategoria'),
+             mapping.get('veces_asignada', 0), mapping.get('fecha_ultima_actualizacion'))
+        )
+
+    def delete_learned_mapping(self, pattern: str) -> None:
+        self._execute("DELETE FROM learned_mappings WHERE pattern = ?", (pattern,))
+
+    # =================================================================
+    # IMPORTACIÓN DESDE LOS JSON ANTERIORES
+    # =================================================================
+
+    def import_legacy_json(self, registry_path: Path, active_path: Path,
+                           movements_db_path: Path, mappings_path: Path) -> bool:
+        """
+        Importa una sola vez el estado guardado en los JSON anteriores.
+        Retorna True si importó algo. Los JSON no se modifican.
+        """
+        if self.get_meta('legacy_json_imported'):
+            return False
+
+        def read_json(path: Path, default):
+            path = Path(path)
+            if not path.exists():
+                return default
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        registry = read_json(registry_path, {})
+        active = set(read_json(active_path, {}).get('active', []))
+        movements_db = read_json(movements_db_path, {})
+        mappings = read_json(mappings_path, {})
+
+        with self.transaction():
+            for file_hash, file_info in registry.items():
+                self.upsert_file(file_hash, file_info, active=file_hash in active)
+            for mov_id, data in movements_db.items():
+                self.upsert_categorization(str(mov_id), data)
+            for pattern, mapping in mappings.items():
+                self.upsert_learned_mapping(pattern, mapping)
+            self.set_meta('legacy_json_imported', '1')
+
+        logger.info("📦 Importado desde JSON: %s archivos, %s categorizaciones, %s mapeos",
+                    len(registry), len(movements_db), len(mappings))
+        return True
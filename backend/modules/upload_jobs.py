@@ -0,0 +1,134 @@
+"""
+Cola de trabajos de carga
+Los endpoints de carga aceptan los archivos y retornan un job_id de
+inmediato; la detección y el parseo corren en un pool acotado de hilos
+y cada trabajo lleva su propio progreso, consultable por id.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Estados de un trabajo
+QUEUED = 'queued'
+PROCESSING = 'processing'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class UploadJob:
+    """Estado y resultado de un trabajo de carga"""
+
+    def __init__(self, kind: str, total_files: int = 1, current_file: str = ""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0
+        self.message = "En cola..."
+        self.current_file = current_file
+        self.total_files = total_files
+        self.processed_files = 0
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.status_code = None
+        self.result = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "is_processing": not self.is_finished,
+            "progress": self.progress,
+            "message": self.message,
+            "current_file": self.current_file,
+            "total_files": self.total_files,
+            "processed_files": self.processed_files,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "status_code": self.status_code,
+            "result": self.result
+        }
+
+
+class UploadJobManager:
+    """Ejecuta trabajos de carga en un pool acotado y guarda su estado"""
+
+    def __init__(self, max_workers: int = 2, max_jobs_kept: int = 100):
+        self.max_jobs_kept = max_jobs_kept
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, job: UploadJob, func: Callable[..., Tuple[int, Dict]], *args) -> UploadJob:
+        """
+        Encola un trabajo. `func(job, *args)` corre en el pool y retorna
+        (status_code, contenido) con la misma respuesta que daba el endpoint.
+        """
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args)
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job: UploadJob) -> Dict[str, Any]:
+        """Estado consistente de un trabajo para responder al cliente"""
+        with self._lock:
+            return job.to_dict()
+
+    def latest(self) -> Optional[UploadJob]:
+        """Trabajo en curso más reciente, o el último terminado"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in reversed(jobs):
+            if not job.is_finished:
+                return job
+        return jobs[-1] if jobs else None
+
+    def update(self, job: UploadJob, progress: int = None, message: str = None, **fields) -> None:
+        """Actualiza el progreso de un trabajo (llamado desde el hilo del pool)"""
+        with self._lock:
+            if progress is not None:
+                job.progress = progress
+            if message is not None:
+                job.message = message
+            for name, value in fields.items():
+                setattr(job, name, value)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: UploadJob, func: Callable, args: tuple) -> None:
+        self.update(job, status=PROCESSING)
+        try:
+            status_code, content = func(job, *args)
+            self.update(job, progress=100, status=COMPLETED, status_code=status_code, result=content,
+                        finished_at=datetime.now().isoformat())
+        except Exception as e:
+            logger.exception("❌ Trabajo de carga %s falló: %s", job.id, e)
+            self.update(job, status=FAILED, message=f"Error procesando carga: {e}", status_code=500,
+                        result={"status": "error", "message": f"Error procesando carga: {e}"},
+                        finished_at=datetime.now().isoformat())
+
+    def _prune(self) -> None:
+        """Descarta los trabajos terminados más antiguos sobre el máximo"""
+        excess = len(self._jobs) - self.max_jobs_kept
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished][:excess]:
+            del self._jobs[job_id]
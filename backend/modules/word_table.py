@@ -0,0 +1,94 @@
+"""
+Tablas a partir de las coordenadas de las palabras de pdfplumber
+Las columnas se fijan con los títulos del encabezado: cada columna es una
+franja horizontal y la frontera entre dos columnas vecinas es el punto
+medio del espacio entre sus títulos. Las palabras se agrupan en filas por
+su posición vertical y cada una va a la franja que contiene su centro.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Diferencia vertical máxima (pt) entre palabras de una misma fila
+ROW_TOLERANCE = 3
+
+
+def group_rows(words: List[Dict], tolerance: float = ROW_TOLERANCE) -> List[List[Dict]]:
+    """Agrupa las palabras en filas, de arriba abajo y cada fila de izquierda a derecha"""
+    rows: List[List[Dict]] = []
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if rows and word['top'] - rows[-1][0]['top'] <= tolerance:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    for row in rows:
+        row.sort(key=lambda w: w['x0'])
+    return rows
+
+
+def row_text(words: List[Dict]) -> str:
+    """Texto de una fila (o de parte de ella)"""
+    return ' '.join(word['text'].strip() for word in words).strip()
+
+
+class ColumnBands:
+    """Franjas horizontales de las columnas de una tabla"""
+
+    def __init__(self, columns: Sequence[Tuple[str, float, float]]):
+        """
+        Args:
+            columns: (nombre, x0, x1) del título de cada columna, de izquierda a derecha
+        """
+        self.names = [name for name, _, _ in columns]
+        self.boundaries = [
+            (left[2] + right[1]) / 2 for left, right in zip(columns, columns[1:])
+        ]
+
+    def column_of(self, word: Dict) -> str:
+        """Columna cuya franja contiene el centro de la palabra"""
+        center = (word['x0'] + word['x1']) / 2
+        return self.names[bisect_right(self.boundaries, center)]
+
+    def split(self, words: List[Dict]) -> Dict[str, str]:
+        """Texto de cada columna en una fila (columnas vacías como '')"""
+        cells: Dict[str, List[Dict]] = {name: [] for name in self.names}
+        for word in words:
+            cells[self.column_of(word)].append(word)
+        return {name: row_text(cell) for name, cell in cells.items()}
+
+
+def find_header(rows: List[List[Dict]], titles: Sequence[Tuple[str, Tuple[str, ...]]],
+                max_lines: int = 2) -> Optional[Tuple[int, ColumnBands]]:
+    """
+    Busca el encabezado de una tabla y arma sus franjas
+
+    Args:
+        rows: Filas de group_rows
+        titles: (columna, palabras que la titulan) de izquierda a derecha;
+            basta con encontrar una de las palabras (en mayúsculas)
+        max_lines: Líneas que puede ocupar el encabezado
+
+    Returns:
+        (índice de la última fila del encabezado, franjas), o None si no está
+    """
+    first_titles = set(titles[0][1])
+    for start, row in enumerate(rows):
+        if not any(word['text'].strip().upper() in first_titles for word in row):
+            continue
+
+        header_rows = rows[start:start + max_lines]
+        found: Dict[str, Tuple[float, float]] = {}
+        last_row = start
+        for offset, header_row in enumerate(header_rows):
+            for word in header_row:
+                text = word['text'].strip().upper()
+                for name, keywords in titles:
+                    if name not in found and text in keywords:
+                        found[name] = (word['x0'], word['x1'])
+                        last_row = start + offset
+
+        if len(found) == len(titles):
+            columns = [(name, *found[name]) for name, _ in titles]
+            if all(left[2] <= right[1] for left, right in zip(columns, columns[1:])):
+                return last_row, ColumnBands(columns)
+    return None
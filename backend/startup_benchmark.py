@@ -0,0 +1,107 @@
+"""
+Benchmark de arranque de la API
+Importa main en procesos nuevos (con -X importtime) y reporta:
+- costo de importación de cada módulo que main importa directamente
+- fases de main.init_services() (STARTUP_TIMINGS)
+- tiempo total hasta poder responder /health
+- dependencias pesadas que quedaron cargadas al arrancar (deberían ser ninguna)
+
+Uso (desde backend/):
+    python startup_benchmark.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ['pandas', 'numpy', 'pdfplumber', 'camelot', 'sklearn']
+
+CHILD_CODE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.init_services()
+initialized = time.perf_counter()
+asyncio.run(main.health_check())
+ready = time.perf_counter()
+print(json.dumps({
+    'import_main': imported - started,
+    'init': initialized - imported,
+    'health': ready - initialized,
+    'total': ready - started,
+    'fases': main.STARTUP_TIMINGS,
+    'pesados': [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Tiempo acumulado (s) de los módulos importados directamente por main"""
+    children = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        # La indentación del nombre indica el nivel y cada módulo se informa
+        # después de los que importa: los de nivel 1 anteriores a "main" son suyos
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children[name.strip()] = int(cumulative) / 1e6
+        elif depth == 0:
+            if name.strip() == 'main':
+                return children
+            children = {}
+    return {}
+
+
+def run_once(backend_dir: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_CODE],
+        cwd=backend_dir, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['modulos'] = parse_importtime(result.stderr)
+    return report
+
+
+def median_of(reports: list, key) -> float:
+    return statistics.median(key(report) for report in reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de la API")
+    parser.add_argument('--runs', type=int, default=5, help="procesos a medir (se reporta la mediana)")
+    parser.add_argument('--top', type=int, default=15, help="módulos a listar")
+    args = parser.parse_args()
+
+    backend_dir = Path(__file__).parent
+    reports = [run_once(backend_dir) for _ in range(args.runs)]
+
+    print(f"Arranque en frío (mediana de {args.runs} procesos)")
+    print(f"  import main      {median_of(reports, lambda r: r['import_main']) * 1000:8.1f} ms")
+    print(f"  init_services    {median_of(reports, lambda r: r['init']) * 1000:8.1f} ms")
+    print(f"  primer /health   {median_of(reports, lambda r: r['health']) * 1000:8.1f} ms")
+    print(f"  total            {median_of(reports, lambda r: r['total']) * 1000:8.1f} ms")
+
+    print("\nFases de inicialización")
+    for phase in reports[0]['fases']:
+        print(f"  {phase:<16} {median_of(reports, lambda r: r['fases'].get(phase, 0)) * 1000:8.1f} ms")
+
+    print("\nImportación por módulo (acumulado)")
+    names = set().union(*(report['modulos'] for report in reports))
+    costs = {name: median_of(reports, lambda r: r['modulos'].get(name, 0)) for name in names}
+    for name, seconds in sorted(costs.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<40} {seconds * 1000:8.1f} ms")
+
+    heavy = sorted(set().union(*(report['pesados'] for report in reports)))
+    print(f"\nDependencias pesadas cargadas al arrancar: {', '.join(heavy) if heavy else 'ninguna'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,22 @@
 """
-Actualiza el registry JSON con información de detección
+Actualiza el registro de archivos (SQLite) con información de detección
 """
 
-import json
 from pathlib import Path
 from modules.file_detector import FileDetector
+from modules.storage import Storage
 
 detector = FileDetector()
-registry_file = Path("processed_files/uploaded_files.json")
+storage = Storage("processed_files/financial_bot.db")
 processed_dir = Path("processed_files")
 
-# Cargar registry
-with open(registry_file, "r", encoding="utf-8") as f:
-    registry = json.load(f)
+# Cargar registro
+registry = storage.list_files()
 
 print(f"📋 Actualizando {len(registry)} archivos en el registry...")
 
-for file_hash, file_info in registry.items():
+for file_info in registry:
+    file_hash = file_info['hash']
     filename = file_info['nombre']
     file_path = processed_dir / filename
     
@@ -26,9 +26,13 @@ for file_hash, file_info in registry.items():
         try:
             detection = detector.detect_from_file(str(file_path))
             
-            file_info['institucion'] = detection['institution']
-            file_info['tipo_producto'] = detection['product_type']
-            file_info['deteccion_confianza'] = detection['confidence']
+            # Guardar detección del archivo
+            storage.update_file(
+                file_hash,
+                institucion=detection['institution'],
+                tipo_producto=detection['product_type'],
+                deteccion_confianza=detection['confidence']
+            )
             
             print(f"   ✅ {detection['institution']} - {detection['product_type']} ({detection['confidence']*100:.0f}%)")
             
@@ -37,8 +41,4 @@ for file_hash, file_info in registry.items():
     else:
         print(f"   ⚠️  Archivo no encontrado")
 
-# Guardar registry actualizado
-with open(registry_file, "w", encoding="utf-8") as f:
-    json.dump(registry, f, ensure_ascii=False, indent=2)
-
-print(f"\n✅ Registry actualizado!")
\ No newline at end of file
+print(f"\n✅ Registry actualizado!")
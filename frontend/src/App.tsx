@@ -29,18 +29,45 @@ function AppContent() {
       setProgress(10);
       setProgressMessage('Conectando al servidor...');
 
-      const response = await fetch('http://localhost:8000/movements');
+      // NDJSON: primera línea con el resumen y luego un movimiento por línea,
+      // se va procesando a medida que llega
+      const response = await fetch('http://localhost:8000/movements?formato=ndjson');
       
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Error al cargar movimientos');
       }
 
-      setProgress(50);
-      setProgressMessage('Procesando datos...');
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      const received: Movement[] = [];
+      let header: { status: string; total_movimientos: number } | null = null;
+      let buffer = '';
+      let done = false;
+
+      while (!done) {
+        const chunk = await reader.read();
+        done = chunk.done;
+        buffer += done ? decoder.decode() : decoder.decode(chunk.value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = done ? '' : lines.pop() || '';
+
+        for (const line of lines) {
+          if (!line) continue;
+          if (header === null) {
+            header = JSON.parse(line);
+          } else {
+            received.push(JSON.parse(line));
+          }
+        }
+
+        if (header !== null && header.total_movimientos > 0) {
+          setProgress(10 + Math.round((received.length / header.total_movimientos) * 80));
+          setProgressMessage(`Cargando movimientos (${received.length} de ${header.total_movimientos})...`);
+        }
+      }
 
-      const data = await response.json();
-      if (data.status === 'success') {
-        setMovements(data.movimientos || []);
+      if (header !== null && header.status === 'success') {
+        setMovements(received);
         setProgress(90);
         setProgressMessage('Finalizando...');
       }
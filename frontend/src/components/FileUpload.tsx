@@ -23,6 +23,53 @@ interface UploadResult {
   movements?: number;
 }
 
+interface UploadJob {
+  job_id: string;
+  status: 'queued' | 'processing' | 'completed' | 'failed';
+  progress: number;
+  message: string;
+  status_code: number | null;
+  result: any;
+}
+
+const API_URL = 'http://localhost:8000';
+const JOB_POLL_INTERVAL_MS = 500;
+
+// Espera a que termine un trabajo de carga (202 + job_id) informando el progreso
+const waitForUploadJob = async (
+  jobId: string,
+  onProgress: (progress: number) => void
+): Promise<{ statusCode: number; data: any }> => {
+  while (true) {
+    const response = await fetch(`${API_URL}/upload-jobs/${jobId}`);
+    const job: UploadJob = await response.json();
+
+    if (!response.ok) {
+      return { statusCode: response.status, data: job };
+    }
+
+    onProgress(job.progress);
+
+    if (job.status === 'completed' || job.status === 'failed') {
+      return { statusCode: job.status_code ?? 500, data: job.result };
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+};
+
+// Resultado final de una carga: si el backend la encoló, espera el trabajo
+const resolveUpload = async (
+  response: Response,
+  onProgress: (progress: number) => void
+): Promise<{ statusCode: number; data: any }> => {
+  const data = await response.json();
+  if (response.status === 202 && data.job_id) {
+    return waitForUploadJob(data.job_id, onProgress);
+  }
+  return { statusCode: response.status, data };
+};
+
 export default function FileUpload({ onMovementsLoaded }: FileUploadProps) {
   const [loading, setLoading] = useState(false);
   const [mode, setMode] = useState<'single' | 'batch'>('single');
@@ -46,14 +93,14 @@ export default function FileUpload({ onMovementsLoaded }: FileUploadProps) {
     formData.append('file', file);
 
     try {
-      const response = await fetch('http://localhost:8000/upload', {
+      const response = await fetch(`${API_URL}/upload`, {
         method: 'POST',
         body: formData,
       });
 
-      const data = await response.json();
+      const { statusCode, data } = await resolveUpload(response, setUploadProgress);
 
-      if (response.status === 200 && data.status === 'success') {
+      if (statusCode === 200 && data.status === 'success') {
         setResults([
           {
             file: file.name,
@@ -63,7 +110,7 @@ export default function FileUpload({ onMovementsLoaded }: FileUploadProps) {
           },
         ]);
         onMovementsLoaded(data.movements);
-      } else if (response.status === 409) {
+      } else if (statusCode === 409) {
         setResults([
           {
             file: file.name,
@@ -122,15 +169,23 @@ export default function FileUpload({ onMovementsLoaded }: FileUploadProps) {
     });
 
     try {
-      const response = await fetch('http://localhost:8000/upload-batch', {
+      const response = await fetch(`${API_URL}/upload-batch`, {
         method: 'POST',
         body: formData,
       });
 
-      const data = await response.json();
+      const { data } = await resolveUpload(response, setUploadProgress);
 
       if (data.status === 'completed') {
         setResults(data.resultados);
+      } else {
+        setResults([
+          {
+            file: 'Carga masiva',
+            status: 'error',
+            message: data.message,
+          },
+        ]);
       }
     } catch (error) {
       setResults([